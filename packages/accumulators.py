@@ -0,0 +1,505 @@
+import numpy as np
+import pandas as pd
+
+from packages.cube import N_DAYS, month_day_position, _stat_quantile
+
+# Default bin budget of a sketch: 366 x 10_000 int64 counts, i.e. 29 MB
+MAX_BINS = 10_000
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch of one distribution per calendar day: a fixed-resolution
+    histogram (366 month-day rows, one column per bin of width resolution). The resolution
+    sets the error bound, e.g. 0.1 for observations in tenths of °C or 0.5 for a coarser
+    and smaller sketch.
+
+    Updating and merging are exact counts additions, so sketches built on separate chunks,
+    periods or workers merge into the sketch of the whole data. The quantiles are read with an
+    error of at most resolution / 2 (none for data already rounded to the resolution, as
+    Météo-France observations at 0.1).
+
+    The memory is bounded by 366 x max_bins x 8 bytes. The bins grow with the range of the
+    values seen, and an update needing more than max_bins bins raises a ValueError (e.g. a 9999
+    sentinel, or solar radiation in J/m² at resolution 0.1). With a value_range, the bins are
+    allocated once and the values outside are clamped to the edge bins: the quantiles within
+    the range are unaffected, those beyond saturate at its bounds (the exact minimum and
+    maximum are kept by ClimAccumulator).
+
+    Attributes:
+        resolution (float): width of the bins, in the unit of the data.
+        max_bins (int): largest number of bins per month-day.
+        value_range (tuple): (lo, hi) bounds the values are clamped to, or None.
+        offset (int): bin code of the first column (code = round(value / resolution)).
+        counts (np.ndarray): (366, n_bins) number of values per month-day and bin.
+    """
+
+    def __init__(
+        self,
+        resolution: float = 0.1,
+        max_bins: int = MAX_BINS,
+        value_range: tuple = None
+    ):
+        self.resolution = resolution
+        self.max_bins = max_bins
+        self.value_range = tuple(value_range) if value_range is not None else None
+        self.offset = 0
+        self.counts = np.zeros((N_DAYS, 0), dtype=np.int64)
+
+        if self.value_range is not None:
+            lo, hi = self._code_range()
+            self._extend(lo, hi)
+
+    def _code_range(
+        self
+    ):
+        # Bin codes of the bounds of value_range
+        lo, hi = self.value_range
+        if not lo < hi:
+            raise ValueError("value_range must be (lo, hi) with lo < hi")
+
+        return int(np.round(lo / self.resolution)), int(np.round(hi / self.resolution))
+
+    def _extend(
+        self,
+        code_min: int,
+        code_max: int
+    ):
+        # Widening the bins range so that it covers [code_min, code_max], within the budget
+        n_bins = self.counts.shape[1]
+        first = min(code_min, self.offset) if n_bins else code_min
+        last = max(code_max, self.offset + n_bins - 1) if n_bins else code_max
+        if last - first + 1 > self.max_bins:
+            raise ValueError(
+                f"The sketch would need {last - first + 1} bins of {self.resolution} per day "
+                f"(values from {first * self.resolution:g} to {last * self.resolution:g}), more "
+                f"than max_bins={self.max_bins}: set a value_range, a coarser resolution or "
+                "remove the invalid values"
+            )
+
+        if n_bins == 0:
+            self.offset = code_min
+            self.counts = np.zeros((N_DAYS, code_max - code_min + 1), dtype=np.int64)
+            return
+
+        before = max(self.offset - code_min, 0)
+        after = max(code_max - (self.offset + n_bins - 1), 0)
+        if before or after:
+            self.counts = np.pad(self.counts, ((0, 0), (before, after)))
+            self.offset -= before
+
+    def update(
+        self,
+        days: np.ndarray,
+        values: np.ndarray
+    ):
+        """
+        Adds values to the sketch.
+
+        Args:
+            days (np.ndarray): month-day column (0..365) of each value.
+            values (np.ndarray): values (missing values are ignored).
+        """
+        valid = ~np.isnan(values)
+        if not valid.any():
+            return
+        days = days[valid].astype(np.int64)
+        codes = np.round(values[valid] / self.resolution).astype(np.int64)
+        if self.value_range is not None:
+            codes = np.clip(codes, *self._code_range())
+
+        self._extend(int(codes.min()), int(codes.max()))
+        n_bins = self.counts.shape[1]
+        flat = days * n_bins + (codes - self.offset)
+        self.counts += np.bincount(flat, minlength=N_DAYS * n_bins).reshape(N_DAYS, n_bins)
+
+    def merge(
+        self,
+        other
+    ):
+        """
+        Adds the counts of another sketch of the same resolution and value range to this one.
+
+        Args:
+            other (QuantileSketch): sketch to merge.
+
+        Returns:
+            QuantileSketch: self, updated.
+        """
+        if other.resolution != self.resolution:
+            raise ValueError("Only sketches with the same resolution can be merged")
+        if other.value_range != self.value_range:
+            raise ValueError("Only sketches with the same value range can be merged")
+        if other.counts.shape[1] == 0:
+            return self
+
+        self._extend(other.offset, other.offset + other.counts.shape[1] - 1)
+        start = other.offset - self.offset
+        self.counts[:, start:start + other.counts.shape[1]] += other.counts
+
+        return self
+
+    def quantiles(
+        self,
+        qvals: list
+    ):
+        """
+        Reads quantiles of every month-day (linear interpolation between ranks, as pandas).
+
+        Args:
+            qvals (list): quantile levels between 0 and 1.
+
+        Returns:
+            np.ndarray: (366, len(qvals)) quantiles, NaN for the days without values.
+        """
+        out = np.full((N_DAYS, len(qvals)), np.nan)
+        if self.counts.shape[1] == 0:
+            return out
+
+        cumul = self.counts.cumsum(axis=1)
+        n_values = cumul[:, -1]
+        filled = n_values > 0
+        bin_values = (np.arange(self.counts.shape[1]) + self.offset) * self.resolution
+
+        def value_of_rank(rank):
+            # Bin holding the value of (0-based) rank of each day
+            bins = (cumul <= rank[:, np.newaxis]).sum(axis=1)
+            return bin_values[np.minimum(bins, len(bin_values) - 1)]
+
+        last = np.maximum(n_values - 1, 0)
+        for i, qval in enumerate(qvals):
+            h = last * qval
+            lo = np.floor(h).astype(np.int64)
+            hi = np.minimum(lo + 1, last)
+            v_lo, v_hi = value_of_rank(lo), value_of_rank(hi)
+            out[:, i] = np.where(filled, v_lo + (h - lo) * (v_hi - v_lo), np.nan)
+
+        return out
+
+
+class ClimAccumulator:
+    """
+    Persistent day-of-year accumulator of a variable over a period: per month-day sum, sum of
+    squares, count, minimum, maximum and a mergeable QuantileSketch.
+
+    New observations are folded in with update(), so refreshing a normal with the latest days
+    only processes these days, and accumulators of several periods merge into the accumulator
+    of the whole period.
+
+    Attributes:
+        daily (str): daily aggregation of sub-daily batches ("mean", "min", "max" or "sum"), or
+            None to accumulate the values as given (e.g. hourly values, as climatology).
+        sum, sum_sq, count, min, max (np.ndarray): statistics of each of the 366 month-days.
+        sketch (QuantileSketch): quantile sketch of each month-day.
+        start, end (pd.Timestamp): first and last dates folded in.
+    """
+
+    def __init__(
+        self,
+        daily: str = None,
+        resolution: float = 0.1,
+        max_bins: int = MAX_BINS,
+        value_range: tuple = None
+    ):
+        """
+        Args:
+            daily (str, optional): daily aggregation of sub-daily batches. Defaults to None.
+            resolution (float, optional): resolution (error bound) of the quantile sketch.
+                Defaults to 0.1.
+            max_bins (int, optional): bin budget of the quantile sketch (cf. QuantileSketch).
+                Defaults to MAX_BINS.
+            value_range (tuple, optional): (lo, hi) range the sketch clamps the values to.
+                Defaults to None (no clamping).
+        """
+        self.daily = daily
+        self.sum = np.zeros(N_DAYS)
+        self.sum_sq = np.zeros(N_DAYS)
+        self.count = np.zeros(N_DAYS, dtype=np.int64)
+        self.min = np.full(N_DAYS, np.inf)
+        self.max = np.full(N_DAYS, -np.inf)
+        self.sketch = QuantileSketch(resolution, max_bins, value_range)
+        self.start = None
+        self.end = None
+        self._pending = None
+
+    def _fold(
+        self,
+        sr: pd.Series
+    ):
+        # Adding the values of sr to the month-day statistics
+        values = sr.to_numpy(dtype="float64")
+        valid = ~np.isnan(values)
+        days = month_day_position(sr.index)[valid].astype(np.int64)
+        values = values[valid]
+        if len(values) == 0:
+            return
+
+        self.sum += np.bincount(days, weights=values, minlength=N_DAYS)
+        self.sum_sq += np.bincount(days, weights=values * values, minlength=N_DAYS)
+        self.count += np.bincount(days, minlength=N_DAYS)
+        np.minimum.at(self.min, days, values)
+        np.maximum.at(self.max, days, values)
+        self.sketch.update(days, values)
+
+        self.start = sr.index[0] if self.start is None else min(self.start, sr.index[0])
+        self.end = sr.index[-1] if self.end is None else max(self.end, sr.index[-1])
+
+    def update(
+        self,
+        sr: pd.Series
+    ):
+        """
+        Folds a new batch of observations in.
+
+        With a daily aggregation, the last day of the batch may be incomplete: it is held back
+        and aggregated with the next batch (or by flush()).
+
+        Args:
+            sr (pd.Series): new observations with a DatetimeIndex, in chronological order.
+
+        Returns:
+            ClimAccumulator: self, updated.
+        """
+        if self.daily is None:
+            self._fold(sr)
+            return self
+
+        if self._pending is not None:
+            sr = pd.concat([self._pending, sr])
+        if len(sr) == 0:
+            return self
+
+        last_day = sr.index[-1].normalize()
+        self._pending = sr[sr.index >= last_day]
+        complete = sr[sr.index < last_day]
+        if len(complete):
+            self._fold(getattr(complete.resample("D"), self.daily)())
+
+        return self
+
+    def flush(
+        self
+    ):
+        """
+        Folds in the day held back by update() (end of the record).
+
+        Returns:
+            ClimAccumulator: self, updated.
+        """
+        if self._pending is not None and len(self._pending):
+            self._fold(getattr(self._pending.resample("D"), self.daily)())
+        self._pending = None
+
+        return self
+
+    def merge(
+        self,
+        other
+    ):
+        """
+        Merges the accumulator of another period (with the same settings) into this one.
+
+        The days held back by update() in both accumulators are carried over: the earlier ones
+        are folded in, the last one stays held back until the next update() or flush().
+
+        Args:
+            other (ClimAccumulator): accumulator to merge.
+
+        Returns:
+            ClimAccumulator: self, updated (unchanged when other cannot be merged).
+        """
+        if other.daily != self.daily:
+            raise ValueError("Only accumulators with the same daily aggregation can be merged")
+
+        # The sketch checks the resolution, value range and bin budget before any change
+        self.sketch.merge(other.sketch)
+        self.sum += other.sum
+        self.sum_sq += other.sum_sq
+        self.count += other.count
+        np.minimum(self.min, other.min, out=self.min)
+        np.maximum(self.max, other.max, out=self.max)
+
+        for date in (other.start, other.end):
+            if date is not None:
+                self.start = date if self.start is None else min(self.start, date)
+                self.end = date if self.end is None else max(self.end, date)
+
+        pending = [sr for sr in (self._pending, other._pending) if sr is not None and len(sr)]
+        if pending:
+            self._pending = None
+            self.update(pd.concat(pending).sort_index())
+
+        return self
+
+    def statistics(
+        self,
+        stats: list = ("Mean", "Min", "Max")
+    ):
+        """
+        Returns the accumulated statistics of each month-day.
+
+        Args:
+            stats (list, optional): statistics among "Mean", "Std", "Min", "Max", "Count",
+                "Median" and "Qxx" quantiles (read from the sketch). Defaults to ("Mean", "Min", "Max").
+
+        Returns:
+            dict: one pd.Series per statistic indexed by month-day (1..366, 60 = Feb 29),
+                NaN for the days without data.
+        """
+        filled = self.count > 0
+        count = np.maximum(self.count, 1)
+        mean = self.sum / count
+
+        qstats = [stat for stat in stats if stat not in ("Std", "Count") and _stat_quantile(stat) is not None]
+        qvalues = self.sketch.quantiles([_stat_quantile(stat) for stat in qstats])
+
+        results = {}
+        for stat in stats:
+            if stat == "Mean":
+                res = mean
+            elif stat == "Std":
+                # Sample standard deviation (ddof=1, as pandas)
+                var = (self.sum_sq - count * mean ** 2) / np.maximum(self.count - 1, 1)
+                res = np.where(self.count > 1, np.sqrt(np.maximum(var, 0)), np.nan)
+            elif stat == "Min":
+                res = self.min
+            elif stat == "Max":
+                res = self.max
+            elif stat == "Count":
+                res = self.count.astype("float64")
+            else:
+                res = qvalues[:, qstats.index(stat)]
+            results[stat] = pd.Series(
+                np.where(filled, res, np.nan),
+                index=pd.RangeIndex(1, N_DAYS + 1)
+            )
+
+        return results
+
+    def quantiles(
+        self,
+        qnames: list = ("Q10", "Q25", "Q50", "Q75", "Q90")
+    ):
+        """
+        Returns the approximate quantile dictionary of the accumulated values, with the same
+        shape as computing.quantiles ({"Q10": ..., "Max": ..., "Min": ...}, ready for
+        plotting.plot_quantiles). The quantile error is at most resolution / 2.
+
+        Args:
+            qnames (list, optional): quantile names. Defaults to ("Q10", "Q25", "Q50", "Q75", "Q90").
+
+        Returns:
+            dict: pd.Series indexed 1..366 (60 = Feb 29), days without data interpolated.
+        """
+        dic_quantiles = self.statistics(list(qnames) + ["Max", "Min"])
+
+        return {
+            key: sr.interpolate(limit_direction="both")
+            for key, sr in dic_quantiles.items()
+        }
+
+    def save(
+        self,
+        path: str
+    ):
+        """
+        Stores the accumulator in a .npz file (the day held back by update() is included).
+
+        Args:
+            path (str): path to the .npz file.
+        """
+        pending = self._pending if self._pending is not None else pd.Series(dtype="float64")
+        np.savez(
+            path,
+            daily=np.array(self.daily or ""),
+            sum=self.sum,
+            sum_sq=self.sum_sq,
+            count=self.count,
+            min=self.min,
+            max=self.max,
+            resolution=np.array(self.sketch.resolution),
+            max_bins=np.array(self.sketch.max_bins),
+            value_range=np.array(self.sketch.value_range or [], dtype="float64"),
+            offset=np.array(self.sketch.offset),
+            counts=self.sketch.counts,
+            period=np.array(
+                [self.start, self.end] if self.start is not None else [], dtype="datetime64[ns]"
+            ),
+            pending_index=pending.index.values.astype("datetime64[ns]"),
+            pending_values=pending.to_numpy(dtype="float64")
+        )
+
+    @classmethod
+    def load(
+        cls,
+        path: str
+    ):
+        """
+        Reloads an accumulator stored by save().
+
+        Args:
+            path (str): path to the .npz file.
+
+        Returns:
+            ClimAccumulator: reloaded accumulator.
+        """
+        with np.load(path) as data:
+            # Files saved before the bin budget existed hold neither max_bins nor value_range
+            max_bins = int(data["max_bins"]) if "max_bins" in data else MAX_BINS
+            value_range = tuple(data["value_range"]) if "value_range" in data else ()
+            acc = cls(
+                str(data["daily"]) or None,
+                float(data["resolution"]),
+                max(max_bins, data["counts"].shape[1]),
+                value_range or None
+            )
+            acc.sum = data["sum"]
+            acc.sum_sq = data["sum_sq"]
+            acc.count = data["count"]
+            acc.min = data["min"]
+            acc.max = data["max"]
+            acc.sketch.offset = int(data["offset"])
+            acc.sketch.counts = data["counts"]
+            if len(data["period"]):
+                acc.start, acc.end = (pd.Timestamp(date) for date in data["period"])
+            if len(data["pending_values"]):
+                acc._pending = pd.Series(
+                    data["pending_values"],
+                    index=pd.DatetimeIndex(data["pending_index"])
+                )
+
+        return acc
+
+
+def merge_accumulators(
+    accumulators: list
+):
+    """
+    Merges accumulators built on separate chunks, periods, stations or workers, with their
+    days held back by update() (cf. ClimAccumulator.merge).
+
+    Args:
+        accumulators (list): ClimAccumulator objects with the same settings.
+
+    Returns:
+        ClimAccumulator: new accumulator holding all their data.
+    """
+    first = accumulators[0]
+    settings = (first.daily, first.sketch.resolution, first.sketch.value_range)
+    for acc in accumulators[1:]:
+        if (acc.daily, acc.sketch.resolution, acc.sketch.value_range) != settings:
+            raise ValueError(
+                "Only accumulators with the same daily aggregation, resolution and value range "
+                "can be merged"
+            )
+
+    merged = ClimAccumulator(
+        first.daily,
+        first.sketch.resolution,
+        max(acc.sketch.max_bins for acc in accumulators),
+        first.sketch.value_range
+    )
+    for acc in accumulators:
+        merged.merge(acc)
+
+    return merged
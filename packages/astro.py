@@ -0,0 +1,143 @@
+import functools
+
+import numpy as np
+import pandas as pd
+
+
+# Perpignan-Rivesaltes station (66164001): latitude and longitude in degrees
+STATION_LOCATION = (42.737, 2.872)
+
+# Zenith angle of the sun at sunrise and sunset, with the atmospheric refraction (degrees)
+SUNRISE_ZENITH = 90.833
+
+
+@functools.lru_cache(maxsize=256)
+def sun_times(
+    year: int,
+    latitude: float,
+    longitude: float
+):
+    """
+    Computes the sunrise and sunset of every day of a year (NOAA solar equations: solar
+    declination and equation of time per day, all the days at once). Cached per location and
+    year.
+
+    Args:
+        year (int): year.
+        latitude (float): latitude in degrees (north positive).
+        longitude (float): longitude in degrees (east positive).
+
+    Returns:
+        np.ndarray, np.ndarray: sunrise and sunset of each day of the year, in UTC hours
+            (read-only). Polar days have no night (sunrise 0, sunset 24), polar nights no
+            daylight (sunrise and sunset at solar noon).
+    """
+    n_days = 366 if (year % 4 == 0) and ((year % 100 != 0) or (year % 400 == 0)) else 365
+    gamma = 2 * np.pi / n_days * np.arange(n_days)
+
+    eq_time = 229.18 * (
+        0.000075
+        + 0.001868 * np.cos(gamma) - 0.032077 * np.sin(gamma)
+        - 0.014615 * np.cos(2 * gamma) - 0.040849 * np.sin(2 * gamma)
+    )
+    declination = (
+        0.006918
+        - 0.399912 * np.cos(gamma) + 0.070257 * np.sin(gamma)
+        - 0.006758 * np.cos(2 * gamma) + 0.000907 * np.sin(2 * gamma)
+        - 0.002697 * np.cos(3 * gamma) + 0.00148 * np.sin(3 * gamma)
+    )
+
+    # Hour angle of the sunrise, clipped for the polar days and nights
+    lat = np.radians(latitude)
+    cos_hour_angle = (
+        np.cos(np.radians(SUNRISE_ZENITH)) / (np.cos(lat) * np.cos(declination))
+        - np.tan(lat) * np.tan(declination)
+    )
+    hour_angle = np.degrees(np.arccos(np.clip(cos_hour_angle, -1, 1)))
+
+    solar_noon = 720 - 4 * longitude - eq_time
+    sunrise = (solar_noon - 4 * hour_angle) / 60
+    sunset = (solar_noon + 4 * hour_angle) / 60
+    sunrise.flags.writeable = False
+    sunset.flags.writeable = False
+
+    return sunrise, sunset
+
+
+def _utc_values(
+    index: pd.DatetimeIndex
+):
+    # UTC datetime64 values (naive indexes are taken as UTC, as the Météo-France data)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+
+    return index.values
+
+
+def _night_dates(
+    days: np.ndarray,
+    hours: np.ndarray,
+    night: np.ndarray
+):
+    # Date of the night of each value: morning values belong to the night of the day before
+    night_dates = days - (hours < 12).astype("timedelta64[D]")
+
+    return np.where(night, night_dates, np.datetime64("NaT"))
+
+
+def astronomical_night(
+    index: pd.DatetimeIndex,
+    latitude: float = STATION_LOCATION[0],
+    longitude: float = STATION_LOCATION[1]
+):
+    """
+    Flags the dates between sunset and the next sunrise.
+
+    Args:
+        index (pd.DatetimeIndex): dates of the values (UTC when naive).
+        latitude (float, optional): latitude in degrees. Defaults to the station.
+        longitude (float, optional): longitude in degrees. Defaults to the station.
+
+    Returns:
+        np.ndarray: night date of each value (day of the sunset), NaT during the day.
+    """
+    values = _utc_values(index)
+    days = values.astype("datetime64[D]")
+    hours = (values - days) / np.timedelta64(1, "h")
+
+    # Sun times of every value, read from the table of its year
+    years = days.astype("datetime64[Y]")
+    day_positions = (days - years.astype("datetime64[D]")).astype(np.int64)
+    year_numbers = years.astype(np.int64) + 1970
+    sunrise = np.empty(len(values))
+    sunset = np.empty(len(values))
+    for year in np.unique(year_numbers):
+        in_year = year_numbers == year
+        year_sunrise, year_sunset = sun_times(int(year), latitude, longitude)
+        sunrise[in_year] = year_sunrise[day_positions[in_year]]
+        sunset[in_year] = year_sunset[day_positions[in_year]]
+
+    night = np.where(hours < 12, hours < sunrise, hours > sunset)
+
+    return _night_dates(days, hours, night)
+
+
+def fixed_night(
+    index: pd.DatetimeIndex,
+    hours: list
+):
+    """
+    Flags the dates whose hour is one of the night hours.
+
+    Args:
+        index (pd.DatetimeIndex): dates of the values.
+        hours (list): night hours, e.g. [21, 22, 23, 0, 1, ..., 6].
+
+    Returns:
+        np.ndarray: night date of each value (day of the evening), NaT during the day.
+    """
+    values = index.values if index.tz is None else index.tz_localize(None).values
+    days = values.astype("datetime64[D]")
+    value_hours = (values - days).astype("timedelta64[h]").astype(np.int64)
+
+    return _night_dates(days, value_hours, np.isin(value_hours, list(hours)))
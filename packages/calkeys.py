@@ -0,0 +1,159 @@
+import functools
+import weakref
+
+import numpy as np
+import pandas as pd
+
+
+# Season code of each month (0 = DJF, 1 = MAM, 2 = JJA, 3 = SON), index 0 unused
+SEASON_OF_MONTH = np.array([-1, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0], dtype=np.int8)
+
+# Cached keys, per id of a live index
+_KEYS = {}
+
+
+class CalendarKeys:
+    """
+    Compact calendar keys of a DatetimeIndex (int16 / int8 arrays), each computed once with
+    datetime64 arithmetic on first access. Use calendar_keys(index) or the "cal" accessor
+    (sr.cal.month) to share them between every function working on the same index.
+
+    Attributes:
+        year (np.ndarray): int16 year.
+        month (np.ndarray): int8 month (1-12).
+        day (np.ndarray): int8 day of the month (1-31).
+        dayofyear (np.ndarray): int16 day of the year (1-366).
+        hour (np.ndarray): int8 hour (0-23).
+        month_day (np.ndarray): int16 month-day position (0-365, Feb 29 = 59, 1 Mar = 60 every
+            year), cf. cube.month_day_position.
+        season (np.ndarray): int8 meteorological season (0 = DJF ... 3 = SON).
+        season_year (np.ndarray): int16 year of the season, December counting in the DJF
+            season of the next year.
+    """
+
+    def __init__(
+        self,
+        index: pd.DatetimeIndex
+    ):
+        # Wall-clock time for timezone-aware indexes
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        self._values = index.values
+
+    @functools.cached_property
+    def _days(
+        self
+    ):
+        return self._values.astype("datetime64[D]")
+
+    @functools.cached_property
+    def _months(
+        self
+    ):
+        return self._days.astype("datetime64[M]")
+
+    @functools.cached_property
+    def _years(
+        self
+    ):
+        return self._days.astype("datetime64[Y]")
+
+    @functools.cached_property
+    def year(
+        self
+    ):
+        return (self._years.astype(np.int64) + 1970).astype(np.int16)
+
+    @functools.cached_property
+    def month(
+        self
+    ):
+        return ((self._months - self._years).astype(np.int64) + 1).astype(np.int8)
+
+    @functools.cached_property
+    def day(
+        self
+    ):
+        return ((self._days - self._months).astype(np.int64) + 1).astype(np.int8)
+
+    @functools.cached_property
+    def dayofyear(
+        self
+    ):
+        return ((self._days - self._years).astype(np.int64) + 1).astype(np.int16)
+
+    @functools.cached_property
+    def hour(
+        self
+    ):
+        return (self._values - self._days).astype("timedelta64[h]").astype(np.int8)
+
+    @functools.cached_property
+    def month_day(
+        self
+    ):
+        # Non-leap years skip Feb 29 from 1 Mar on
+        year = self.year
+        leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+        shift = (~leap) & (self.month > 2)
+
+        return (self.dayofyear - 1 + shift).astype(np.int16)
+
+    @functools.cached_property
+    def season(
+        self
+    ):
+        return SEASON_OF_MONTH[self.month]
+
+    @functools.cached_property
+    def season_year(
+        self
+    ):
+        return (self.year + (self.month == 12)).astype(np.int16)
+
+
+def calendar_keys(
+    index: pd.DatetimeIndex
+):
+    """
+    Returns the CalendarKeys of an index, cached as long as the index lives.
+
+    Args:
+        index (pd.DatetimeIndex): dates.
+
+    Returns:
+        CalendarKeys: keys shared by every caller with the same index object.
+    """
+    key = id(index)
+    entry = _KEYS.get(key)
+    if entry is not None and entry[0]() is index:
+        return entry[1]
+
+    keys = CalendarKeys(index)
+    _KEYS[key] = (weakref.ref(index), keys)
+    weakref.finalize(index, _KEYS.pop, key, None)
+
+    return keys
+
+
+@pd.api.extensions.register_series_accessor("cal")
+@pd.api.extensions.register_dataframe_accessor("cal")
+class CalendarAccessor:
+    """
+    Calendar keys of the index of a Series or DataFrame: sr.cal.year, sr.cal.month...
+    """
+
+    def __init__(
+        self,
+        obj
+    ):
+        self._keys = calendar_keys(obj.index)
+
+    def __getattr__(
+        self,
+        name
+    ):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        return getattr(self._keys, name)
@@ -1,25 +1,143 @@
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 import packages.plotting as pltt
 
-from packages.mining import reindex_clim_on_year, compute_diff
+from packages.accumulators import ClimAccumulator
+from packages.astro import STATION_LOCATION, astronomical_night, fixed_night
+from packages.calkeys import calendar_keys
+from packages.cube import DoyCube
+from packages.groups import Groups
+from packages.exceedance import ExceedanceEngine, period_label, season_label
+from packages.memo import memoize
+from packages.mining import reindex_clim_on_year, compute_diff, open_station, resample_daily
+
+# Quantiles computed by default for the quantile charts
+QUANTILE_MAP = {
+    "Q10": 0.10,
+    "Q25": 0.25,
+    "Q50": 0.50,
+    "Q75": 0.75,
+    "Q90": 0.90
+}
+
+# Daily aggregation matching the "type" argument of the quantile functions
+DAILY_AGG = {
+    "avg": "mean",
+    "max": "max",
+    "min": "min"
+}
+
+
+def _as_cube(
+    sr,
+    start: str = None,
+    end: str = None
+):
+    """
+    Returns the calendar-aligned cube of a period, built from a Series or sliced from a DoyCube.
+    A DoyCube is sliced by whole years without copying its data.
+    """
+    if isinstance(sr, DoyCube):
+        return sr.period(start, end)
+    
+    if not isinstance(sr.index, pd.DatetimeIndex):
+        raise TypeError("Serie index must be a DatetimeIndex")
+    
+    return DoyCube.from_series(sr.loc[start:end])
+
+
+def _daily_cube(
+    sr,
+    how: str,
+    start: str = None,
+    end: str = None,
+    min_hours: int = None,
+    min_days: int = None
+):
+    # Daily cube, the days (and months) without enough hourly values being masked
+    if min_days is not None and not isinstance(sr, DoyCube):
+        df_daily = resample_daily(sr.loc[start:end], min_hours, min_days)
+        return _as_cube(df_daily[how])
+    if min_days is not None:
+        raise ValueError("The month coverage rule (min_days) needs the hourly Series")
+    
+    return _as_cube(sr, start, end).daily(how, min_hours)
+
+
+def _draw(
+    spec: pltt.FigureSpec,
+    plot: bool,
+    figures: list
+):
+    # Defers the figure into figures, draws it, or skips it (compute only)
+    if figures is not None:
+        figures.append(spec)
+    elif plot:
+        spec.render()
+
+
+def doy_statistics(
+    sr,
+    stats: list = ("Q10", "Q25", "Q50", "Q75", "Q90", "Max", "Min"),
+    complete: bool = False
+):
+    """
+    Computes several day-of-year statistics of a Series in a single pass.
+    
+    The values are laid out once in the calendar-aligned DoyCube (one column per month-day, 
+    Feb 29 included), whose columns are sorted once: all the quantiles (linear interpolation,
+    as pandas), minimum, maximum, mean and count are then read with vectorized indexing
+    instead of one groupby per statistic.
+
+    Args:
+        sr (pd.Series or DoyCube): daily or hourly data.
+        stats (list, optional): statistics to compute, among "Qxx" quantiles (e.g. "Q05", "Q95"),
+            "Median", "Mean", "Min", "Max" and "Count". Defaults to the quantile chart statistics.
+        complete (bool, optional): returns the 366 days, interpolating the days without data.
+            Defaults to False.
+
+    Returns:
+        dict: one pd.Series per statistic, indexed by month-day (1..366, 60 = Feb 29).
+    """
+    return _as_cube(sr).statistics(list(stats), complete)
+
+
+@memoize
+def _climatology(
+    sr,
+    start: str,
+    end: str
+):
+    # Median and mean normals (cached)
+    dic_stats = _as_cube(sr, start, end).statistics(["Median", "Mean"])
+    
+    return dic_stats["Median"], dic_stats["Mean"]
+
 
 def climatology(
     sr: pd.Series,
     start: str,
     end: str,
     variable: str,
-    folder
+    folder,
+    plot: bool = True,
+    figures: list = None
 ):
     """
     Computes climatology for a given variable over a specified period.
 
     Args:
-        sr (pd.Series): initial pd.Series containing the time series data.
+        sr (pd.Series or DoyCube): initial pd.Series containing the time series data, or its
+            precomputed DoyCube.
         start (str): start date of the climatology period (inclusive).
         end (str): end date of the climatology period (inclusive).
         variable (str): name of the variable for labeling purposes.
+        folder (str): folder to store the images.
+        plot (bool, optional): draws the figures. False only computes. Defaults to True.
+        figures (list, optional): collects the figures as deferred plotting.FigureSpec
+            instead of drawing them (cf. plotting.render_figures). Defaults to None.
 
     Returns:
         Two pd.Series: climatology computed using median and mean methods.
@@ -27,98 +145,98 @@ def climatology(
     start_year = start[:4]
     end_year = end[:4]
     
-    if not isinstance(sr.index, pd.DatetimeIndex):
-        raise TypeError("Serie index must be a DatetimeIndex")
+    sr_clim_median, sr_clim_mean = _climatology(sr, start, end)
     
-    sr_clim = sr.loc[start:end]
-    dayofyear = sr_clim.index.dayofyear
-    
-    # Computing median method
-    method = "median"
-    sr_clim_median = sr_clim.groupby(dayofyear).median()
-    pltt.plot_data(
-        sr_clim_median,
-        "Normal",
-        f"{variable} normal ({method} / {start_year}-{end_year})",
-        f"{folder}/{method}_norm_{variable}_{start_year}_{end_year}"
-    )
-    # Computing mean method
-    method = "mean"
-    sr_clim_mean = sr_clim.groupby(dayofyear).mean()
-    pltt.plot_data(
-        sr_clim_mean,
-        "Normal",
-        f"{variable} normal ({method} / {start_year}-{end_year})",
-        f"{folder}/{method}_norm_{variable}_{start_year}_{end_year}"
-    )
+    # Plotting both methods
+    for method, sr_clim in (("median", sr_clim_median), ("mean", sr_clim_mean)):
+        spec = pltt.FigureSpec(
+            pltt.plot_data,
+            sr_clim,
+            "Normal",
+            f"{variable} normal ({method} / {start_year}-{end_year})",
+            f"{folder}/{method}_norm_{variable}_{start_year}_{end_year}"
+        )
+        _draw(spec, plot, figures)
 
     return sr_clim_median, sr_clim_mean
 
 
+@memoize
+def _quantiles(
+    sr,
+    type: str,
+    pool_days: int = None,
+    min_hours: int = None,
+    min_days: int = None
+):
+    # Daily quantiles dictionary (cached)
+    stats = list(QUANTILE_MAP) + ["Max", "Min"]
+    
+    if isinstance(sr, ClimAccumulator):
+        if pool_days is not None:
+            raise ValueError("Pooled quantiles need the daily values, not an accumulator")
+        return sr.quantiles(list(QUANTILE_MAP))
+    
+    cube_daily = _daily_cube(sr, DAILY_AGG[type], min_hours=min_hours, min_days=min_days)
+    if pool_days is not None:
+        return cube_daily.pooled_statistics(stats, pool_days)
+    
+    # Days without data (Feb 29 without leap year, gaps) are interpolated
+    return cube_daily.statistics(stats, complete=True)
+
+
 def quantiles(
     sr : pd.Series,
     type : str,
     title : str,
     ylabel : str,
     img_path : str,
-    all : bool = True
+    all : bool = True,
+    pool_days : int = None,
+    plot : bool = True,
+    figures : list = None,
+    min_hours : int = None,
+    min_days : int = None
 ):
     """
     This function computes and plots quantiles from a datasets. 
 
     Args:
-        sr (pd.Series): pandas serie containing the data
-        type (str): type of data used (eg: max, min, avg)
+        sr (pd.Series, DoyCube or ClimAccumulator): pandas serie containing the data, its
+                            precomputed DoyCube, or an accumulator of daily values whose
+                            sketches give approximate quantiles in bounded memory
+                            (cf. mining.accumulate_daily)
+        type (str): type of data used (eg: max, min, avg), ignored for an accumulator
         title (str): title of the chart
         ylabel (str): name for the ylabel chart depending on the data type 
         img_path (str): path to storage the chart as a png image
         all (bool, optional): Depending on the data, can plot all the quantiles by True or
                             only mean/max/min with False. Defaults to True.
+        pool_days (int, optional): pools the values within +/- pool_days days of each day
+                            of the year before computing its quantiles (usual percentile
+                            thresholds). Defaults to None (values of the day only).
+        plot (bool, optional): draws the figure. False only computes. Defaults to True.
+        figures (list, optional): collects the figure as a deferred plotting.FigureSpec
+            instead of drawing it (cf. plotting.render_figures). Defaults to None.
+        min_hours (int, optional): days with less valid hourly values are left out
+            (cf. mining.resample_daily). Defaults to None (any).
+        min_days (int, optional): months with less kept days are left out (hourly Series
+            only). Defaults to None (any).
 
     Returns:
-        Dictionnary containing the computed quantiles
+        Dictionnary containing the computed quantiles, indexed 1..366 (60 = Feb 29)
     """
+    dic_quantiles = _quantiles(sr, type, pool_days, min_hours, min_days)
 
-    if type == "avg":
-        sr_daily = sr.resample("D").mean()
-    elif type == "max":
-        sr_daily = sr.resample("D").max()
-    elif type == "min":
-        sr_daily = sr.resample("D").min()
-
-    dayofyear = sr_daily.index.dayofyear
-    dic_quantiles = {}
-    
-    quantile_map = {
-        "Q10": 0.10,
-        "Q25": 0.25,
-        "Q50": 0.50,
-        "Q75": 0.75,
-        "Q90": 0.90
-    }
-    for qname, qval in quantile_map.items():
-        dic_quantiles[qname] = sr_daily.groupby(dayofyear).quantile(qval)
-    
-    dic_quantiles["Max"] = sr_daily.groupby(dayofyear).max()
-    dic_quantiles["Min"] = sr_daily.groupby(dayofyear).min()
-
-    # Number of days per year
-    days_per_year = sr_daily.groupby(sr_daily.index.year).size()
-    # Count year's number of days < 365
-    need_fix = (days_per_year < 365).any()
-
-    if need_fix:
-        index_full = pd.Index(range(1, 366))
-        for k in dic_quantiles:
-            dic_quantiles[k] = dic_quantiles[k].reindex(index_full).interpolate()
-
-    pltt.plot_quantiles(
+    spec = pltt.FigureSpec(
+        pltt.plot_quantiles,
         dic_quantiles,
         title,
         ylabel,
         img_path,
         all
     )
+    _draw(spec, plot, figures)
     
     return dic_quantiles
 
@@ -127,7 +245,9 @@ def quantile_max(
     sr,
     start_date,
     end_date,
-    title
+    title,
+    plot = True,
+    figures = None
 ):
     """
     This function is quite similar to the quantiles function. 
@@ -138,16 +258,66 @@ def quantile_max(
         start_date (str): _description_
         end_date (str): _description_
         title (str): _description_
+        plot (bool, optional): draws the figure. False only computes. Defaults to True.
+        figures (list, optional): collects the figure as a deferred plotting.FigureSpec
+            instead of drawing it (cf. plotting.render_figures). Defaults to None.
+
+    Returns:
+        Three pd.Series: median, max and min of the daily maxima
     """
-    sr_selected = sr.loc[start_date:end_date]
-    sr_selected_d = sr_selected.resample("D").max()
+    cube_daily = _as_cube(sr, start_date, end_date).daily("max")
     
-    dayofyear = sr_selected_d.index.dayofyear
-    sr_q50 = sr_selected_d.groupby(dayofyear).quantile(0.50)
-    sr_max = sr_selected_d.groupby(dayofyear).max()
-    sr_min = sr_selected_d.groupby(dayofyear).min()
+    dic_stats = cube_daily.statistics(["Q50", "Max", "Min"])
+    sr_q50 = dic_stats["Q50"]
+    sr_max = dic_stats["Max"]
+    sr_min = dic_stats["Min"]
     
-    pltt.plot_quantiles_max(sr_q50, sr_max, sr_min, title)
+    spec = pltt.FigureSpec(pltt.plot_quantiles_max, sr_q50, sr_max, sr_min, title)
+    _draw(spec, plot, figures)
+
+    return sr_q50, sr_max, sr_min
+
+
+def _unit(
+    variable: str
+):
+    # Unit of the variables studied with thresholds
+    if variable in ["temperature", "minimal temperature", "maximal temperature"]:
+        return "°C"
+    elif variable == "relative humidity":
+        return "%"
+    elif variable == "precipitation":
+        return "mm"
+    
+    raise ValueError("Variable unit not defined")
+
+
+def _threshold_counts(
+    variable: str,
+    months : list,
+    list_sr : list,
+    threshold : int,
+    study_sign : str,
+    verbose : bool
+):
+    # Counts of each series (in the order of list_sr) from the exceedance engine, dates
+    # printed on demand
+    if study_sign not in (">", "<"):
+        raise ValueError("Study sign must be either '>' or '<'")
+    
+    unit = _unit(variable)
+    months_letter = season_label(months)
+    engine = ExceedanceEngine(list_sr, {months_letter: tuple(months)})
+    df_counts = engine.counts(threshold, signs=(study_sign,))
+    
+    counts = df_counts.sort_values("series")["count"].to_list()
+    if verbose:
+        for position, (period, count) in enumerate(zip(engine.periods, counts)):
+            date = engine.dates(position, months_letter, threshold, study_sign).to_list()
+            print(f"Numbre of days with {variable} {study_sign} {threshold}{unit} for {period} : {count}")
+            print(f"The corresponding dates are : {date}")
+    
+    return counts, unit, months_letter
 
 
 def thresholds (
@@ -156,7 +326,10 @@ def thresholds (
     first_sr : pd.Series,
     second_sr : pd.Series,
     threshold : int,
-    study_sign : str
+    study_sign : str,
+    plot : bool = True,
+    figures : list = None,
+    verbose : bool = False
 ):
     """
     Computes and plots the frequency of days exceeding or below a given temperature threshold
@@ -169,61 +342,29 @@ def thresholds (
         threshold (int): Temperature threshold to evaluate (°C).
         data_type (str): Type of temperature data ("maximal" or "minimal").
         study_sign (str): Sign to study, either ">" or "<".
+        plot (bool, optional): draws the figure. False only computes. Defaults to True.
+        figures (list, optional): collects the figure as a deferred plotting.FigureSpec
+            instead of drawing it (cf. plotting.render_figures). Defaults to None.
+        verbose (bool, optional): prints the counts and the corresponding dates (for sweeps
+            over many thresholds, cf. exceedance.ExceedanceEngine). Defaults to False.
+
+    Returns:
+        list: number of days meeting the threshold for each period
     """
+    periods = [period_label(first_sr), period_label(second_sr)]
     
-    if months == [12, 1, 2]:
-        months_letter="DJF"
-    elif months == [3, 4, 5]:
-        months_letter="MAM"
-    elif months == [6, 7, 8]:
-        months_letter="JJA"
-    elif months == [9, 10, 11]:
-        months_letter="SON"
-    
-    periods = [f"{first_sr.index.year.min()}-{first_sr.index.year.max()}",
-               f"{second_sr.index.year.min()}-{second_sr.index.year.max()}"]
-    
-    if variable in ["temperature", "minimal temperature", "maximal temperature"]:
-        unit = "°C"
-    elif variable == "relative humidity":
-        unit = "%"
-    elif variable == "precipitation":
-        unit = "mm"
-    else:
-        raise ValueError("Variable unit not defined")
-    
-    # List to store the counts
-    count = []
-    
-    # Selecting the months
-    sr_frst = first_sr[first_sr.index.month.isin(months)]
-    sr_snd = second_sr[second_sr.index.month.isin(months)]
-    
-    if study_sign == ">":
-        sr_freq_frst = sr_frst[sr_frst > threshold]
-        sr_freq_snd = sr_snd[sr_snd > threshold]
-        
-    elif study_sign == "<":
-        sr_freq_frst = sr_frst[sr_frst < threshold]
-        sr_freq_snd = sr_snd[sr_snd < threshold]
-    
-    else:
-        raise ValueError("Study sign must be either '>' or '<'")
-    
-    count_frst = sr_freq_frst.count()
-    date_frst = sr_freq_frst.index.to_list()
-    print(f"Numbre of days with {variable} {study_sign} {threshold}{unit} for {periods[0]} : {count_frst}")
-    print(f"The corresponding dates are : {date_frst}")
-    count.append(count_frst)
-    
-    count_snd = sr_freq_snd.count()
-    date_snd = sr_freq_snd.index.to_list()
-    print(f"Numbre of days with {variable} {study_sign} {threshold}{unit} for {periods[1]} : {count_snd}")
-    print(f"The corresponding dates are : {date_snd}")
-    count.append(count_snd)
+    count, unit, months_letter = _threshold_counts(
+        variable,
+        months,
+        [first_sr, second_sr],
+        threshold,
+        study_sign,
+        verbose
+    )
     
     # Plotting the frequency comparison
-    pltt.plot_threshold(
+    spec = pltt.FigureSpec(
+        pltt.plot_threshold,
         variable,
         unit,
         count,
@@ -232,6 +373,9 @@ def thresholds (
         periods,
         study_sign
     )
+    _draw(spec, plot, figures)
+    
+    return count
     
     
 def thresholds_serie(
@@ -239,7 +383,10 @@ def thresholds_serie(
     months : list,
     list_sr : list,
     threshold : int,
-    study_sign : str
+    study_sign : str,
+    plot : bool = True,
+    figures : list = None,
+    verbose : bool = False
 ):
     """
     Computes and plots the frequency of days exceeding or below a given temperature threshold
@@ -252,59 +399,28 @@ def thresholds_serie(
         threshold (int): Temperature threshold to evaluate (°C).
         data_type (str): Type of temperature data ("maximal" or "minimal").
         study_sign (str): Sign to study, either ">" or "<".
-    """
-    
-    dic_count = {}
-    
-    if variable in ["temperature", "minimal temperature", "maximal temperature"]:
-        unit = "°C"
-    elif variable == "relative humidity":
-        unit = "%"
-    elif variable == "precipitation":
-        unit = "mm"
-    else:
-        raise ValueError("Variable unit not defined")
-    
-    # Seasons definition
-    seasons = {
-        (12, 1, 2): "DJF",
-        (3, 4, 5): "MAM",
-        (6, 7, 8): "JJA",
-        (9, 10, 11): "SON",
-    }
-    
-    months_letter = None
-    for mlist, label in seasons.items():
-        if set(months) == set(mlist):
-            months_letter = label
-            break
+        plot (bool, optional): draws the figure. False only computes. Defaults to True.
+        figures (list, optional): collects the figure as a deferred plotting.FigureSpec
+            instead of drawing it (cf. plotting.render_figures). Defaults to None.
+        verbose (bool, optional): prints the counts and the corresponding dates. Defaults
+            to False.
 
-    if months_letter is None:
-        months_letter = str(months)
-        
-    for sr in list_sr:
-        
-        period = f"{sr.index.year.min()}-{sr.index.year.max()}"
-
-        # Selecting the months
-        sr_months = sr[sr.index.month.isin(months)]
-    
-        if study_sign == ">":
-            sr_freq = sr_months[sr_months > threshold]
-        elif study_sign == "<":
-            sr_freq = sr_months[sr_months < threshold]
-        else:
-            raise ValueError("Study sign must be either '>' or '<'")
-    
-        count = sr_freq.count()
-        date = sr_freq.index.to_list()
-        print(f"Numbre of days with {variable} {study_sign} {threshold}{unit} for {period} : {count}")
-        print(f"The corresponding dates are : {date}")
-        
-        dic_count[period] = count
+    Returns:
+        dict: number of days meeting the threshold, keyed by period
+    """
+    counts, unit, months_letter = _threshold_counts(
+        variable,
+        months,
+        list_sr,
+        threshold,
+        study_sign,
+        verbose
+    )
+    dic_count = dict(zip([period_label(sr) for sr in list_sr], counts))
     
     # Plotting the frequency comparison
-    pltt.plot_threshold_serie(
+    spec = pltt.FigureSpec(
+        pltt.plot_threshold_serie,
         variable,
         unit,
         dic_count,
@@ -312,6 +428,7 @@ def thresholds_serie(
         threshold,
         study_sign
     )
+    _draw(spec, plot, figures)
     
     return dic_count
     
@@ -323,6 +440,9 @@ def year_vs_climato(
     time_range_climato:str,
     start: str,
     end: str = None,
+    plot: bool = True,
+    figures: list = None,
+    min_hours: int = None
 ):
     """_summary_
 
@@ -332,12 +452,21 @@ def year_vs_climato(
         time_range_climato (_type_): corresponds to the period used to compute the climatology.
         Can be "1990-2019" or "1960-1989".
         end (str, optional): _description_. Defaults to None.
+        plot (bool, optional): draws the figures. False only computes. Defaults to True.
+        figures (list, optional): collects the figures as deferred plotting.FigureSpec
+            instead of drawing them (cf. plotting.render_figures). Defaults to None.
+        min_hours (int, optional): days with less valid hourly values are left out.
+            Defaults to None (any).
+
+    Returns:
+        pd.Series, pd.Series and dict: daily values of the year, normal and quantiles
+        reindexed on the same dates
     """
 
     # Getting the actual year data
     year = start[:4]
     sr_actu_year = sr.loc[start:end]
-    sr_actu_year_d = sr_actu_year.resample("D").mean()
+    sr_actu_year_d = resample_daily(sr_actu_year, min_hours)["mean"]
     
     sr_clim_on_dates = reindex_clim_on_year(
         sr_actu_year_d,
@@ -357,137 +486,237 @@ def year_vs_climato(
         sr_clim_on_dates
     )
     
-    # Plotting
-    fig, ax = plt.subplots(figsize=(10, 5))
-    ax.plot(
-        sr_actu_year_d.index,
+    # Plotting compared to the normal, then to quantiles
+    spec = pltt.FigureSpec(
+        pltt.plot_year_vs_normal,
         sr_actu_year_d,
-        label=f"{year} temperature",
-        color="red"
-        ) 
-    ax.plot(
-        sr_clim_on_dates.index,
         sr_clim_on_dates,
-        label=f"Normal-{time_range_climato}",
-        color="blue"
-        ) 
-
-    ax.set_title(f"Comparison between {year} temperature and {time_range_climato} normal at Rivesaltes station") 
-    ax.set_xlabel("Date") 
-    ax.set_ylabel("Temperature (°C)") 
-    ax.yaxis.set_minor_locator(plt.MultipleLocator(0.5))
-    ax.grid(True) 
-    ax.legend() 
-    plt.tight_layout() 
-
-    valid = sr_actu_year_d.notna() & sr_clim_on_dates.notna()  # éviter NaN lors du remplissage
-    ax.fill_between(sr_actu_year_d.index, 
-                    sr_actu_year_d, sr_clim_on_dates, 
-                    where=(valid & (sr_actu_year_d > sr_clim_on_dates)), 
-                    interpolate=True, color="red", alpha=0.3
-                    )
-    ax.fill_between(sr_actu_year_d.index, 
-                    sr_actu_year_d, sr_clim_on_dates, 
-                    where=(valid & (sr_actu_year_d <= sr_clim_on_dates)), 
-                    interpolate=True, color="blue", alpha=0.2
-                    )
-
-    if year == "2025":
-        ax.text(
-            0.72, 0.035,
-            all_diff,
-            transform=ax.transAxes,
-            va="bottom",
-            ha="left",
-            fontsize=10,
-            bbox=dict(facecolor="white", alpha=1, edgecolor="red")  
-        )
-    else:
-        ax.text(
-            0.45, 0.035,
-            all_diff,
-            transform=ax.transAxes,
-            va="bottom",
-            ha="left",
-            fontsize=10,
-            bbox=dict(facecolor="white", alpha=1, edgecolor="red")  
-        )
-
-    plt.savefig(
-        f"figs/temp/clim_vs_year/norm_{time_range_climato}_{year}_year.png",
-        dpi=300,
-        bbox_inches="tight"
+        all_diff,
+        time_range_climato,
+        year
     )
+    _draw(spec, plot, figures)
     
-    # Plotting compared to quantiles
-    pltt.actu_year_vs_plot(
+    spec = pltt.FigureSpec(
+        pltt.actu_year_vs_plot,
         dic_quantiles_on_dates,
         sr_actu_year_d,
         time_range_climato,
         year
     )
+    _draw(spec, plot, figures)
     
+    return sr_actu_year_d, sr_clim_on_dates, dic_quantiles_on_dates
+
+
+@memoize
+def _precip_climato(
+    sr_ini,
+    start: str,
+    end: str,
+    freq: str,
+    method: str,
+    min_hours: int = None,
+    min_days: int = None
+):
+    # Daily or monthly precipitation normal (cached)
+    if freq == "D":
+        cube_d = _daily_cube(sr_ini, "sum", start, end, min_hours, min_days)
+        stat = method.capitalize()
+        return cube_d.statistics([stat])[stat]
+    
+    if isinstance(sr_ini, DoyCube):
+        sr_tdy = sr_ini.period(start, end).to_series()
+    else:
+        sr_tdy = sr_ini.loc[start:end]
+    if min_hours is not None or min_days is not None:
+        # Daily sums of the kept days, months without any left out
+        sr_tdy = resample_daily(sr_tdy, min_hours, min_days)["sum"]
+        sr_stdy_m = sr_tdy.resample("ME").sum(min_count=1)
+    else:
+        sr_stdy_m = sr_tdy.resample("ME").sum()
     
+    months = pd.Index(calendar_keys(sr_stdy_m.index).month, name=sr_stdy_m.index.name).astype(np.int32)
+    if method == "mean":
+        return sr_stdy_m.groupby(months).mean()
+    if method == "median":
+        return sr_stdy_m.groupby(months).median()
+
+
 def precip_climato(
     sr_ini,
     start,
     end,
     freq,
-    method
+    method,
+    plot = True,
+    figures = None,
+    min_hours = None,
+    min_days = None
 ):
     """
     Computes the precipitation climatology over a given period.
     
     Args:
-        sr_ini (pd.Series): Initial precipitation series with datetime index.
+        sr_ini (pd.Series or DoyCube): Initial precipitation series with datetime index,
+            or its precomputed DoyCube.
         start (str): Start date of the climatology period (inclusive).
         end (str): End date of the climatology period (inclusive).
         freq (str): Resampling frequency (e.g., 'D' for daily, 'M' for monthly).
         method (str): Method to compute climatology ('mean', 'median', etc.).
+        plot (bool, optional): draws the figure. False only computes. Defaults to True.
+        figures (list, optional): collects the figure as a deferred plotting.FigureSpec
+            instead of drawing it (cf. plotting.render_figures). Defaults to None.
+        min_hours (int, optional): days with less valid hourly values are left out.
+            Defaults to None (any).
+        min_days (int, optional): months with less kept days are left out (hourly Series
+            only). Defaults to None (any).
         
     Returns:
         pd.Series: Climatology series resampled to the specified frequency.
     """
-    sr_tdy = sr_ini.loc[start:end]
     frst_year = start[:4]
     last_year = end[:4]
     
     
-    if freq == "D":
-        sr_stdy_d = sr_tdy.resample("D").sum()
+    sr_climato = _precip_climato(sr_ini, start, end, freq, method, min_hours, min_days)
+
+    spec = pltt.FigureSpec(
+        pltt.plot_rr_nrm,
+        sr_climato,
+        frst_year,
+        last_year,
+        freq,
+        method
+    )
+    _draw(spec, plot, figures)
         
-        if method == "mean":
-            dayofyear = sr_stdy_d.index.dayofyear
-            sr_climato = sr_stdy_d.groupby(dayofyear).mean()
-        if method == "median":
-            dayofyear = sr_stdy_d.index.dayofyear
-            sr_climato = sr_stdy_d.groupby(dayofyear).median()
-
-        pltt.plot_rr_nrm(
-            sr_climato,
-            frst_year,
-            last_year,
-            freq,
-            method
+    return sr_climato
+
+
+def circular_mean(
+    sr_day: pd.Series,
+    windows: list
+):
+    """
+    Centered moving average of a day-of-year Series over the circular calendar (the last day
+    is followed by the first one), for several window lengths at once.
+    
+    The window sums are read from a single cumulative sum of the ring: a sum over days [a, b]
+    is S(b + 1) - S(a) with S(k) = cumsum[k mod n] + (k // n) * total, so each window costs O(n)
+    whatever its length, without extending the Series. Missing values are ignored (as rolling
+    with min_periods=1).
+
+    Args:
+        sr_day (pd.Series): values of each day of the year (e.g. 366 days).
+        windows (list): window lengths in days (the window of an even length starts w/2 days
+            before the day, as pandas rolling with center=True).
+
+    Returns:
+        dict: smoothed pd.Series (same index as sr_day), keyed by window length.
+    """
+    values = sr_day.to_numpy(dtype="float64")
+    n = len(values)
+    valid = ~np.isnan(values)
+    
+    # One cumulative sum of the values and one of the valid days for every window
+    csum = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    ccount = np.concatenate(([0], np.cumsum(valid)))
+    days = np.arange(n)
+    
+    def ring_sum(cumul, k):
+        turns, rem = np.divmod(k, n)
+        return cumul[rem] + turns * cumul[n]
+    
+    dic_smooth = {}
+    for window in windows:
+        first = days - window // 2
+        after_last = first + window
+        sums = ring_sum(csum, after_last) - ring_sum(csum, first)
+        counts = ring_sum(ccount, after_last) - ring_sum(ccount, first)
+        dic_smooth[window] = pd.Series(
+            np.where(counts > 0, sums / np.maximum(counts, 1), np.nan),
+            index=sr_day.index
         )
+    
+    return dic_smooth
+
+
+def circular_median(
+    sr_day: pd.Series,
+    windows: list
+):
+    """
+    Centered moving median of a day-of-year Series over the circular calendar, for several
+    window lengths at once.
+    
+    The windows of every day are gathered with modular indexing as one (days x window) array,
+    sorted along the window axis in a single numpy call (missing values last), and the median
+    is read from the middle of the valid values of each row. Missing values are ignored (as
+    rolling with min_periods=1).
+
+    Args:
+        sr_day (pd.Series): values of each day of the year (e.g. 366 days).
+        windows (list): window lengths in days (same centering as circular_mean).
+
+    Returns:
+        dict: smoothed pd.Series (same index as sr_day), keyed by window length.
+    """
+    values = sr_day.to_numpy(dtype="float64")
+    n = len(values)
+    days = np.arange(n)
+    
+    dic_smooth = {}
+    for window in windows:
+        positions = (days[:, np.newaxis] - window // 2 + np.arange(window)) % n
+        windowed = np.sort(values[positions], axis=1)
         
-    elif freq == "M":
-        sr_stdy_m = sr_tdy.resample("ME").sum()
-        
-        if method == "mean":
-            sr_climato = sr_stdy_m.groupby(sr_stdy_m.index.month).mean()
-        if method == "median":
-            sr_climato = sr_stdy_m.groupby(sr_stdy_m.index.month).median()
+        counts = (~np.isnan(windowed)).sum(axis=1)
+        lo = np.maximum(counts - 1, 0) // 2
+        hi = np.maximum(counts, 1) // 2
+        median = (windowed[days, lo] + windowed[days, hi]) / 2
         
-        pltt.plot_rr_nrm(
-            sr_climato,
-            frst_year,
-            last_year,
-            freq,
-            method
+        dic_smooth[window] = pd.Series(
+            np.where(counts > 0, median, np.nan),
+            index=sr_day.index
         )
+    
+    return dic_smooth
+
+
+def _smooth_normal(
+    sr_day: pd.Series,
+    windows: list,
+    method: str
+):
+    """
+    Smooths a day-of-year normal over the circular calendar for several window lengths.
+    Returns a dict of pd.Series indexed 1..n, keyed by window length.
+    """
+    sr_day = pd.Series(sr_day.to_numpy(), index=range(1, len(sr_day)+1))
+    
+    if method == "mean":
+        return circular_mean(sr_day, windows)
+    elif method == "median":
+        return circular_median(sr_day, windows)
+    
+    raise ValueError("Method must be either 'mean' or 'median'")
+
+
+@memoize
+def _clim_ma(
+    sr,
+    ma_range,
+    method,
+    start_range,
+    end_range
+):
+    # Moving-average normal (cached)
+    stat = method.capitalize()
+    sr_day = _as_cube(sr, start_range, end_range).statistics([stat], complete=True)[stat]
         
-    return sr_climato
+    # Calendar wrap-around: the average for 1 uses 364/365/366 and 2/3/4
+    return _smooth_normal(sr_day, [ma_range], method)[ma_range]
 
 
 def clim_ma(
@@ -498,100 +727,113 @@ def clim_ma(
     start_range,
     end_range,
     folder = None,
-    plot = True
+    plot = True,
+    figures = None
 ):
     """
     Produces a normal based on a moving average method <=> Ti for i day is equal to the average of T[i-n;i-1], 
     Ti and T[i+1;i+n] where n is the max number of days taken before and after the i day. Smoothes the normal.
 
     Args:
-        sr (pd.series): pandas series containing the values
+        sr (pd.series or DoyCube): pandas series containing the values, or its precomputed DoyCube
         ma_range (int): numbers of days used to compute the moving average (equal to 2n+1)
         method (str): can be mean or median
         start_range (str): first date time to compute the normal
         end_range (str): last date time to compute the normal
-        folder (str): folder to store the image
-        
+        folder (str): folder to store the image, no figure without it
+        plot (bool, optional): draws the figure. False only computes. Defaults to True.
+        figures (list, optional): collects the figure as a deferred plotting.FigureSpec
+            instead of drawing it (cf. plotting.render_figures). Defaults to None.
+
     Returns:
-        pd.series: contaning the normal indexes on 366 days
+        pd.series: contaning the normal indexes on 366 days (60 = Feb 29)
     """
-    sr_range = sr.loc[start_range:end_range]
-    
     start_year = start_range[:4]
     end_year = end_range[:4]
     
-    # Extracting each day
-    day = sr_range.index.dayofyear
-    if method == "mean":
-        sr_day = sr_range.groupby(day).apply(np.mean)
-    elif method == "median":
-        sr_day = sr_range.groupby(day).apply(np.median)
-        
-    # Risk for limit days (as 1 or 365) to not be able to have an average
-    # Wrap-around of the calendar to do the average for 1 with 364/364/365 and 2/3/4
-    # It creates a continuity: 365 is followed by 1
-    sr_extended = pd.concat(
-        [sr_day, sr_day, sr_day], 
-        ignore_index=True
-        )
-    
-    # Applying the moving average
-    if method == "mean":
-        sr_smoothed = sr_extended.rolling(
-            window=ma_range, 
-            center=True, 
-            min_periods=1
-            ).mean()
-    elif method == "median":
-        sr_smoothed = sr_extended.rolling(
-            window=ma_range, 
-            center=True, 
-            min_periods=1
-            ).median()
-    
-    # Extracting the central part = smooth climatology
-    n = len(sr_day)
-    sr_clim = sr_smoothed[n : 2*n].reset_index(drop=True)
+    sr_clim = _clim_ma(sr, ma_range, method, start_range, end_range)
     
     if folder is not None:
-        if plot == True:
-            pltt.plot_data(
-                sr_clim,
-                "Normal",
-                f"Moving average ({ma_range} days) {method} normal {var_name} ({start_year}-{end_year})",
-                f"{folder}/ma_{ma_range}days_{method}_norm_{start_year}_{end_year}"
-            )
+        spec = pltt.FigureSpec(
+            pltt.plot_data,
+            sr_clim,
+            "Normal",
+            f"Moving average ({ma_range} days) {method} normal {var_name} ({start_year}-{end_year})",
+            f"{folder}/ma_{ma_range}days_{method}_norm_{start_year}_{end_year}"
+        )
+        _draw(spec, plot, figures)
     
     return sr_clim
 
 
 def clim_ma_compa(
     sr,
+    var_name,
     range_ma,
     method,
     start_range,
-    end_range,
-    folder = None
+    end_range
 ):
+    """
+    Computes moving-average normals for several window lengths in one call. The daily normal
+    is computed once, then every window is smoothed from the same cumulative sum.
+
+    Args:
+        sr (pd.Series or DoyCube): pandas series containing the values, or its precomputed DoyCube
+        var_name (str): name of the variable (same arguments as clim_ma)
+        range_ma (tuple): (start, stop, step) of the window lengths, as range()
+        method (str): can be mean or median
+        start_range (str): first date time to compute the normal
+        end_range (str): last date time to compute the normal
+
+    Returns:
+        dict: normals indexed on 366 days, keyed by window length
+    """
+    stat = method.capitalize()
+    sr_day = _as_cube(sr, start_range, end_range).statistics([stat], complete=True)[stat]
     
-    dic_nrms = {}
     start, stop, step = range_ma
-    
-    for ndays in range(start, stop, step):
-        sr_clim = clim_ma(
-            sr,
-            ndays,
-            method,
-            start_range,
-            end_range,
-            folder,
-            False
-            )
-        dic_nrms[ndays] = sr_clim
+    dic_nrms = _smooth_normal(sr_day, list(range(start, stop, step)), method)
     
     return (dic_nrms)
 
 
+@memoize
+def _ma_quantiles(
+    sr,
+    ma_range,
+    type,
+    start_range,
+    end_range,
+    pooled,
+    min_hours = None,
+    min_days = None
+):
+    # Smoothed or pooled quantiles (cached)
+    qnames = list(QUANTILE_MAP)
+
+    if pooled:
+        if isinstance(sr, ClimAccumulator):
+            raise ValueError("Pooled quantiles need the daily values, not an accumulator")
+        # --- Quantiles of the values pooled over the window ---
+        cube_daily = _daily_cube(sr, DAILY_AGG[type], start_range, end_range, min_hours, min_days)
+        dic_final = cube_daily.pooled_statistics(qnames + ["Min", "Max"], ma_range // 2)
+    else:
+        # --- Raw quantiles per day ---
+        if isinstance(sr, ClimAccumulator):
+            dic_q = sr.quantiles(qnames)
+        else:
+            cube_daily = _daily_cube(sr, DAILY_AGG[type], start_range, end_range, min_hours, min_days)
+            dic_q = cube_daily.statistics(qnames + ["Min", "Max"], complete=True)
+
+        # --- Circular smoothing, wrap-around of the calendar (same as clim_ma) ---
+        dic_final = {}
+        for key, serie in dic_q.items():
+            dic_final[key] = circular_mean(serie, [ma_range])[ma_range]
+
+    return dic_final
+
+
 def ma_quantiles(
     sr,
     ma_range,
@@ -601,74 +843,45 @@ def ma_quantiles(
     title,
     ylabel,
     folder,
-    all = True
+    all = True,
+    pooled = False,
+    plot = True,
+    figures = None,
+    min_hours = None,
+    min_days = None
 ):
     """
     Compute moving-average climatological quantiles using the same wrap-around logic
     as clim_ma().
 
     Args:
-        sr (pd.Series): time series data
+        sr (pd.Series, DoyCube or ClimAccumulator): time series data, its precomputed DoyCube
+            or an accumulator of daily values (approximate quantiles, same as quantiles())
         ma_range (int): moving average window (must be odd ideally)
         type (str): "avg", "max", "min" (same as quantiles())
-        start_range (str): beginning of period
+        start_range (str): beginning of period (labels only for an accumulator, which
+            already covers its own period)
         end_range (str): end of period
         folder (str): folder to save plots
-        quantiles (list): quantiles to compute
-        plot (bool): produce plot or not
+        all (bool): plot all the quantiles or only median/max/min
+        pooled (bool): computes the quantiles of the values pooled over the ma_range window
+            around each day, instead of smoothing the daily quantiles
+        plot (bool, optional): draws the figure. False only computes. Defaults to True.
+        figures (list, optional): collects the figure as a deferred plotting.FigureSpec
+            instead of drawing it (cf. plotting.render_figures). Defaults to None.
+        min_hours (int, optional): days with less valid hourly values are left out.
+            Defaults to None (any).
+        min_days (int, optional): months with less kept days are left out (hourly Series
+            only). Defaults to None (any).
 
     Returns:
         dict of pd.Series: smoothed quantiles indexed 1..366
     """
 
-    sr_range = sr.loc[start_range:end_range]
     start_year = start_range[:4]
     end_year = end_range[:4]
 
-    if type == "avg":
-        sr_daily = sr_range.resample("D").mean()
-    elif type == "max":
-        sr_daily = sr_range.resample("D").max()
-    elif type == "min":
-        sr_daily = sr_range.resample("D").min()
-
-    dayofyear = sr_daily.index.dayofyear
-
-    # --- Raw quantiles per day ---
-    dic_q = {}
-
-    qnames = ["Q10", "Q25", "Q50", "Q75", "Q90"]
-    qvalues = [0.10, 0.25, 0.50, 0.75, 0.90]
-
-    for qname, qval in zip(qnames, qvalues):
-        dic_q[qname] = sr_daily.groupby(dayofyear).quantile(qval)
-
-    # Add Min/Max
-    dic_q["Min"] = sr_daily.groupby(dayofyear).min()
-    dic_q["Max"] = sr_daily.groupby(dayofyear).max()
-
-    # --- Wrap-around extension (same as clim_ma) ---
-    dic_ext = {}
-    for key, serie in dic_q.items():
-        dic_ext[key] = pd.concat([serie, serie, serie], ignore_index=True)
-
-    # --- Rolling window smoothing ---
-    dic_smooth = {}
-    for key, serie in dic_ext.items():
-        dic_smooth[key] = (
-            serie.rolling(
-                window=ma_range,
-                center=True,
-                min_periods=1
-            ).mean()
-        )
-
-    # --- Extract central part (+ reset index 1..366) ---
-    n = len(dic_q[qnames[0]])  # number of days = 365 or 366
-    dic_final = {}
-    for key, serie in dic_smooth.items():
-        dic_final[key] = serie[n:2*n].reset_index(drop=True)
-        dic_final[key].index = range(1, len(dic_final[key])+1)
+    dic_final = _ma_quantiles(sr, ma_range, type, start_range, end_range, pooled, min_hours, min_days)
 
     img_path = (
         f"{folder}/ma_{ma_range}days_quantiles_{start_year}_{end_year}"
@@ -677,13 +890,15 @@ def ma_quantiles(
     # Transform keys for plotting function (needs strings)
     dic_plot = {str(k): v for k, v in dic_final.items()}
 
-    pltt.plot_quantiles(
+    spec = pltt.FigureSpec(
+        pltt.plot_quantiles,
         dic_plot,
         title,
         ylabel,
         img_path,
         all
     )
+    _draw(spec, plot, figures)
 
     return dic_final
 
@@ -693,28 +908,200 @@ def season_box(
     months,
     y_label,
     title,
-    folder
+    folder,
+    plot = True,
+    figures = None
 ):
-        
+    """
+    Groups the values of each period by month of the season, for box plots.
+
+    Args:
+        sr_list (list): pd.Series, one per period
+        months (tuple): months of the season (e.g. (6, 7, 8))
+        y_label (str): label of the y axis
+        title (str): title of the chart
+        folder (str): folder to store the image, "precip" also computes the totals
+        plot (bool, optional): draws the figure. False only computes. Defaults to True.
+        figures (list, optional): collects the figure as a deferred plotting.FigureSpec
+            instead of drawing it (cf. plotting.render_figures). Defaults to None.
+
+    Returns:
+        dict: per period, the sorted values of each month ("series"), their box statistics
+        ("stats", cf. groups.Groups.box_stats), the total and the monthly cumuls
+    """
     dic_sr = {}
     for sr in sr_list:
-        period = f"{sr.index.year.min()}-{sr.index.year.max()}"
-        sr_m = sr[sr.index.month.isin(months)]
-        sr_grouped = [sr_m[sr_m.index.month == m] for m in months]
+        period = period_label(sr)
+        # One sort per period, the monthly groups are views
+        groups = Groups.by_month(sr, months)
         
         if folder == "precip":
-            total = sr_m.sum()
-            cumul_m = [g.sum() for g in sr_grouped]
+            cumul_m = list(groups.sums())
+            total = sum(cumul_m)
         else:
             total = None
             cumul_m = None   
             
         dic_sr[period] = {
-            "series": sr_grouped,
+            "series": groups.groups(),
+            "stats": groups.box_stats(),
             "total": total,
             "cumul_m": cumul_m
     }
     
-    pltt.season_box_plot(dic_sr, months, y_label, title, folder)
+    spec = pltt.FigureSpec(pltt.season_box_plot, dic_sr, months, y_label, title, folder)
+    _draw(spec, plot, figures)
+
+    return dic_sr
+
+
+def _night_aggregate(
+    sr: pd.Series,
+    night_dates: np.ndarray,
+    months,
+    how: str
+):
+    # Daily aggregate of the night values, keyed by the date of their night
+    keep = ~np.isnat(night_dates)
+    if months is not None:
+        keep &= np.isin(calendar_keys(pd.DatetimeIndex(night_dates)).month, list(months))
+    
+    values = pd.Series(sr.to_numpy()[keep], index=pd.DatetimeIndex(night_dates[keep], name="night_date"))
+    
+    return values.groupby(level=0).agg(how).rename("value")
+
+
+def night_time(
+    sr: pd.Series,
+    months = None,
+    latitude: float = STATION_LOCATION[0],
+    longitude: float = STATION_LOCATION[1],
+    how: str = "mean"
+):
+    """
+    Aggregates the values of each astronomical night (from sunset to the next sunrise at the
+    station) into a daily night-time series. The sun times are computed per day of the year
+    (cf. astro.sun_times) and cached per location and year.
+
+    Args:
+        sr (pd.Series): sub-daily series (UTC dates when naive).
+        months (list, optional): months of the nights kept (e.g. [6, 7, 8]). Defaults to None (all).
+        latitude (float, optional): latitude of the station in degrees. Defaults to Perpignan.
+        longitude (float, optional): longitude of the station in degrees. Defaults to Perpignan.
+        how (str, optional): aggregation of the night values ("mean", "min", "max"...).
+            Defaults to "mean".
+
+    Returns:
+        pd.Series: night-time values indexed by night date (day of the sunset).
+    """
+    night_dates = astronomical_night(sr.index, latitude, longitude)
+    
+    return _night_aggregate(sr, night_dates, months, how)
+
+
+def fixed_night_time(
+    sr: pd.Series,
+    hours: list,
+    months = None,
+    how: str = "mean"
+):
+    """
+    Aggregates the values of fixed night hours into a daily night-time series, the morning
+    hours belonging to the night of the day before.
+
+    Args:
+        sr (pd.Series): sub-daily series.
+        hours (list): night hours (e.g. [21, 22, 23, 0, 1, 2, 3, 4, 5, 6]).
+        months (list, optional): months of the nights kept (e.g. [6, 7, 8]). Defaults to None (all).
+        how (str, optional): aggregation of the night values ("mean", "min", "max"...).
+            Defaults to "mean".
+
+    Returns:
+        pd.Series: night-time values indexed by night date (day of the evening).
+    """
+    night_dates = fixed_night(sr.index, hours)
+    
+    return _night_aggregate(sr, night_dates, months, how)
+
+
+def _station_worker(
+    func,
+    store: str,
+    var_name: str,
+    args: tuple,
+    kwargs: dict
+):
+    # Loading inside the worker: only the store path travels between processes
+    sr = open_station(store, var_name)
+    
+    return func(sr, *args, **kwargs)
+
+
+def gather_stations(
+    results: dict
+):
+    """
+    Gathers per-station results into one table.
 
-    return None
\ No newline at end of file
+    Args:
+        results (dict): result of each station, keyed by POSTE identifier.
+
+    Returns:
+        pd.DataFrame or pd.Series: Series/DataFrame results side by side (one column level per
+            station), dictionaries and tuples of Series with a (station, key) column MultiIndex,
+            other results as one row per station.
+    """
+    first = next(iter(results.values()))
+    
+    if isinstance(first, (pd.Series, pd.DataFrame)):
+        return pd.concat(results, axis=1, names=["POSTE"])
+    
+    if isinstance(first, (dict, tuple)):
+        results = {
+            station: dict(enumerate(res)) if isinstance(res, tuple) else res
+            for station, res in results.items()
+        }
+        values = [val for res in results.values() for val in res.values()]
+        if all(isinstance(val, pd.Series) for val in values):
+            return pd.concat(
+                {(station, key): val for station, res in results.items() for key, val in res.items()},
+                axis=1,
+                names=["POSTE", "key"]
+            )
+        return pd.DataFrame.from_dict(results, orient="index").rename_axis("POSTE")
+    
+    return pd.Series(results, name=getattr(first, "name", None)).rename_axis("POSTE")
+
+
+def map_stations(
+    func,
+    stores: dict,
+    var_name: str,
+    *args,
+    max_workers: int = None,
+    **kwargs
+):
+    """
+    Runs a computing function on every station in parallel, one worker process per station.
+    
+    Each worker reloads its station Series from the store written by mining.partition_stations
+    and calls func(sr, *args, **kwargs). func must be picklable (a module-level function such
+    as clim_ma or quantiles, or a functools.partial of one).
+
+    Args:
+        func (callable): function taking the station Series as first argument.
+        stores (dict): store folder of each station, as returned by partition_stations.
+        var_name (str): name of the variable to load for each station.
+        max_workers (int, optional): number of worker processes. Defaults to the number of CPUs.
+
+    Returns:
+        pd.DataFrame or pd.Series: results of every station gathered by gather_stations.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            station: executor.submit(_station_worker, func, store, var_name, args, kwargs)
+            for station, store in stores.items()
+        }
+        results = {station: future.result() for station, future in futures.items()}
+    
+    return gather_stations(results)
@@ -0,0 +1,447 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from packages.calkeys import calendar_keys
+
+
+# Calendar-aligned layout: 366 month-day columns, Feb 29 has its own column
+N_DAYS = 366
+FEB_29 = 59
+
+# Finest time step of a cube: 15-minute data
+MAX_STEPS_PER_DAY = 96
+
+
+def month_day_position(
+    index: pd.DatetimeIndex
+):
+    """
+    Returns the month-day column (0..365) of each date: 1 Mar is always column 60, whether
+    the year is leap or not, and Feb 29 is column 59.
+
+    Args:
+        index (pd.DatetimeIndex): dates to position.
+
+    Returns:
+        np.ndarray: int64 column of each date.
+    """
+    # The cached keys are int16: widened, as the callers compute flat positions with them
+    return calendar_keys(index).month_day.astype(np.int64)
+
+
+def map_on_dates(
+    sr_doy: pd.Series,
+    index: pd.DatetimeIndex
+):
+    """
+    Maps a day-of-year Series (climatology, quantile...) onto dates.
+
+    Args:
+        sr_doy (pd.Series): values indexed 1..366 in the month-day layout (60 = Feb 29).
+            A 365-day Series (no Feb 29) is also accepted, Feb 29 then takes the Feb 28 value.
+        index (pd.DatetimeIndex): dates to map the values on.
+
+    Returns:
+        pd.Series: values on the requested dates.
+    """
+    sr_doy = sr_doy.sort_index()
+    if sr_doy.index.max() == N_DAYS:
+        values = sr_doy.reindex(range(1, N_DAYS + 1)).to_numpy()
+    else:
+        values = sr_doy.reindex(range(1, N_DAYS)).to_numpy()
+        values = np.insert(values, FEB_29, values[FEB_29 - 1])
+
+    return pd.Series(data=values[month_day_position(index)], index=index)
+
+
+def _seconds_of_day(
+    index: pd.DatetimeIndex
+):
+    # Wall-clock time of day of each date, in seconds
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    values = index.values
+
+    return (values - values.astype("datetime64[D]")) // np.timedelta64(1, "s")
+
+
+def _steps_per_day(
+    seconds: np.ndarray
+):
+    # Time grid of the dates: 1 for daily dates, 24 for hourly (or coarser) time steps and
+    # one row per step for sub-hourly data
+    step = int(np.gcd.reduce(np.append(seconds, 86400)))
+    if step == 86400:
+        return 1
+    if step % 3600 == 0:
+        return 24
+
+    return 86400 // step
+
+
+class DoyCube:
+    """
+    Calendar-aligned layout of a time series: a 2-D float array with one row per year (one row
+    per year and time step for sub-daily data) and one column per month-day, Feb 29 included.
+
+    The layout is built once and shared by the computing functions: selecting a period is a
+    zero-copy slice of rows, day-of-year statistics reduce along the rows and yearly values
+    reduce along the columns.
+
+    Attributes:
+        values (np.ndarray): (n_years * steps_per_day, 366) values, NaN where there is no data.
+        mask (np.ndarray): True where the cell corresponds to a date of the source Series.
+        first_year (int): year of the first row.
+        steps_per_day (int): number of rows per year (1 for daily data, 24 for hourly data).
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        mask: np.ndarray,
+        first_year: int,
+        steps_per_day: int = 1
+    ):
+        self.values = values
+        self.mask = mask
+        self.first_year = first_year
+        self.steps_per_day = steps_per_day
+
+    @classmethod
+    def from_series(
+        cls,
+        sr: pd.Series,
+        steps_per_day: int = None
+    ):
+        """
+        Builds the cube of a Series.
+
+        Each date fills its own cell: duplicated dates (e.g. several stations) or dates off the
+        time grid raise a ValueError instead of overwriting each other.
+
+        Args:
+            sr (pd.Series): daily or sub-daily Series with a DatetimeIndex.
+            steps_per_day (int, optional): number of values per day. Defaults to 1 when all the
+                timestamps are at midnight, 24 for hourly (or coarser) time steps and one per
+                time step for sub-hourly data (e.g. 48 for half-hourly data).
+
+        Returns:
+            DoyCube: calendar-aligned layout of sr.
+        """
+        index = sr.index
+        if not isinstance(index, pd.DatetimeIndex):
+            raise TypeError("Serie index must be a DatetimeIndex")
+        if len(index) == 0:
+            raise ValueError("Cannot build a cube from an empty Serie")
+        if not index.is_unique:
+            raise ValueError(
+                "Cannot build a cube from duplicated dates (several stations?): select one "
+                "station or aggregate the duplicates first"
+            )
+
+        seconds = _seconds_of_day(index)
+        if steps_per_day is None:
+            steps_per_day = _steps_per_day(seconds)
+        if steps_per_day > MAX_STEPS_PER_DAY or np.any(seconds * steps_per_day % 86400):
+            raise ValueError(
+                f"The dates are not on a regular grid of at most {MAX_STEPS_PER_DAY} steps per "
+                "day: resample the Serie first"
+            )
+
+        keys = calendar_keys(index)
+        years = keys.year.astype(np.int64)
+        first_year = int(years.min())
+        n_years = int(years.max()) - first_year + 1
+
+        rows = (years - first_year) * steps_per_day + (seconds * steps_per_day) // 86400
+        cols = month_day_position(index)
+
+        values = np.full((n_years * steps_per_day, N_DAYS), np.nan)
+        mask = np.zeros((n_years * steps_per_day, N_DAYS), dtype=bool)
+        values[rows, cols] = sr.to_numpy(dtype="float64")
+        mask[rows, cols] = True
+
+        return cls(values, mask, first_year, steps_per_day)
+
+    @property
+    def n_years(self):
+        return self.values.shape[0] // self.steps_per_day
+
+    @property
+    def years(self):
+        return np.arange(self.first_year, self.first_year + self.n_years)
+
+    def period(
+        self,
+        start: str = None,
+        end: str = None
+    ):
+        """
+        Selects the whole years between two dates, without copying the data.
+
+        Args:
+            start (str, optional): date of the first year (inclusive). Defaults to the first year.
+            end (str, optional): date of the last year (inclusive). Defaults to the last year.
+
+        Returns:
+            DoyCube: cube sharing its values and mask with self.
+        """
+        last_year = self.first_year + self.n_years - 1
+        start_year = self.first_year if start is None else max(pd.Timestamp(start).year, self.first_year)
+        end_year = last_year if end is None else min(pd.Timestamp(end).year, last_year)
+
+        rows = slice(
+            (start_year - self.first_year) * self.steps_per_day,
+            (end_year - self.first_year + 1) * self.steps_per_day
+        )
+
+        return DoyCube(self.values[rows], self.mask[rows], start_year, self.steps_per_day)
+
+    def daily(
+        self,
+        how: str = "mean",
+        min_hours: int = None
+    ):
+        """
+        Aggregates a sub-daily cube into a daily one (same as resample("D") on the Series).
+
+        Args:
+            how (str, optional): "mean", "min", "max" or "sum". Defaults to "mean".
+            min_hours (int, optional): minimum number of valid values for a day to be kept.
+                Defaults to None (any).
+
+        Returns:
+            DoyCube: daily cube (self if the cube is already daily).
+        """
+        if self.steps_per_day == 1:
+            return self
+
+        shape = (self.n_years, self.steps_per_day, N_DAYS)
+        values = self.values.reshape(shape)
+        mask = self.mask.reshape(shape).any(axis=1)
+        if min_hours is not None:
+            mask &= (~np.isnan(values)).sum(axis=1) >= min_hours
+
+        reducers = {"mean": np.nanmean, "min": np.nanmin, "max": np.nanmax, "sum": np.nansum}
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            values = reducers[how](values, axis=1)
+        values[~mask] = np.nan
+
+        return DoyCube(values, mask, self.first_year, 1)
+
+    def reduce(
+        self,
+        func,
+        axis: str = "year"
+    ):
+        """
+        Reduces the cube along one of its axes with a NaN-aware numpy function (e.g. np.nanmean).
+
+        Args:
+            func (callable): reduction accepting an axis argument.
+            axis (str, optional): "year" collapses the years (one value per month-day),
+                "day" collapses the days (one value per year). Defaults to "year".
+
+        Returns:
+            pd.Series: indexed 1..366 for axis="year", by year for axis="day".
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            if axis == "year":
+                return pd.Series(func(self.values, axis=0), index=pd.RangeIndex(1, N_DAYS + 1))
+            if axis == "day":
+                values = self.values.reshape(self.n_years, -1)
+                return pd.Series(func(values, axis=1), index=pd.Index(self.years, name="year"))
+
+        raise ValueError("axis must be either 'year' or 'day'")
+
+    def statistics(
+        self,
+        stats: list,
+        complete: bool = False
+    ):
+        """
+        Computes several month-day statistics in a single pass.
+
+        Each column is sorted once (missing values last): all the quantiles (linear
+        interpolation, as pandas), minimums and maximums are then read with vectorized
+        indexing, the means from the column sums.
+
+        Args:
+            stats (list): statistics among "Qxx" quantiles (e.g. "Q10", "Q95"), "Median", "Mean",
+                "Min", "Max" and "Count".
+            complete (bool, optional): returns the 366 days, the days without data (e.g. Feb 29
+                when the period has no leap year) being linearly interpolated. Defaults to False.
+
+        Returns:
+            dict: one pd.Series per statistic indexed by month-day (1..366, 60 = Feb 29), limited
+                to the days present in the data unless complete is True.
+        """
+        present = self.mask.any(axis=0)
+        valid = ~np.isnan(self.values)
+        counts = valid.sum(axis=0)
+        filled = counts > 0
+        last = np.maximum(counts - 1, 0)
+        sorted_values = np.sort(self.values, axis=0)
+
+        def read(positions):
+            out = np.take_along_axis(sorted_values, positions[np.newaxis, :], axis=0)[0]
+            return np.where(filled, out, np.nan)
+
+        results = {}
+        for stat in stats:
+            qval = _stat_quantile(stat)
+            if qval is not None:
+                h = last * qval
+                lo = np.floor(h).astype(np.int64)
+                hi = np.minimum(lo + 1, last)
+                v_lo, v_hi = read(lo), read(hi)
+                res = v_lo + (h - lo) * (v_hi - v_lo)
+            elif stat == "Min":
+                res = read(np.zeros(N_DAYS, dtype=np.int64))
+            elif stat == "Max":
+                res = read(last)
+            elif stat == "Mean":
+                sums = np.where(valid, self.values, 0.0).sum(axis=0)
+                res = np.where(filled, sums / np.maximum(counts, 1), np.nan)
+            else:
+                res = counts.astype("float64")
+            results[stat] = res
+
+        index = pd.RangeIndex(1, N_DAYS + 1)
+        if complete:
+            return {
+                stat: pd.Series(np.where(filled, res, np.nan), index=index).interpolate(limit_direction="both")
+                for stat, res in results.items()
+            }
+
+        return {stat: pd.Series(res, index=index)[present] for stat, res in results.items()}
+
+    def pooled_statistics(
+        self,
+        stats: list,
+        half_window: int
+    ):
+        """
+        Computes month-day statistics on pooled samples: the statistics of a day use every value
+        within +/- half_window days of it (circular calendar), over all the years.
+        
+        Each column is sorted once. The pool of the first day is sorted, then the window slides
+        around the calendar: the sorted values of the leaving day are removed and those of the
+        entering day are inserted with searchsorted, so the pool stays sorted without being
+        re-sorted for each of the 366 days.
+
+        Args:
+            stats (list): statistics among "Qxx" quantiles, "Median", "Mean", "Min", "Max" and "Count".
+            half_window (int): number of days pooled before and after each day (k).
+
+        Returns:
+            dict: one pd.Series per statistic indexed by month-day (1..366, 60 = Feb 29).
+        """
+        if not 0 <= half_window < N_DAYS // 2:
+            raise ValueError(f"half_window must be between 0 and {N_DAYS // 2 - 1}")
+
+        sorted_values = np.sort(self.values, axis=0)
+        counts = (~np.isnan(self.values)).sum(axis=0)
+        columns = [sorted_values[:counts[col], col] for col in range(N_DAYS)]
+
+        pool = np.sort(np.concatenate(
+            [columns[col % N_DAYS] for col in range(-half_window, half_window + 1)]
+        ))
+
+        results = np.full((N_DAYS, len(stats)), np.nan)
+        for day in range(N_DAYS):
+            if len(pool):
+                results[day] = _sorted_statistics(pool, stats)
+
+            # Sliding the window by one day
+            leaving = columns[(day - half_window) % N_DAYS]
+            entering = columns[(day + half_window + 1) % N_DAYS]
+
+            # Duplicated values are removed at consecutive positions of the pool
+            first = np.searchsorted(pool, leaving, side="left")
+            rank = np.arange(len(leaving)) - np.searchsorted(leaving, leaving, side="left")
+            pool = np.delete(pool, first + rank)
+            pool = np.insert(pool, np.searchsorted(pool, entering), entering)
+
+        index = pd.RangeIndex(1, N_DAYS + 1)
+
+        return {stat: pd.Series(results[:, i], index=index) for i, stat in enumerate(stats)}
+
+    def to_series(
+        self
+    ):
+        """
+        Maps the cube back to dates.
+
+        Returns:
+            pd.Series: values of the cube on the dates of the source Series, in chronological order.
+        """
+        rows, cols = np.nonzero(self.mask)
+        years = self.first_year + rows // self.steps_per_day
+        seconds = (rows % self.steps_per_day) * 86400 // self.steps_per_day
+
+        # Columns after Feb 29 are one day ahead of the day of year in non-leap years
+        is_leap = (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+        day_offsets = cols - ((cols > FEB_29) & ~is_leap)
+
+        year_starts = (years - 1970).astype("datetime64[Y]").astype("datetime64[D]")
+        dates = (
+            year_starts
+            + day_offsets.astype("timedelta64[D]")
+            + seconds.astype("timedelta64[s]")
+        )
+        order = np.argsort(dates, kind="stable")
+
+        return pd.Series(
+            self.values[rows, cols][order],
+            index=pd.DatetimeIndex(dates[order])
+        )
+
+
+def _stat_quantile(
+    stat: str
+):
+    """
+    Returns the quantile level of a statistic name ("Q10" -> 0.10, "Median" -> 0.50),
+    or None for the non-quantile statistics.
+    """
+    if stat == "Median":
+        return 0.50
+    if stat.startswith("Q"):
+        return float(stat[1:]) / 100
+    if stat in ("Mean", "Min", "Max", "Count"):
+        return None
+    raise ValueError(f"Unknown statistic: {stat}")
+
+
+def _sorted_statistics(
+    sorted_values: np.ndarray,
+    stats: list
+):
+    """
+    Reads statistics from a sorted 1-D array of valid values (quantiles with linear
+    interpolation, as pandas).
+    """
+    last = len(sorted_values) - 1
+    res = []
+    for stat in stats:
+        qval = _stat_quantile(stat)
+        if qval is not None:
+            h = last * qval
+            lo = int(np.floor(h))
+            hi = min(lo + 1, last)
+            res.append(sorted_values[lo] + (h - lo) * (sorted_values[hi] - sorted_values[lo]))
+        elif stat == "Min":
+            res.append(sorted_values[0])
+        elif stat == "Max":
+            res.append(sorted_values[last])
+        elif stat == "Mean":
+            res.append(sorted_values.mean())
+        else:
+            res.append(len(sorted_values))
+
+    return res
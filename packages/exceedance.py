@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+
+from packages.calkeys import calendar_keys
+
+
+# Months of the meteorological seasons
+SEASONS = {
+    "DJF": (12, 1, 2),
+    "MAM": (3, 4, 5),
+    "JJA": (6, 7, 8),
+    "SON": (9, 10, 11)
+}
+
+
+def season_label(
+    months
+):
+    """
+    Returns the name of a season ("DJF", ...), or str(months) for other month lists.
+    """
+    for label, season_months in SEASONS.items():
+        if set(months) == set(season_months):
+            return label
+
+    return str(list(months))
+
+
+def period_label(
+    sr: pd.Series
+):
+    """
+    Returns the period covered by a series, e.g. "1990-2019".
+    """
+    years = calendar_keys(sr.index).year
+
+    return f"{years.min()}-{years.max()}"
+
+
+class ExceedanceEngine:
+    """
+    Counts of the values above or below thresholds, for several periods and seasons. Each
+    (period, season) subset is sorted once, then every threshold is answered with a binary
+    search (np.searchsorted), so sweeping many thresholds costs O(log n) each instead of a
+    pass over the data.
+
+    The series are identified by their position in list_sr, so that two series over the
+    same years (e.g. TX and a shifted TX) keep separate counts.
+
+    Attributes:
+        seasons (dict): months of each season, keyed by label.
+        periods (list): period label of each series (first and last years).
+        subsets (dict): per (series position, season), the sorted values and their time order
+            (positions in the dates of the subset) and the dates of the subset.
+    """
+
+    def __init__(
+        self,
+        list_sr: list,
+        seasons: dict = None
+    ):
+        """
+        Args:
+            list_sr (list): pd.Series, one per period (labeled by their first and last years).
+            seasons (dict, optional): months keyed by season label, or a list of month lists
+                labeled with season_label. Defaults to SEASONS.
+        """
+        if seasons is None:
+            seasons = SEASONS
+        elif not isinstance(seasons, dict):
+            seasons = {season_label(months): tuple(months) for months in seasons}
+        self.seasons = seasons
+
+        self.periods = [period_label(sr) for sr in list_sr]
+        self.subsets = {}
+        for position, sr in enumerate(list_sr):
+            months = calendar_keys(sr.index).month
+            for season, season_months in seasons.items():
+                sr_season = sr[np.isin(months, season_months)].dropna()
+                values = sr_season.to_numpy(dtype=np.float64)
+                order = np.argsort(values, kind="stable")
+                self.subsets[(position, season)] = (values[order], order, sr_season.index)
+
+    def counts(
+        self,
+        thresholds,
+        signs = (">", "<")
+    ):
+        """
+        Counts the values strictly above (">") or below ("<") each threshold.
+
+        Args:
+            thresholds (float or list): thresholds to evaluate.
+            signs (tuple, optional): signs studied. Defaults to (">", "<").
+
+        Returns:
+            pd.DataFrame: tidy counts, columns series (position in list_sr), period, season,
+                sign, threshold and count.
+        """
+        thresholds = np.atleast_1d(np.asarray(thresholds, dtype=np.float64))
+
+        frames = []
+        for (position, season), (sorted_values, _, _) in self.subsets.items():
+            for sign in signs:
+                frames.append(pd.DataFrame({
+                    "series": position,
+                    "period": self.periods[position],
+                    "season": season,
+                    "sign": sign,
+                    "threshold": thresholds,
+                    "count": _count(sorted_values, thresholds, sign)
+                }))
+
+        return pd.concat(frames, ignore_index=True)
+
+    def dates(
+        self,
+        position: int,
+        season: str,
+        threshold: float,
+        sign: str
+    ):
+        """
+        Returns the dates of the values above or below a threshold, computed on demand.
+
+        Args:
+            position (int): position of the series in list_sr.
+            season (str): season label, e.g. "JJA".
+            threshold (float): threshold evaluated.
+            sign (str): ">" or "<".
+
+        Returns:
+            pd.DatetimeIndex: dates in time order.
+        """
+        sorted_values, order, index = self.subsets[(position, season)]
+        if sign == ">":
+            positions = order[np.searchsorted(sorted_values, threshold, side="right"):]
+        elif sign == "<":
+            positions = order[:np.searchsorted(sorted_values, threshold, side="left")]
+        else:
+            raise ValueError("Study sign must be either '>' or '<'")
+
+        return index[np.sort(positions)]
+
+
+def _count(
+    sorted_values: np.ndarray,
+    thresholds: np.ndarray,
+    sign: str
+):
+    # Number of values strictly above / below each threshold
+    if sign == ">":
+        return len(sorted_values) - np.searchsorted(sorted_values, thresholds, side="right")
+    if sign == "<":
+        return np.searchsorted(sorted_values, thresholds, side="left")
+
+    raise ValueError("Study sign must be either '>' or '<'")
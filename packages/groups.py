@@ -0,0 +1,204 @@
+import numpy as np
+import pandas as pd
+
+from packages.calkeys import calendar_keys
+from packages.exceedance import SEASONS
+
+
+def month_codes(
+    index: pd.DatetimeIndex,
+    months = range(1, 13)
+):
+    """
+    Returns integer group codes of the dates: the position of their month in months, -1 for
+    the other months (one lookup, no rescan per month).
+
+    Args:
+        index (pd.DatetimeIndex): dates of the values.
+        months (list, optional): months kept, in the order of the groups. Defaults to all.
+
+    Returns:
+        np.ndarray: int8 codes.
+    """
+    lookup = np.full(13, -1, dtype=np.int8)
+    lookup[list(months)] = np.arange(len(months))
+
+    return lookup[calendar_keys(index).month]
+
+
+def season_codes(
+    index: pd.DatetimeIndex
+):
+    """
+    Returns the season codes of the dates, in the order of SEASONS (0 = DJF ... 3 = SON).
+    """
+    return calendar_keys(index).season
+
+
+class Groups:
+    """
+    Values grouped by integer codes with a single sort. Each group is a contiguous, sorted
+    slice of one array, so the groups are views (no copy per group) and their box statistics
+    are computed for all the groups at once.
+
+    Attributes:
+        labels (list): label of each group.
+        values (np.ndarray): values sorted by group, then by value (NaN dropped).
+        offsets (np.ndarray): start of each group in values, with the total size at the end.
+    """
+
+    def __init__(
+        self,
+        values,
+        codes,
+        labels: list
+    ):
+        """
+        Args:
+            values (array-like): values to group.
+            codes (array-like): group code of each value (position in labels), -1 to drop it.
+            labels (list): label of each group.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        codes = np.asarray(codes)
+
+        keep = (codes >= 0) & ~np.isnan(values)
+        values, codes = values[keep], codes[keep]
+        order = np.lexsort((values, codes))
+
+        self.labels = list(labels)
+        self.values = values[order]
+        self._codes = codes[order].astype(np.int64)
+        counts = np.bincount(self._codes, minlength=len(self.labels))
+        self.offsets = np.concatenate(([0], np.cumsum(counts)))
+
+    @classmethod
+    def by_month(
+        cls,
+        sr: pd.Series,
+        months = range(1, 13)
+    ):
+        """
+        Groups a series by month (only the months given, in their order).
+        """
+        return cls(sr.to_numpy(), month_codes(sr.index, months), list(months))
+
+    @classmethod
+    def by_season(
+        cls,
+        sr: pd.Series
+    ):
+        """
+        Groups a series by meteorological season.
+        """
+        return cls(sr.to_numpy(), season_codes(sr.index), list(SEASONS))
+
+    def __len__(
+        self
+    ):
+        return len(self.labels)
+
+    def group(
+        self,
+        position: int
+    ):
+        """
+        Returns the sorted values of a group (view).
+        """
+        return self.values[self.offsets[position]:self.offsets[position + 1]]
+
+    def groups(
+        self
+    ):
+        """
+        Returns the sorted values of every group (views).
+        """
+        return [self.group(position) for position in range(len(self))]
+
+    def sums(
+        self
+    ):
+        """
+        Returns the sum of each group.
+        """
+        return np.bincount(self._codes, weights=self.values, minlength=len(self))
+
+    def quantiles(
+        self,
+        qs
+    ):
+        """
+        Returns quantiles of every group (linear interpolation, as np.percentile).
+
+        Args:
+            qs (float or list): quantiles, between 0 and 1.
+
+        Returns:
+            np.ndarray: (n_groups, len(qs)) quantiles, NaN for empty groups.
+        """
+        qs = np.atleast_1d(qs)
+        starts = self.offsets[:-1, None]
+        sizes = np.diff(self.offsets)[:, None]
+
+        pos = starts + qs[None, :] * np.maximum(sizes - 1, 0)
+        low = np.floor(pos).astype(np.int64)
+        high = np.minimum(low + 1, starts + np.maximum(sizes - 1, 0))
+        frac = pos - low
+
+        # Empty groups read a dummy value, then NaN
+        padded = np.append(self.values, np.nan)
+        low = np.where(sizes > 0, low, len(self.values))
+        high = np.where(sizes > 0, high, len(self.values))
+
+        return padded[low] * (1 - frac) + padded[high] * frac
+
+    def box_stats(
+        self,
+        whis: float = 1.5
+    ):
+        """
+        Computes the box plot statistics of every group at once, for Axes.bxp (same
+        definitions as matplotlib.cbook.boxplot_stats).
+
+        Args:
+            whis (float, optional): whiskers reach the furthest values within whis times the
+                interquartile range of the box. Defaults to 1.5.
+
+        Returns:
+            list: one dict per group (med, q1, q3, whislo, whishi, mean, fliers, label).
+        """
+        q1, med, q3 = self.quantiles([0.25, 0.5, 0.75]).T
+        iqr = q3 - q1
+        sizes = np.diff(self.offsets)
+        means = self.sums() / np.maximum(sizes, 1)
+
+        # Values within the whiskers range of their group
+        lo = (q1 - whis * iqr)[self._codes]
+        hi = (q3 + whis * iqr)[self._codes]
+        inside = (self.values >= lo) & (self.values <= hi)
+
+        whislo = np.full(len(self), np.inf)
+        whishi = np.full(len(self), -np.inf)
+        np.minimum.at(whislo, self._codes[inside], self.values[inside])
+        np.maximum.at(whishi, self._codes[inside], self.values[inside])
+        whislo = np.where(np.isfinite(whislo) & (whislo <= q1), whislo, q1)
+        whishi = np.where(np.isfinite(whishi) & (whishi >= q3), whishi, q3)
+
+        fliers = np.split(self.values[~inside], np.cumsum(np.bincount(
+            self._codes[~inside],
+            minlength=len(self)
+        ))[:-1])
+
+        return [
+            {
+                "label": label,
+                "med": med[i],
+                "q1": q1[i],
+                "q3": q3[i],
+                "whislo": whislo[i],
+                "whishi": whishi[i],
+                "mean": means[i] if sizes[i] else np.nan,
+                "fliers": fliers[i]
+            }
+            for i, label in enumerate(self.labels)
+        ]
@@ -0,0 +1,223 @@
+import functools
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from packages.accumulators import ClimAccumulator
+from packages.cube import DoyCube
+
+
+def _hash_arrays(
+    *arrays
+):
+    hasher = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        array = np.asarray(array)
+        if array.dtype == object:
+            array = pd.util.hash_array(array)
+        array = np.ascontiguousarray(array)
+        hasher.update(str((array.dtype, array.shape)).encode("utf-8"))
+        hasher.update(array.view(np.uint8).ravel())
+
+    return hasher.hexdigest()
+
+
+def fingerprint(
+    obj
+):
+    """
+    Returns a cheap hashable fingerprint of an argument: index bounds, length and hash of the
+    dates and values for Series, hash of the whole state (arrays and settings) for cubes and
+    accumulators, the value itself otherwise.
+
+    Args:
+        obj: argument of a memoized function.
+
+    Returns:
+        Hashable fingerprint of obj.
+    """
+    if isinstance(obj, pd.Series):
+        index = obj.index
+        bounds = (index[0], index[-1]) if len(index) else (None, None)
+        return ("Series", bounds, len(obj), _hash_arrays(index.values, obj.to_numpy()))
+
+    # Cubes and accumulators are fingerprinted on their arrays
+    if isinstance(obj, DoyCube):
+        return ("DoyCube", obj.first_year, obj.steps_per_day, _hash_arrays(obj.values, obj.mask))
+    if isinstance(obj, ClimAccumulator):
+        sketch = obj.sketch
+        pending = obj._pending if obj._pending is not None else pd.Series(dtype="float64")
+        return (
+            "ClimAccumulator",
+            obj.daily,
+            obj.start,
+            obj.end,
+            sketch.resolution,
+            sketch.value_range,
+            sketch.offset,
+            _hash_arrays(
+                obj.sum,
+                obj.sum_sq,
+                obj.count,
+                obj.min,
+                obj.max,
+                sketch.counts,
+                pending.index.values,
+                pending.to_numpy(dtype="float64")
+            )
+        )
+
+    if isinstance(obj, (list, tuple)):
+        return tuple(fingerprint(item) for item in obj)
+    if isinstance(obj, dict):
+        return tuple(sorted((key, fingerprint(val)) for key, val in obj.items()))
+
+    return obj
+
+
+def _nbytes(
+    result
+):
+    # Approximate memory held by a cached result
+    if isinstance(result, pd.Series):
+        return int(result.memory_usage(index=True, deep=False))
+    if isinstance(result, pd.DataFrame):
+        return int(result.memory_usage(index=True, deep=False).sum())
+    if isinstance(result, dict):
+        return sum(_nbytes(val) for val in result.values())
+    if isinstance(result, (list, tuple)):
+        return sum(_nbytes(val) for val in result)
+
+    return 64
+
+
+def _copy(
+    result
+):
+    # Cached results are copied so that callers can modify what they get
+    if isinstance(result, (pd.Series, pd.DataFrame)):
+        return result.copy()
+    if isinstance(result, dict):
+        return {key: _copy(val) for key, val in result.items()}
+    if isinstance(result, tuple):
+        return tuple(_copy(val) for val in result)
+    if isinstance(result, list):
+        return [_copy(val) for val in result]
+
+    return result
+
+
+class ComputeCache:
+    """
+    In-process LRU cache of computed climatologies and quantile dictionaries, bounded by the
+    memory of the cached results.
+
+    Attributes:
+        max_bytes (int): memory above which the least recently used results are evicted.
+        hits (int): number of calls answered from the cache.
+        misses (int): number of calls computed.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 ** 2
+    ):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+
+    def get(
+        self,
+        key
+    ):
+        """
+        Returns a copy of the cached result of key, or None.
+        """
+        if key not in self._entries:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+
+        return _copy(self._entries[key][0])
+
+    def put(
+        self,
+        key,
+        result
+    ):
+        """
+        Caches a result, evicting the least recently used ones beyond max_bytes.
+        """
+        size = _nbytes(result)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+
+        self._entries[key] = (_copy(result), size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+
+    def clear(
+        self
+    ):
+        """
+        Empties the cache and resets the counters.
+        """
+        self._entries.clear()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def info(
+        self
+    ):
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: hits, misses, number of entries and cached bytes.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "bytes": self._bytes
+        }
+
+
+# Cache shared by the computing functions
+CACHE = ComputeCache()
+
+
+def memoize(
+    func
+):
+    """
+    Caches the results of a computing function in CACHE, keyed on the function name and the
+    fingerprints of its arguments.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = (
+            func.__module__,
+            func.__qualname__,
+            fingerprint(args),
+            fingerprint(kwargs)
+        )
+        result = CACHE.get(key)
+        if result is None:
+            result = func(*args, **kwargs)
+            CACHE.put(key, result)
+
+        return result
+
+    return wrapper
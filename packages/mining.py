@@ -1,59 +1,817 @@
-import calendar
+import hashlib
+import importlib.util
+import os
+import re
+import shutil
 
 import numpy as np
 import xarray as xr
 import pandas as pd
 
+from packages.accumulators import MAX_BINS, ClimAccumulator
+from packages.calkeys import calendar_keys
+from packages.cube import map_on_dates
+
+
+# Reanalysis variables stored in Kelvin when the file does not carry a "units" attribute
+KELVIN_VARIABLES = ("2t", "t2m", "mx2t", "mn2t", "2d", "d2m")
+
+
+def _file_fingerprint(
+    path: str
+):
+    """
+    Computes a fingerprint of a source file from its path, size, modification time and content.
+
+    Args:
+        path (str): path to the source file.
+
+    Returns:
+        str: hexadecimal digest identifying this exact version of the file.
+    """
+    stat = os.stat(path)
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(os.path.abspath(path).encode("utf-8"))
+    hasher.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+    
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(block)
+    
+    return hasher.hexdigest()
+
+
+def _cache_store(
+    path: str,
+    cache_dir: str = None
+):
+    """
+    Returns the cache folder holding the parsed columns of a source file. The folders of
+    previous versions of the file are removed when its current version has no folder yet.
+
+    Args:
+        path (str): path to the source file.
+        cache_dir (str, optional): root folder of the cache. Defaults to a ".cache"
+            folder next to the source file.
+
+    Returns:
+        str: folder dedicated to the current version of the source file.
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), ".cache")
+    name = os.path.splitext(os.path.basename(path))[0]
+    store = os.path.join(cache_dir, f"{name}_{_file_fingerprint(path)}")
+    
+    if not os.path.isdir(store):
+        _prune_stores(cache_dir, name)
+    
+    return store
+
+
+def _prune_stores(
+    cache_dir: str,
+    name: str
+):
+    # Removes the stores of previous versions of a file: same name followed by a fingerprint
+    if not os.path.isdir(cache_dir):
+        return
+    
+    pattern = re.compile(rf"{re.escape(name)}_[0-9a-f]{{32}}")
+    for entry in os.listdir(cache_dir):
+        if pattern.fullmatch(entry):
+            shutil.rmtree(os.path.join(cache_dir, entry), ignore_errors=True)
+
+
+def _save_npy(
+    file: str,
+    values: np.ndarray
+):
+    # Writing to a temporary file first so that an interrupted run never leaves a truncated column
+    tmp_file = f"{file}.tmp"
+    with open(tmp_file, "wb") as f:
+        np.save(f, values, allow_pickle=False)
+    os.replace(tmp_file, file)
+
+
+def _read_cache(
+    store: str,
+    var_name: str
+):
+    """
+    Reloads a parsed variable from the cache.
+
+    Args:
+        store (str): cache folder of the source file.
+        var_name (str): name of the variable/column to reload.
+
+    Returns:
+        pd.Series: cached Series, or None if the variable has not been cached yet.
+    """
+    date_file = os.path.join(store, "DATE.npy")
+    var_file = os.path.join(store, f"{var_name}.npy")
+    if not (os.path.exists(date_file) and os.path.exists(var_file)):
+        return None
+    
+    index = pd.DatetimeIndex(np.load(date_file), name="DATE")
+    
+    return pd.Series(np.load(var_file), index=index, name=var_name)
+
+
+def _write_cache(
+    store: str,
+    sr: pd.Series
+):
+    """
+    Stores a parsed variable in the cache as binary columns (one .npy file per column).
+
+    Args:
+        store (str): cache folder of the source file.
+        sr (pd.Series): parsed Series indexed by DATE.
+    """
+    os.makedirs(store, exist_ok=True)
+    
+    date_file = os.path.join(store, "DATE.npy")
+    if not os.path.exists(date_file):
+        _save_npy(date_file, sr.index.values)
+    _save_npy(os.path.join(store, f"{sr.name}.npy"), sr.to_numpy(dtype="float64"))
+
+
+def open_variables(
+    path: str,
+    var_names: list,
+    as_dict: bool = False,
+    cache: bool = True,
+    cache_dir: str = None,
+    station=None
+):
+    """
+    Opens several variables from a Météo-France CSV file in a single pass.
+    
+    Only the DATE and requested columns are read, with float64 dtypes and native comma-decimal
+    parsing. Variables already in the parsed-data cache are reloaded from it, the others are
+    parsed together and added to the cache.
+
+    Args:
+        path (str): path to the CSV file.
+        var_names (list): names of the variables/columns to extract (e.g. ["T", "TX", "U"]).
+        as_dict (bool, optional): returns a dictionary of Series instead of a DataFrame.
+            Defaults to False.
+        cache (bool, optional): reads and writes the parsed-data cache. Defaults to True.
+        cache_dir (str, optional): root folder of the cache. Defaults to a ".cache" folder
+            next to the CSV file.
+        station (optional): POSTE identifier to keep when the file holds several stations.
+            Defaults to None (all rows).
+
+    Returns:
+        pd.DataFrame or dict: one column (or Series) per variable, sharing the same DatetimeIndex.
+    """
+    var_names = list(var_names)
+    columns = {}
+    
+    if cache:
+        store = _cache_store(path, cache_dir)
+        if station is not None:
+            store = os.path.join(store, str(station))
+        for var_name in var_names:
+            sr = _read_cache(store, var_name)
+            if sr is not None:
+                columns[var_name] = sr
+    
+    missing = [var_name for var_name in var_names if var_name not in columns]
+    if missing:
+        df = _read_csv_columns(path, missing, station is not None)
+        if station is not None:
+            df = df[df["POSTE"] == str(station)]
+        index = pd.DatetimeIndex(pd.to_datetime(df["DATE"], format="%Y%m%d%H"), name="DATE")
+        
+        for var_name in missing:
+            sr = pd.Series(df[var_name].to_numpy(), index=index, name=var_name)
+            if cache:
+                _write_cache(store, sr)
+            columns[var_name] = sr
+    
+    # Every column comes from the same file: sharing one index avoids any realignment
+    index = columns[var_names[0]].index
+    if as_dict:
+        return {
+            var_name: pd.Series(columns[var_name].to_numpy(), index=index, name=var_name)
+            for var_name in var_names
+        }
+    
+    return pd.DataFrame(
+        {var_name: columns[var_name].to_numpy() for var_name in var_names},
+        index=index
+    )
+
+
+def _read_csv_columns(
+    path: str,
+    var_names: list,
+    with_station: bool = False
+):
+    # Single read of the requested columns with native comma-decimal parsing
+    usecols = ["DATE"] + list(var_names)
+    if with_station:
+        usecols = ["POSTE"] + usecols
+    
+    return pd.read_csv(
+        path,
+        sep=";",
+        encoding="utf-8",
+        usecols=usecols,
+        dtype={"POSTE": str, "DATE": str, **{var_name: "float64" for var_name in var_names}},
+        decimal=","
+    )
+
+
+def partition_stations(
+    path: str,
+    var_names: list,
+    cache_dir: str = None
+):
+    """
+    Splits a multi-station Météo-France CSV file into one store per station (POSTE column).
+    
+    The file is parsed once, rows are grouped by station with a single stable sort and each
+    station is written to the parsed-data cache. open_variables/open_data called with the same
+    station then reload it without parsing the CSV, and open_station reads a store directly.
+
+    Args:
+        path (str): path to the CSV file (e.g. the whole Pyrénées-Orientales export).
+        var_names (list): names of the variables/columns to store.
+        cache_dir (str, optional): root folder of the cache. Defaults to a ".cache" folder
+            next to the CSV file.
+
+    Returns:
+        dict: store folder of each station, keyed by POSTE identifier.
+    """
+    var_names = list(var_names)
+    store = _cache_store(path, cache_dir)
+    
+    df = _read_csv_columns(path, var_names, with_station=True)
+    index = pd.DatetimeIndex(pd.to_datetime(df["DATE"], format="%Y%m%d%H"), name="DATE")
+    
+    # Grouping the rows by station once (stable sort keeps each station chronological)
+    codes, stations = pd.factorize(df["POSTE"])
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(stations) + 1))
+    
+    stores = {}
+    for i, station in enumerate(stations):
+        rows = order[bounds[i]:bounds[i + 1]]
+        station_store = os.path.join(store, str(station))
+        for var_name in var_names:
+            sr = pd.Series(df[var_name].to_numpy()[rows], index=index[rows], name=var_name)
+            _write_cache(station_store, sr)
+        stores[station] = station_store
+    
+    return stores
+
+
+def open_station(
+    store: str,
+    var_name: str
+):
+    """
+    Reloads a variable from a station store written by partition_stations.
+
+    Args:
+        store (str): store folder of the station.
+        var_name (str): name of the variable/column to reload.
+
+    Returns:
+        pd.Series: Series containing the data for the specified variable.
+    """
+    sr = _read_cache(store, var_name)
+    if sr is None:
+        raise ValueError(f"{var_name} is not stored in {store}")
+    
+    return sr
+
+
+def _open_netcdf(
+    path: str,
+    var_name: str,
+    start: str = None,
+    end: str = None,
+    chunk_size: int = 8760
+):
+    """
+    Lazily opens a reanalysis variable from a NetCDF file and returns its spatial mean as a Series.
+    
+    The time-range selection is applied before any value is read, and the average over the
+    remaining grid points (e.g. the four points around Perpignan) is computed inside xarray.
+    When dask is installed, the selection is processed by chunks along the time axis.
+    Temperatures stored in Kelvin are converted to °C in place, other variables keep their units.
+
+    Args:
+        path (str): path to the NetCDF file.
+        var_name (str): name of the variable to extract (e.g. "2t", "ssrdc").
+        start (str, optional): first date of the selection (inclusive). Defaults to None.
+        end (str, optional): last date of the selection (inclusive). Defaults to None.
+        chunk_size (int, optional): number of time steps per dask chunk, ignored without dask.
+            Defaults to 8760 (one year of hourly data).
+
+    Returns:
+        pd.Series: Series containing the data for the specified variable.
+    """
+    ds = xr.open_dataset(path)
+    da = ds[var_name]
+    
+    # Recent ERA5 files name the time coordinate "valid_time"
+    time_name = next((name for name in ("time", "valid_time") if name in da.coords), None)
+    if time_name is None:
+        raise ValueError(f"No time coordinate found for {var_name} in {path}")
+    
+    # Time-range pushdown: nothing has been read from the file yet
+    if start is not None or end is not None:
+        da = da.sel({time_name: slice(start, end)})
+    
+    if chunk_size is not None and importlib.util.find_spec("dask") is not None:
+        da = da.chunk({time_name: chunk_size})
+    
+    # Dropping singleton dimensions, then averaging over the remaining grid points
+    da = da.squeeze([dim for dim in da.dims if dim != time_name and da.sizes[dim] == 1], drop=True)
+    spatial_dims = [dim for dim in da.dims if dim != time_name]
+    if spatial_dims:
+        da = da.astype("float64").mean(dim=spatial_dims)
+    
+    # Only the selected range is materialized, the conversions below work in place
+    values = np.asarray(da.values, dtype="float64")
+    if not values.flags.writeable:
+        values = values.copy()
+    
+    units = ds[var_name].attrs.get("units")
+    if units == "K" or (units is None and var_name in KELVIN_VARIABLES):
+        values -= 273.15
+    np.round(values, 2, out=values)
+    
+    sr = pd.Series(
+        data=values,
+        index=pd.to_datetime(da[time_name].values),
+        name=var_name
+        )
+    ds.close()
+    
+    return sr
+
 
 def open_data(
     path : str,
-    var_name : str
+    var_name : str,
+    cache : bool = True,
+    cache_dir : str = None,
+    start : str = None,
+    end : str = None,
+    station = None,
+    verbose : bool = False
     ):
     """
-    Opens the data from a CSV file and returns a pandas Series for the specified variable.
+    Opens the data from a CSV or NetCDF file and returns a pandas Series for the specified variable.
+    
+    The parsed CSV columns are cached as binary .npy files, keyed on the path, size, modification
+    time and content of the source file, so that the following calls skip the CSV parsing.
+    To load several variables of the same CSV file, prefer open_variables.
+    NetCDF files are opened lazily and only the selected time range is read.
     
     Args:
-        path (str): paths to the CSV file.
+        path (str): paths to the CSV or NetCDF file.
         var_name (str): name of the variable/column to extract.
+        cache (bool, optional): reads and writes the parsed-data cache of CSV files. Defaults to True.
+        cache_dir (str, optional): root folder of the cache. Defaults to a ".cache" folder
+            next to the CSV file.
+        start (str, optional): first date to keep (inclusive). Defaults to None.
+        end (str, optional): last date to keep (inclusive). Defaults to None.
+        station (optional): POSTE identifier to keep when the CSV file holds several stations.
+            Defaults to None.
+        verbose (bool, optional): prints the completeness report of the data (cf.
+            completeness_report). Defaults to False.
 
     Returns:
         pd.Series: Series containing the data for the specified variable.
     """
     if path.endswith(".csv"): 
-        df = pd.read_csv(path, sep=';', encoding='utf-8')
-        df["DATE"] = pd.to_datetime(df["DATE"], format="%Y%m%d%H")
-        df = df.set_index("DATE")
-        if "Poste" in df.columns:
-            df = df.drop("POSTE", axis=1)
+        sr = open_variables(
+            path,
+            [var_name],
+            as_dict=True,
+            cache=cache,
+            cache_dir=cache_dir,
+            station=station
+        )[var_name]
+        if start is not None or end is not None:
+            sr = sr.loc[start:end]
         
-        sr = df[var_name].astype(str).str.replace(",", ".", regex=False).astype(float)
-        dates_nan = sr[sr.isna()].index
-        print(dates_nan)
+        if verbose:
+            completeness_report(sr, verbose=True)
         return sr
     
     elif path.endswith("nc"):
-        ds = xr.open_dataset(path)
-        da = ds[var_name].squeeze()
-        if "time" in da.coords:
-            sr = pd.Series(
-                data=da.values,
-                index=pd.to_datetime(da["time"].values),
-                name=var_name
-                )
-            
-            sr = (sr.astype('float64') - 273.15).round(2)
-            
-            dates_nan = sr[sr.isna()].index
-            nan_by_year = sr.isna().groupby(sr.index.year).sum()
-            nan_by_year = nan_by_year[nan_by_year != 0]
-            print(nan_by_year)
-            print(dates_nan)
-
+        sr = _open_netcdf(path, var_name, start, end)
+        
+        if verbose:
+            completeness_report(sr, verbose=True)
         return sr
             
     raise ValueError("Unsupported file format. Use .csv or .nc.")      
 
 
+def completeness_report(
+    sr : pd.Series,
+    freq : str = None,
+    start : str = None,
+    end : str = None,
+    n_gaps : int = 10,
+    verbose : bool = False
+):
+    """
+    Audits the completeness of a series in one pass: missing values (NaN or absent
+    timestamps) are placed on the expected time grid, the gaps are found by run-length
+    encoding, and the completeness is aggregated per day, month and year with bincounts.
+
+    Args:
+        sr (pd.Series): series with a DatetimeIndex (e.g. from open_data).
+        freq (str, optional): expected time step, e.g. "h" or "D". Defaults to the most
+            frequent step of the index. Without freq, a series with less than two distinct
+            dates only gets a trivial report (no expected grid, "freq" None).
+        start (str, optional): first expected timestamp. Defaults to the first one of sr.
+        end (str, optional): last expected timestamp. Defaults to the last one of sr.
+        n_gaps (int, optional): number of longest gaps reported. Defaults to 10.
+        verbose (bool, optional): prints a summary. Defaults to False.
+
+    Returns:
+        dict: "freq", "n_expected", "n_missing", "completeness" (%), "by_day", "by_month" and
+            "by_year" (completeness in %, pd.Series) and "gaps" (pd.DataFrame of the longest
+            gaps: start, end, length in time steps and duration).
+    """
+    index = sr.index
+    if freq is None:
+        steps = np.diff(index.asi8)
+        values, counts = np.unique(steps[steps > 0], return_counts=True)
+        if len(values) == 0:
+            return _trivial_report(sr, verbose)
+        step = pd.Timedelta(int(values[np.argmax(counts)]), unit=index.unit)
+    else:
+        step = pd.Timedelta(pd.tseries.frequencies.to_offset(freq))
+        if len(index) == 0 and (start is None or end is None):
+            return _trivial_report(sr, verbose)
+    
+    first = index[0] if start is None else pd.Timestamp(start)
+    last = index[-1] if end is None else pd.Timestamp(end)
+    grid = pd.date_range(first, last, freq=step)
+    if len(grid) == 0:
+        raise ValueError("The expected period is empty: check start and end")
+    
+    # Present values on the expected grid (timestamps off the grid are ignored)
+    offsets = (index - first) // step
+    on_grid = ((index - first) % step == pd.Timedelta(0)) & (offsets >= 0) & (offsets < len(grid))
+    present = np.zeros(len(grid), dtype=bool)
+    present[np.asarray(offsets[on_grid])] = ~np.isnan(sr.to_numpy(dtype=np.float64)[on_grid])
+    
+    # Gaps: runs of missing steps
+    edges = np.diff(np.concatenate(([0], (~present).astype(np.int8), [0])))
+    gap_starts = np.flatnonzero(edges == 1)
+    gap_ends = np.flatnonzero(edges == -1)
+    lengths = gap_ends - gap_starts
+    longest = np.argsort(-lengths, kind="stable")[:n_gaps]
+    df_gaps = pd.DataFrame({
+        "start": grid[gap_starts[longest]],
+        "end": grid[gap_ends[longest] - 1],
+        "length": lengths[longest],
+        "duration": lengths[longest] * step
+    })
+    
+    # Completeness per day, month and year
+    keys = calendar_keys(grid)
+    days = (grid.normalize() - grid[0].normalize()).days.to_numpy()
+    months = (keys.year.astype(np.int64) - keys.year[0]) * 12 + keys.month - 1
+    years = keys.year.astype(np.int64) - keys.year[0]
+    
+    def _percent(codes, labels):
+        expected = np.bincount(codes)
+        found = np.bincount(codes, weights=present, minlength=len(expected))
+        keep = expected > 0
+        return pd.Series(100 * found[keep] / expected[keep], index=labels[keep])
+    
+    first_day = grid[0].normalize()
+    by_day = _percent(days, pd.date_range(first_day, periods=days[-1] + 1, freq="D"))
+    first_month = pd.Period(grid[0], freq="M")
+    by_month = _percent(months, pd.period_range(first_month, periods=months[-1] + 1, freq="M"))
+    by_year = _percent(years, pd.Index(np.arange(keys.year[0], keys.year[0] + years[-1] + 1)))
+    
+    n_missing = int(len(grid) - present.sum())
+    report = {
+        "freq": step,
+        "n_expected": len(grid),
+        "n_missing": n_missing,
+        "completeness": 100 * (1 - n_missing / len(grid)),
+        "by_day": by_day,
+        "by_month": by_month,
+        "by_year": by_year,
+        "gaps": df_gaps
+    }
+    
+    if verbose:
+        _print_report(report)
+    
+    return report
+
+
+def _trivial_report(
+    sr: pd.Series,
+    verbose: bool
+):
+    # Completeness of a series whose time step cannot be inferred (less than two distinct
+    # dates): only its missing values are counted
+    present = sr.notna()
+    n_missing = int((~present).sum())
+    index = sr.index
+    
+    def _percent(keys):
+        return 100 * present.groupby(keys).mean()
+    
+    report = {
+        "freq": None,
+        "n_expected": len(sr),
+        "n_missing": n_missing,
+        "completeness": 100 * (1 - n_missing / len(sr)) if len(sr) else np.nan,
+        "by_day": _percent(index.normalize()),
+        "by_month": _percent(index.to_period("M")),
+        "by_year": _percent(index.year),
+        "gaps": pd.DataFrame(columns=["start", "end", "length", "duration"])
+    }
+    
+    if verbose:
+        _print_report(report)
+    
+    return report
+
+
+def _print_report(
+    report: dict
+):
+    # Summary printed by completeness_report(verbose=True)
+    by_year = report["by_year"]
+    print(
+        f"Completeness: {report['completeness']:.2f}% ({report['n_missing']} missing of "
+        f"{report['n_expected']}, step {report['freq']})"
+    )
+    print(by_year[by_year < 100].round(2))
+    print(report["gaps"])
+
+
+def _merge_daily(
+    df_daily: pd.DataFrame
+):
+    # Folding rows of the same day (partial days carried across chunk boundaries)
+    return df_daily.groupby(level=0).agg(
+        {"sum": "sum", "count": "sum", "min": "min", "max": "max"}
+    )
+
+
+def _finalize_daily(
+    df_daily: pd.DataFrame
+):
+    df_daily = df_daily.copy()
+    df_daily.insert(0, "mean", df_daily["sum"] / df_daily["count"].where(df_daily["count"] > 0))
+    
+    return df_daily[["mean", "min", "max", "sum", "count"]]
+
+
+def _apply_coverage(
+    df_daily: pd.DataFrame,
+    min_hours: int = None,
+    min_days: int = None
+):
+    # Masks the days with less than min_hours valid values, then the months with less
+    # than min_days valid days (count is kept, to show the coverage)
+    stats = ["mean", "min", "max", "sum"]
+    valid = df_daily["count"].to_numpy() >= max(min_hours or 1, 1)
+    
+    if min_days is not None and len(df_daily):
+        keys = calendar_keys(df_daily.index)
+        months = (keys.year.astype(np.int64) - keys.year[0]) * 12 + keys.month - 1
+        valid_days = np.bincount(months, weights=valid)
+        valid &= valid_days[months] >= min_days
+    
+    if min_hours is not None or min_days is not None:
+        df_daily = df_daily.copy()
+        df_daily.loc[~valid, stats] = np.nan
+    
+    return df_daily
+
+
+def resample_daily(
+    sr: pd.Series,
+    min_hours: int = None,
+    min_days: int = None,
+    steps_per_day: int = 24
+):
+    """
+    Computes the daily mean, min, max, sum and number of valid values of a sub-daily series in
+    one pass: the values are placed on a regular (days, steps_per_day) array, reduced along
+    the hours, and the days and months without enough data are masked.
+
+    Without coverage rules, the columns are the same as resample("D").mean()/min()/max()/sum()
+    (cf. open_daily for the streaming equivalent on CSV files). Series that do not fit the
+    layout (duplicated, unsorted or off-grid dates) are aggregated with resample instead.
+
+    Args:
+        sr (pd.Series): hourly series (e.g. from open_data).
+        min_hours (int, optional): minimum number of valid values for a day to be kept.
+            Defaults to None (any).
+        min_days (int, optional): minimum number of kept days for a month to be kept.
+            Defaults to None (any).
+        steps_per_day (int, optional): number of time steps per day. Defaults to 24.
+
+    Returns:
+        pd.DataFrame: daily "mean", "min", "max", "sum" and "count" columns on a continuous
+            daily DatetimeIndex (masked days have NaN statistics).
+    """
+    index = sr.index
+    step = pd.Timedelta(days=1) / steps_per_day
+    
+    # Each value needs its own slot of the layout, otherwise the values would overwrite
+    # each other: empty series and series off the layout go through resample
+    if len(index):
+        first_day = index[0].normalize()
+        offsets = index - first_day
+    if (
+        len(index) == 0
+        or not (index.is_monotonic_increasing and index.is_unique)
+        or (offsets % step != pd.Timedelta(0)).any()
+    ):
+        df_daily = sr.resample("D").agg(["sum", "count", "min", "max"])
+        return _apply_coverage(_finalize_daily(df_daily), min_hours, min_days)
+    
+    # Regular (days, steps_per_day) layout
+    n_days = (index[-1].normalize() - first_day).days + 1
+    slots = np.asarray(offsets // step)
+    values = np.full(n_days * steps_per_day, np.nan)
+    values[slots] = sr.to_numpy(dtype=np.float64)
+    values = values.reshape(n_days, steps_per_day)
+    
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=1)
+    total = np.where(valid, values, 0.0).sum(axis=1)
+    
+    df_daily = pd.DataFrame(
+        {
+            "sum": total,
+            "count": count,
+            "min": np.fmin.reduce(values, axis=1),
+            "max": np.fmax.reduce(values, axis=1)
+        },
+        index=pd.date_range(first_day, periods=n_days, freq="D", name=index.name)
+    )
+    
+    return _apply_coverage(_finalize_daily(df_daily), min_hours, min_days)
+
+
+def iter_daily(
+    path: str,
+    var_name: str,
+    chunksize: int = 100_000,
+    station=None
+):
+    """
+    Streams an hourly Météo-France CSV file and yields its daily aggregates chunk by chunk.
+    
+    Each chunk is folded into daily sums, counts, minimums and maximums. The last day of a chunk
+    may continue in the next one, so it is carried over and only yielded once complete: the memory
+    used stays bounded by the chunk size whatever the length of the file. The rows are expected
+    to be in chronological order (for a multi-station file, select one station).
+
+    Args:
+        path (str): path to the CSV file.
+        var_name (str): name of the variable/column to aggregate.
+        chunksize (int, optional): number of CSV rows read at once. Defaults to 100_000.
+        station (optional): POSTE identifier to keep when the file holds several stations.
+            Defaults to None (all rows).
+
+    Yields:
+        pd.DataFrame: completed days indexed by date with "mean", "min", "max", "sum" and "count"
+            (number of valid hours) columns.
+    """
+    usecols = ["DATE", var_name]
+    if station is not None:
+        usecols.append("POSTE")
+    
+    reader = pd.read_csv(
+        path,
+        sep=";",
+        encoding="utf-8",
+        usecols=usecols,
+        dtype={"DATE": str, "POSTE": str, var_name: "float64"},
+        decimal=",",
+        chunksize=chunksize
+    )
+    
+    pending = None
+    for chunk in reader:
+        if station is not None:
+            chunk = chunk[chunk["POSTE"] == str(station)]
+            if chunk.empty:
+                continue
+        
+        days = pd.DatetimeIndex(pd.to_datetime(chunk["DATE"].str[:8], format="%Y%m%d"), name="DATE")
+        sr_chunk = pd.Series(chunk[var_name].to_numpy(), index=days)
+        df_daily = sr_chunk.groupby(level=0).agg(["sum", "count", "min", "max"])
+        
+        if pending is not None:
+            df_daily = _merge_daily(pd.concat([pending, df_daily]))
+        
+        # The last day may still be incomplete
+        pending = df_daily.iloc[-1:]
+        if len(df_daily) > 1:
+            yield _finalize_daily(df_daily.iloc[:-1])
+    
+    if pending is not None:
+        yield _finalize_daily(pending)
+
+
+def open_daily(
+    path: str,
+    var_name: str,
+    chunksize: int = 100_000,
+    station=None,
+    min_hours: int = None,
+    min_days: int = None
+):
+    """
+    Computes the daily aggregates of an hourly CSV variable without loading the full hourly series.
+    It is the streaming equivalent of resample("D").mean()/min()/max()/sum() on open_data output.
+
+    Args:
+        path (str): path to the CSV file.
+        var_name (str): name of the variable/column to aggregate.
+        chunksize (int, optional): number of CSV rows read at once. Defaults to 100_000.
+        station (optional): POSTE identifier to keep when the file holds several stations.
+            Defaults to None.
+        min_hours (int, optional): minimum number of valid values for a day to be kept
+            (cf. resample_daily). Defaults to None.
+        min_days (int, optional): minimum number of kept days for a month to be kept.
+            Defaults to None.
+
+    Returns:
+        pd.DataFrame: daily "mean", "min", "max", "sum" and "count" columns on a continuous
+            daily DatetimeIndex (missing days have a count of 0).
+    """
+    df_daily = pd.concat(list(iter_daily(path, var_name, chunksize, station)))
+    df_daily = _merge_daily(df_daily[["sum", "count", "min", "max"]])
+    
+    # Same continuous calendar as resample("D")
+    df_daily = df_daily.asfreq("D")
+    df_daily[["sum", "count"]] = df_daily[["sum", "count"]].fillna(0)
+    df_daily["count"] = df_daily["count"].astype("int64")
+    
+    return _apply_coverage(_finalize_daily(df_daily), min_hours, min_days)
+
+
+def accumulate_daily(
+    path: str,
+    var_name: str,
+    how: str = "mean",
+    start: str = None,
+    end: str = None,
+    chunksize: int = 100_000,
+    station=None,
+    resolution: float = 0.1,
+    max_bins: int = MAX_BINS,
+    value_range: tuple = None
+):
+    """
+    Streams an hourly CSV file into a day-of-year accumulator of its daily aggregates, with one
+    quantile sketch per calendar day: the memory used does not depend on the length of the record.
+
+    Args:
+        path (str): path to the CSV file.
+        var_name (str): name of the variable/column to aggregate.
+        how (str, optional): daily aggregate accumulated ("mean", "min", "max" or "sum").
+            Defaults to "mean".
+        start (str, optional): first date kept (inclusive). Defaults to None.
+        end (str, optional): last date kept (inclusive). Defaults to None.
+        chunksize (int, optional): number of CSV rows read at once. Defaults to 100_000.
+        station (optional): POSTE identifier to keep when the file holds several stations.
+            Defaults to None.
+        resolution (float, optional): resolution (error bound) of the quantile sketches.
+            Defaults to 0.1.
+        max_bins (int, optional): bin budget of the quantile sketches: a record needing more
+            raises a ValueError instead of allocating. Defaults to MAX_BINS.
+        value_range (tuple, optional): (lo, hi) range the sketches clamp the values to.
+            Defaults to None (no clamping).
+
+    Returns:
+        ClimAccumulator: accumulator of the daily values (see ClimAccumulator.quantiles).
+    """
+    acc = ClimAccumulator(resolution=resolution, max_bins=max_bins, value_range=value_range)
+    
+    for df_daily in iter_daily(path, var_name, chunksize, station):
+        acc.update(df_daily[how].loc[start:end])
+    
+    return acc
+
+
 def reindex_clim_on_year(
     sr_current: pd.Series,
     sr_clim: pd.Series  
@@ -63,31 +821,13 @@ def reindex_clim_on_year(
 
     Args:
         sr_current (pd.Series): Pandas Series for the current year.
-        sr_clim (pd.Series): Pandas Series for the climatology.
+        sr_clim (pd.Series): Pandas Series for the climatology, indexed 1..366 in the month-day
+            layout of DoyCube (60 = Feb 29, skipped for non-leap years).
 
     Returns:
         pd.Series: Reindexed climatology Series aligned with the current year dates.
     """
-    # Getting the current year index
-    target_index = sr_current.index
-    year = target_index[0].year
-
-    clim = sr_clim.sort_index()
-    
-    # Adjust for leap years
-    if clim.index.max() == 366 and not calendar.isleap(year):
-        vals = clim.values.copy()
-        vals = np.delete(vals, 59)
-        clim_for_year = pd.Series(vals, index=np.arange(1, 366))
-    else:
-        clim_for_year = clim.copy()
-
-    # Mapping the climatology values to the current year dates
-    days = target_index.dayofyear
-    mapped_values = clim_for_year.loc[days].values
-    sr_clim_on_dates = pd.Series(data=mapped_values, index=target_index)
-    
-    return sr_clim_on_dates
+    return map_on_dates(sr_clim, sr_current.index)
 
 
 def compute_diff(
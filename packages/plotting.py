@@ -1,9 +1,468 @@
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import pandas as pd
+import matplotlib
 import matplotlib.pyplot as plt
 
+from matplotlib.figure import Figure
 from matplotlib.patches import Patch
 from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.ticker import MultipleLocator
+
+from packages.groups import Groups
+
+
+# Set in the rendering workers: figures are drawn off-screen, outside pyplot
+_OFFSCREEN = False
+
+
+class FigureSpec:
+    """
+    Deferred call to a plotting function of this module, returned by the computing
+    functions instead of drawing the figure right away.
+
+    Attributes:
+        func (callable): plotting function (module-level, so that the spec can be pickled).
+        args (tuple): positional arguments of the call.
+        kwargs (dict): keyword arguments of the call.
+    """
+
+    def __init__(
+        self,
+        func,
+        *args,
+        **kwargs
+    ):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    @property
+    def name(
+        self
+    ):
+        return self.func.__name__
+
+    def render(
+        self
+    ):
+        """
+        Draws (and saves) the figure.
+
+        Returns:
+            str: path of the saved image, None for figures which are only shown.
+        """
+        return self.func(*self.args, **self.kwargs)
+
+    def __repr__(
+        self
+    ):
+        return f"FigureSpec({self.name})"
+
+
+def render_figures(
+    figures: list
+):
+    """
+    Draws a list of deferred figures, in order.
+
+    Args:
+        figures (list): FigureSpec collected from the computing functions.
+
+    Returns:
+        list: paths of the saved images.
+    """
+    return [spec.render() for spec in figures]
+
+
+def _init_render_worker():
+    # Workers keep one session, so that the per-year plots they render share templates
+    global _OFFSCREEN
+    matplotlib.use("Agg", force=True)
+    _OFFSCREEN = True
+    FigureSession().__enter__()
+
+
+def _render_job(
+    spec: FigureSpec
+):
+    return spec.render()
+
+
+class RenderQueue:
+    """
+    Queue of figure jobs rendered in parallel worker processes, off-screen on the Agg
+    backend.
+
+    Attributes:
+        max_workers (int): number of worker processes (defaults to the number of CPUs).
+        jobs (list): FigureSpec waiting to be rendered.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = None
+    ):
+        self.max_workers = max_workers
+        self.jobs = []
+
+    def __len__(
+        self
+    ):
+        return len(self.jobs)
+
+    def submit(
+        self,
+        spec: FigureSpec
+    ):
+        """
+        Adds a figure job to the queue.
+        """
+        self.jobs.append(spec)
+
+    def extend(
+        self,
+        figures: list
+    ):
+        """
+        Adds the figure jobs collected from the computing functions (figures=...).
+        """
+        self.jobs.extend(figures)
+
+    def render(
+        self
+    ):
+        """
+        Renders every queued figure and empties the queue.
+
+        Returns:
+            list: paths of the saved images, in the order of the jobs.
+        """
+        jobs, self.jobs = self.jobs, []
+        if not jobs:
+            return []
+
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_render_worker
+        ) as executor:
+            return list(executor.map(_render_job, jobs))
+
+
+class FigureSession:
+    """
+    Managed rendering context for batches of figures. Inside it, the per-year comparison
+    plots (cf. computing.year_vs_climato) reuse one template figure whose line and fill data
+    are updated between years, the figures which are not shown are closed without being
+    displayed in notebooks, and the peak memory of the process is reported.
+
+    Attributes:
+        reuse (bool): reuses the template figures of the per-year plots.
+        n_figures (int): number of figures rendered in the session.
+        peak_rss (float): peak resident memory of the process (MB) at the end of the
+            session, None where it cannot be measured.
+    """
+
+    def __init__(
+        self,
+        reuse: bool = True
+    ):
+        self.reuse = reuse
+        self.n_figures = 0
+        self.peak_rss = None
+        self.templates = {}
+        self._previous = None
+
+    def __enter__(
+        self
+    ):
+        global _SESSION
+        self._previous = _SESSION
+        _SESSION = self
+        return self
+
+    def __exit__(
+        self,
+        *exc
+    ):
+        global _SESSION
+        _SESSION = self._previous
+        for template in self.templates.values():
+            _close(template["fig"])
+        self.templates.clear()
+        self.peak_rss = _peak_rss()
+        return False
+
+    def report(
+        self
+    ):
+        """
+        Returns the memory report of the session.
+
+        Returns:
+            dict: figures rendered, pyplot figures still open and peak resident memory (MB).
+        """
+        return {
+            "figures": self.n_figures,
+            "open_figures": len(plt.get_fignums()),
+            "peak_rss_mb": _peak_rss() if self.peak_rss is None else self.peak_rss
+        }
+
+
+# Resolution of the saved images
+DPI = 300
+
+# Ratio of points to max_points beyond which plot_data decimates a series
+DECIMATION_FACTOR = 2
+
+# Notebook backends, which display the figures at the end of the cell
+INLINE_BACKENDS = (
+    "inline",
+    "module://matplotlib_inline.backend_inline",
+    "module://ipykernel.pylab.backend_inline"
+)
+
+# Current FigureSession
+_SESSION = None
+
+
+def _peak_rss():
+    # Peak resident memory of the process (MB), ru_maxrss is in bytes on macOS
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak / 1024 ** 2
+
+    return peak / 1024
+
+
+def _close(
+    fig
+):
+    # Off-screen figures are not registered in pyplot, the garbage collector frees them
+    if not _OFFSCREEN:
+        plt.close(fig)
+
+
+def _template(
+    name: str
+):
+    # Template figure of the current session, None if there is none yet
+    if _SESSION is None or not _SESSION.reuse:
+        return None
+
+    return _SESSION.templates.get(name)
+
+
+def _new_template(
+    name: str,
+    fig,
+    ax,
+    lines: list,
+    texts: list = ()
+):
+    # Keeps the artists updated between iterations, in the session if there is one
+    template = {
+        "fig": fig,
+        "ax": ax,
+        "lines": lines,
+        "texts": list(texts),
+        "fills": [],
+        "kept": _SESSION is not None and _SESSION.reuse
+    }
+    if template["kept"]:
+        _SESSION.templates[name] = template
+
+    return template
+
+
+def _clear_fills(
+    template: dict
+):
+    for fill in template["fills"]:
+        fill.remove()
+    template["fills"].clear()
+
+
+def _rescale(
+    ax
+):
+    # Limits follow the data updated in a template
+    ax.relim()
+    ax.autoscale_view()
+
+
+def _new_figure(
+    figsize: tuple
+):
+    # Off-screen figures are not registered in pyplot
+    if _OFFSCREEN:
+        fig = Figure(figsize=figsize)
+    else:
+        fig = plt.figure(figsize=figsize)
+
+    return fig, fig.add_subplot()
+
+
+def _finish(
+    fig,
+    path: str = None,
+    show: bool = False,
+    keep: bool = False
+):
+    # Saves the figure, shows it in interactive sessions, then closes it unless it is a
+    # template, so that loops over plots do not pile figures up. Outside a FigureSession,
+    # notebooks display the figures which are not shown before they are closed, as they
+    # would at the end of the cell.
+    fig.tight_layout()
+    if path is not None:
+        fig.savefig(
+            path,
+            dpi=DPI,
+            bbox_inches="tight"
+        )
+    if show and not _OFFSCREEN:
+        plt.show()
+
+    if _SESSION is not None:
+        _SESSION.n_figures += 1
+    if keep:
+        return path
+
+    if (
+        _SESSION is None
+        and not show
+        and not _OFFSCREEN
+        and matplotlib.get_backend().lower() in INLINE_BACKENDS
+    ):
+        _display(fig)
+    _close(fig)
+
+    return path
+
+
+def _display(
+    fig
+):
+    # Displays a figure in the notebook output (IPython is there with the inline backends)
+    try:
+        from IPython.display import display
+    except ImportError:
+        return
+
+    display(fig)
+
+
+def _minmax_positions(
+    values: np.ndarray,
+    n_buckets: int
+):
+    # Positions of the min and max of each bucket, in their time order, with the first and
+    # last points so that the plot spans the whole period. Empty buckets keep one NaN
+    # position so that gaps stay visible.
+    n = len(values)
+    size = -(-n // n_buckets)
+    n_buckets = -(-n // size)
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = values
+    padded = padded.reshape(n_buckets, size)
+
+    empty = np.isnan(padded).all(axis=1)
+    pos_min = np.argmin(np.where(np.isnan(padded), np.inf, padded), axis=1)
+    pos_max = np.argmax(np.where(np.isnan(padded), -np.inf, padded), axis=1)
+    starts = np.arange(n_buckets) * size
+
+    pairs = np.sort(np.stack([pos_min, pos_max], axis=1), axis=1) + starts[:, None]
+    pairs[empty] = starts[empty, None]
+    positions = np.unique(np.append(pairs.ravel(), [0, n - 1]))
+
+    return positions[positions < n]
+
+
+def _lttb_positions(
+    x: np.ndarray,
+    values: np.ndarray,
+    n_out: int
+):
+    # Largest-Triangle-Three-Buckets: keeps, in each bucket, the point forming the largest
+    # triangle with the point kept in the previous bucket and the mean of the next bucket
+    n = len(values)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    filled = np.isfinite(values)
+
+    positions = np.empty(n_out, dtype=np.int64)
+    positions[0] = 0
+    positions[-1] = n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        if stop <= start:
+            positions[i + 1] = prev
+            continue
+        # Mean of the next bucket (the last point for the last bucket)
+        nxt = slice(stop, edges[i + 2] if i + 2 < n_out - 1 else n)
+        next_ok = filled[nxt]
+        if next_ok.any():
+            x_next = x[nxt][next_ok].mean()
+            y_next = values[nxt][next_ok].mean()
+        else:
+            x_next, y_next = x[nxt].mean(), values[prev]
+
+        area = np.abs(
+            (x[prev] - x_next) * (values[start:stop] - values[prev])
+            - (x[prev] - x[start:stop]) * (y_next - values[prev])
+        )
+        # Buckets without data keep a NaN point, i.e. a gap in the line
+        area = np.where(filled[start:stop], area, -1.0)
+        prev = start + int(np.argmax(area))
+        positions[i + 1] = prev
+
+    return np.unique(positions)
+
+
+def decimate(
+    sr: pd.Series,
+    max_points: int,
+    method: str = "minmax"
+):
+    """
+    Downsamples a long series before drawing it, without losing its visible shape.
+
+    Args:
+        sr (pd.Series): series to draw.
+        max_points (int): number of points kept, about twice the pixel width of the plot.
+        method (str, optional): "minmax" keeps the min and the max of each pixel column,
+            "lttb" the Largest-Triangle-Three-Buckets points plus the overall extremes.
+            Defaults to "minmax".
+
+    Returns:
+        pd.Series: the points kept, in time order (sr itself if it is short enough).
+    """
+    if len(sr) <= max_points:
+        return sr
+
+    values = sr.to_numpy(dtype=np.float64)
+    if method == "minmax":
+        positions = _minmax_positions(values, max(max_points // 2 - 1, 1))
+    elif method == "lttb":
+        if isinstance(sr.index, pd.DatetimeIndex):
+            x = sr.index.asi8.astype(np.float64)
+        else:
+            x = np.arange(len(sr), dtype=np.float64)
+        positions = _lttb_positions(x, values, max_points)
+        if np.isfinite(values).any():
+            extremes = [np.nanargmin(values), np.nanargmax(values)]
+            positions = np.union1d(positions, extremes)
+    else:
+        raise ValueError("Decimation method must be either 'minmax' or 'lttb'")
+
+    return sr.iloc[positions]
 
 
 def plot_data(
@@ -13,7 +472,9 @@ def plot_data(
     path: str, 
     station: bool = True,
     yaxe_precision: bool = False, 
-    season: str = None
+    season: str = None,
+    decimation: str = "minmax",
+    max_points: int = None
     ):
     """
     Plots a time series data with appropriate labels and saves the figure.
@@ -27,27 +488,43 @@ def plot_data(
             Defaults to False.
         season (str, optional): specify the season to adapt x-axis 
             ("DJF", "MAM", "JJA", "SON")
+        decimation (str, optional): downsampling of series much longer than the pixel
+            width of the image, "minmax" or "lttb" (cf. decimate), None draws every point.
+            Defaults to "minmax".
+        max_points (int, optional): points kept by the decimation. Defaults to twice the
+            pixel width of the image.
+
+    Returns:
+        str: path of the saved image
     """
 
-    plt.figure(figsize=(10, 5)) 
+    fig, ax = _new_figure((10, 5))
+    
+    if season is not None:
+        sr = pd.Series(sr.to_numpy(), index=range(1, len(sr) + 1))
+    
+    # Decimation of the series much longer than the pixel width
+    if max_points is None:
+        max_points = 2 * int(fig.get_figwidth() * DPI)
+    if decimation is not None and len(sr) > DECIMATION_FACTOR * max_points:
+        sr = decimate(sr, max_points, decimation)
     
     if season is not None:
         
-        new_index = range(1, len(sr) + 1)
-        plt.plot(new_index, sr, label=var_name, color="blue")
+        ax.plot(sr.index, sr, label=var_name, color="blue")
         
         # Defining index for the graph
         if season == "DJF":
-            plt.xticks([1, 31, 62, 90], ["1 Dec", "1 Jan", "1 Feb", "28/29 Feb"])
+            ax.set_xticks([1, 31, 62, 90], ["1 Dec", "1 Jan", "1 Feb", "28/29 Feb"])
         elif season == "MAM":
-            plt.xticks([1, 31, 61, 92], ["1 Mar", "1 Apr", "1 May", "31 May"])
+            ax.set_xticks([1, 31, 61, 92], ["1 Mar", "1 Apr", "1 May", "31 May"])
         elif season == "JJA":
-            plt.xticks([1, 31, 61, 92], ["1 Jun", "1 Jul", "1 Aug", "31 Aug"])
+            ax.set_xticks([1, 31, 61, 92], ["1 Jun", "1 Jul", "1 Aug", "31 Aug"])
         elif season == "SON":
-            plt.xticks([1, 31, 61, 91], ["1 Sep", "1 Oct", "1 Nov", "30 Nov"])
+            ax.set_xticks([1, 31, 61, 91], ["1 Sep", "1 Oct", "1 Nov", "30 Nov"])
     
     else:
-        plt.plot(
+        ax.plot(
             sr.index,
             sr,
             label=var_name,
@@ -55,39 +532,124 @@ def plot_data(
             ) 
 
     if station == True:
-        plt.title(f"{graph_title} at Rivesaltes station") 
+        ax.set_title(f"{graph_title} at Rivesaltes station")
     if station == False:
-        plt.title(f"{graph_title} over Perpignan")
+        ax.set_title(f"{graph_title} over Perpignan")
 
-    plt.xlabel("Date") 
+    ax.set_xlabel("Date")
     if var_name == "normal":
-        plt.xticks(np.arange(0, 366, 30))
+        ax.set_xticks(np.arange(0, 366, 30))
     
     var_call_lower = graph_title.lower()
     if "temperature" in var_call_lower:
-        plt.ylabel("Temperature (°C)") 
-        plt.yticks(np.arange(5, 27, 2.5))
+        ax.set_ylabel("Temperature (°C)")
+        ax.set_yticks(np.arange(5, 27, 2.5))
     elif "precipitation" in var_call_lower:
-        plt.ylabel("Precipitation (mm)")
+        ax.set_ylabel("Precipitation (mm)")
     elif "humidity" in var_call_lower:
-        plt.ylabel("Relative Humidity (%)")
+        ax.set_ylabel("Relative Humidity (%)")
     elif "solar radiation" in var_call_lower:
-        plt.ylabel("Solar radiation (kWh/m²)")
+        ax.set_ylabel("Solar radiation (kWh/m²)")
        
     if yaxe_precision:
-        plt.gca().yaxis.set_minor_locator(plt.MultipleLocator(0.5))
+        ax.yaxis.set_minor_locator(MultipleLocator(0.5))
         
-    plt.grid(True) 
-    plt.legend() 
-    plt.tight_layout() 
+    ax.grid(True)
+    ax.legend()
     
-    plt.savefig(
-            f"figs/{path}.png",
-            dpi=300,
-            bbox_inches="tight"
-        )
+    return _finish(fig, f"figs/{path}.png")
         
 
+def plot_year_vs_normal(
+    sr_actu_year_d,
+    sr_clim_on_dates,
+    all_diff,
+    time_range_climato,
+    year
+):
+    """
+    Plots the daily values of a year against the normal, filling the gaps in red (above)
+    and blue (below). Inside a FigureSession, the figure is a template reused from one
+    year to the next.
+
+    Args:
+        sr_actu_year_d (pd.Series): daily values of the year.
+        sr_clim_on_dates (pd.Series): normal reindexed on the same dates.
+        all_diff (str): text summarizing the differences (cf. mining.compute_diff).
+        time_range_climato (str): period of the normal (e.g. "1990-2019").
+        year (str): year compared.
+
+    Returns:
+        str: path of the saved image
+    """
+    template = _template("plot_year_vs_normal")
+    if template is None:
+        fig, ax = _new_figure((10, 5))
+        line_year, = ax.plot(
+            sr_actu_year_d.index,
+            sr_actu_year_d,
+            color="red"
+            ) 
+        line_clim, = ax.plot(
+            sr_clim_on_dates.index,
+            sr_clim_on_dates,
+            color="blue"
+            ) 
+        ax.set_xlabel("Date") 
+        ax.set_ylabel("Temperature (°C)") 
+        ax.yaxis.set_minor_locator(MultipleLocator(0.5))
+        ax.grid(True) 
+        text = ax.text(
+            0.45, 0.035,
+            "",
+            transform=ax.transAxes,
+            va="bottom",
+            ha="left",
+            fontsize=10,
+            bbox=dict(facecolor="white", alpha=1, edgecolor="red")  
+        )
+        template = _new_template("plot_year_vs_normal", fig, ax, [line_year, line_clim], [text])
+    else:
+        line_year, line_clim = template["lines"]
+        line_year.set_data(sr_actu_year_d.index, sr_actu_year_d)
+        line_clim.set_data(sr_clim_on_dates.index, sr_clim_on_dates)
+    
+    fig, ax = template["fig"], template["ax"]
+    line_year.set_label(f"{year} temperature")
+    line_clim.set_label(f"Normal-{time_range_climato}")
+    ax.set_title(f"Comparison between {year} temperature and {time_range_climato} normal at Rivesaltes station") 
+    ax.legend() 
+
+    # Fills are redrawn for each year
+    _clear_fills(template)
+    valid = sr_actu_year_d.notna() & sr_clim_on_dates.notna()  # éviter NaN lors du remplissage
+    template["fills"].append(
+        ax.fill_between(sr_actu_year_d.index, 
+                        sr_actu_year_d, sr_clim_on_dates, 
+                        where=(valid & (sr_actu_year_d > sr_clim_on_dates)), 
+                        interpolate=True, color="red", alpha=0.3
+                        )
+    )
+    template["fills"].append(
+        ax.fill_between(sr_actu_year_d.index, 
+                        sr_actu_year_d, sr_clim_on_dates, 
+                        where=(valid & (sr_actu_year_d <= sr_clim_on_dates)), 
+                        interpolate=True, color="blue", alpha=0.2
+                        )
+    )
+
+    text = template["texts"][0]
+    text.set_text(all_diff)
+    text.set_x(0.72 if year == "2025" else 0.45)
+    _rescale(ax)
+
+    return _finish(
+        fig,
+        f"figs/temp/clim_vs_year/norm_{time_range_climato}_{year}_year.png",
+        keep=template["kept"]
+    )
+
+
 def actu_year_vs_plot(
     dic_quantiles,
     sr_actu_year,
@@ -96,42 +658,65 @@ def actu_year_vs_plot(
     
 ):
     
-    sr_q10 = dic_quantiles["Q10"]
-    sr_q25 = dic_quantiles["Q25"]
-    sr_q50 = dic_quantiles["Q50"]
-    sr_q75 = dic_quantiles["Q75"]
-    sr_q90 = dic_quantiles["Q90"]
-    sr_max = dic_quantiles["Max"]
-    sr_min = dic_quantiles["Min"]
-    
-    plt.figure(figsize=(12, 6))
-    plt.plot(sr_q10.index, sr_q10, label="Q10", linestyle="--", color="lightgreen")
-    plt.plot(sr_q25.index, sr_q25, label="Q25", linestyle="--", color="green")
-    plt.plot(sr_q50.index, sr_q50, label="Median", color="black")
-    plt.plot(sr_q75.index, sr_q75, label="Q75", linestyle="--", color="orange")
-    plt.plot(sr_q90.index, sr_q90, label="Q90", linestyle="--", color="red")
-    plt.plot(sr_max.index, sr_max, label="Max", color="black")
-    plt.plot(sr_min.index, sr_min, label="Min", color="black")
-    plt.plot(
-        sr_actu_year.index,
-        sr_actu_year,
-        label="Actual Year",
-        color="blue",
-        linewidth=2
+    template = _template("actu_year_vs_plot")
+    if template is None:
+        sr_q10 = dic_quantiles["Q10"]
+        sr_q25 = dic_quantiles["Q25"]
+        sr_q50 = dic_quantiles["Q50"]
+        sr_q75 = dic_quantiles["Q75"]
+        sr_q90 = dic_quantiles["Q90"]
+        sr_max = dic_quantiles["Max"]
+        sr_min = dic_quantiles["Min"]
+        
+        fig, ax = _new_figure((12, 6))
+        lines = [
+            ax.plot(sr_q10.index, sr_q10, label="Q10", linestyle="--", color="lightgreen")[0],
+            ax.plot(sr_q25.index, sr_q25, label="Q25", linestyle="--", color="green")[0],
+            ax.plot(sr_q50.index, sr_q50, label="Median", color="black")[0],
+            ax.plot(sr_q75.index, sr_q75, label="Q75", linestyle="--", color="orange")[0],
+            ax.plot(sr_q90.index, sr_q90, label="Q90", linestyle="--", color="red")[0],
+            ax.plot(sr_max.index, sr_max, label="Max", color="black")[0],
+            ax.plot(sr_min.index, sr_min, label="Min", color="black")[0],
+            ax.plot(
+                sr_actu_year.index,
+                sr_actu_year,
+                label="Actual Year",
+                color="blue",
+                linewidth=2
+                )[0]
+        ]
+        ax.set_xlabel("Date")
+        ax.set_ylabel("Température (°C)")
+        ax.grid(True)
+        template = _new_template("actu_year_vs_plot", fig, ax, lines)
+    else:
+        # Same order as the lines of the template
+        keys = ["Q10", "Q25", "Q50", "Q75", "Q90", "Max", "Min"]
+        for line, key in zip(template["lines"], keys):
+            line.set_data(dic_quantiles[key].index, dic_quantiles[key])
+        template["lines"][-1].set_data(sr_actu_year.index, sr_actu_year)
+    
+    fig, ax = template["fig"], template["ax"]
+    _clear_fills(template)
+    template["fills"].append(
+        ax.fill_between(
+            dic_quantiles["Min"].index,
+            dic_quantiles["Min"],
+            dic_quantiles["Max"],
+            color="lightgray",
+            alpha=0.3
         )
-    plt.fill_between(sr_min.index, sr_min, sr_max, color="lightgray", alpha=0.3)
-    plt.legend()
-    plt.title(f"Comparison between {year} temperature and {time_range_climato} quantiles at Rivesaltes station")
-    plt.xlabel("Date")
-    plt.ylabel("Température (°C)")
-    plt.grid(True)
-    plt.tight_layout()
-    plt.savefig(
+    )
+    ax.legend()
+    ax.set_title(f"Comparison between {year} temperature and {time_range_climato} quantiles at Rivesaltes station")
+    _rescale(ax)
+
+    return _finish(
+        fig,
         f"figs/temp/clim_vs_year/quantiles_{time_range_climato}_{year}_year.png",
-        dpi=300,
-        bbox_inches="tight"
+        show=True,
+        keep=template["kept"]
     )
-    plt.show()
     
     
 def plot_threshold(
@@ -156,8 +741,7 @@ def plot_threshold(
         study_sign (str): Sign to study, either ">" or "<".
     """
     
-    plt.figure(figsize=(6, 5))
-    fig, ax = plt.subplots(figsize=(6, 5))
+    fig, ax = _new_figure((6, 5))
     bars = ax.bar(periods, count, color=["lightblue", "salmon"])
     ax.set_title(f"Number of days with {variable} {study_sign} {threshold}{unit} during {months_letter}")
     ax.set_ylabel("Number of days")
@@ -176,8 +760,7 @@ def plot_threshold(
             fontsize=10,
             color="black"
         )
-    plt.tight_layout()
-    plt.show()
+    return _finish(fig, show=True)
     
     
 def plot_threshold_serie(
@@ -207,7 +790,7 @@ def plot_threshold_serie(
     colors = ["#c7f7b3", "#ADD8E6", "#ffb3a7"]
     
     # --- Plot ---
-    fig, ax = plt.subplots(figsize=(8, 5))
+    fig, ax = _new_figure((8, 5))
 
     bars = ax.bar(periods, counts, color=colors)
 
@@ -232,8 +815,7 @@ def plot_threshold_serie(
             color="black"
         )
 
-    plt.tight_layout()
-    plt.show()
+    return _finish(fig, show=True)
     
     
 def plot_rr_nrm(
@@ -248,7 +830,7 @@ def plot_rr_nrm(
     total_txt = f"Total year: {total:.2f} mm"
     
     if freq == "D":
-        fig, ax = plt.subplots(figsize=(10, 5)) 
+        fig, ax = _new_figure((10, 5))
         ax.plot(
             sr_climato.index,
             sr_climato,
@@ -269,15 +851,10 @@ def plot_rr_nrm(
             bbox=dict(facecolor="white", alpha=1, edgecolor="black")  
         )
             
-        plt.grid(True) 
-        plt.legend() 
-        plt.tight_layout() 
+        ax.grid(True)
+        ax.legend()
     
-        plt.savefig(
-            f"figs/precip/norm_rr1_{frst_year}_{last_year}_daily.png",
-            dpi=300,
-            bbox_inches="tight"
-        )
+        return _finish(fig, f"figs/precip/norm_rr1_{frst_year}_{last_year}_daily.png")
         
     elif freq == "M":
         sr_climato.index.name = "month"   # index = 1..12
@@ -285,7 +862,7 @@ def plot_rr_nrm(
         months_labels = ["Jan","Feb","Mar","Apr","May","Jun","Jul","Aug","Sep","Oct","Nov","Dec"]
         x = np.arange(1, 13)
         
-        fig, ax = plt.subplots(figsize=(10, 5))
+        fig, ax = _new_figure((10, 5))
         ax.bar(
             x,
             sr_climato.values,
@@ -310,10 +887,8 @@ def plot_rr_nrm(
             bbox=dict(facecolor="white", alpha=1, edgecolor="black")  
         )
         
-        plt.grid(axis="y", alpha=0.3)
-        plt.tight_layout()
-        plt.savefig(f"figs/precip/norm_rr1_{frst_year}_{last_year}_monthly.png", dpi=300, bbox_inches="tight")
-        plt.show()
+        ax.grid(axis="y", alpha=0.3)
+        return _finish(fig, f"figs/precip/norm_rr1_{frst_year}_{last_year}_monthly.png", show=True)
 
 
 def plot_clim_ma_compa(
@@ -323,25 +898,24 @@ def plot_clim_ma_compa(
     station : str = True
 ):
     
-    plt.figure(figsize=(10, 5)) 
+    fig, ax = _new_figure((10, 5))
     
     for key, serie in dic_nrms.items():
-        plt.plot(
+        ax.plot(
             serie.index,
             serie.values,
             label=f"MA {key} jours"
         ) 
         
-    plt.title(f"Comparison between different MA length to compute normal from {first_year} to {last_year}")
+    ax.set_title(f"Comparison between different MA length to compute normal from {first_year} to {last_year}")
 
-    plt.xlabel("Days") 
-    plt.xticks(np.arange(0, 366, 30))
+    ax.set_xlabel("Days")
+    ax.set_xticks(np.arange(0, 366, 30))
     
-    plt.ylabel("Température (°C)") 
+    ax.set_ylabel("Température (°C)")
     
-    plt.grid(True) 
-    plt.legend(title="Number of days")
-    plt.tight_layout() 
+    ax.grid(True)
+    ax.legend(title="Number of days")
     
     img_title = f"compa_ma_lenght_{first_year}_{last_year}"
     
@@ -350,13 +924,7 @@ def plot_clim_ma_compa(
     else:
         path = f"figs/temp/reanalysis/{img_title}.png"
     
-    plt.savefig(
-        path,
-        dpi=300,
-        bbox_inches="tight"
-    )
-    
-    plt.show()
+    return _finish(fig, path, show=True)
 
 
 def plot_quantiles(
@@ -367,37 +935,31 @@ def plot_quantiles(
     all : bool = True 
 ):
     
-    plt.figure(figsize=(12, 6))
+    fig, ax = _new_figure((12, 6))
     
     if all == True :
-        plt.plot(dic_quantiles["Q10"].index, dic_quantiles["Q10"], label="Q10", linestyle="--", color="lightgreen")
-        plt.plot(dic_quantiles["Q25"].index, dic_quantiles["Q25"], label="Q25", linestyle="--", color="green")
-        plt.plot(dic_quantiles["Q75"].index, dic_quantiles["Q75"], label="Q75", linestyle="--", color="orange")
-        plt.plot(dic_quantiles["Q90"].index, dic_quantiles["Q90"], label="Q90", linestyle="--", color="red")
-    
-    plt.plot(dic_quantiles["Q50"].index, dic_quantiles["Q50"], label="Median", color="blue")
-    plt.plot(dic_quantiles["Max"].index, dic_quantiles["Max"], label="Max", color="black")
-    plt.plot(dic_quantiles["Min"].index, dic_quantiles["Min"], label="Min", color="black")
-    plt.fill_between(dic_quantiles["Min"].index, dic_quantiles["Min"], dic_quantiles["Max"], color="lightgray", alpha=0.3)
-    
-    plt.legend()
-    plt.title(f"{title}")
-    plt.xlabel("Date")
-    plt.xticks(np.arange(0, 366, 30))
-    plt.ylabel(f"{ylabel}")
+        ax.plot(dic_quantiles["Q10"].index, dic_quantiles["Q10"], label="Q10", linestyle="--", color="lightgreen")
+        ax.plot(dic_quantiles["Q25"].index, dic_quantiles["Q25"], label="Q25", linestyle="--", color="green")
+        ax.plot(dic_quantiles["Q75"].index, dic_quantiles["Q75"], label="Q75", linestyle="--", color="orange")
+        ax.plot(dic_quantiles["Q90"].index, dic_quantiles["Q90"], label="Q90", linestyle="--", color="red")
+    
+    ax.plot(dic_quantiles["Q50"].index, dic_quantiles["Q50"], label="Median", color="blue")
+    ax.plot(dic_quantiles["Max"].index, dic_quantiles["Max"], label="Max", color="black")
+    ax.plot(dic_quantiles["Min"].index, dic_quantiles["Min"], label="Min", color="black")
+    ax.fill_between(dic_quantiles["Min"].index, dic_quantiles["Min"], dic_quantiles["Max"], color="lightgray", alpha=0.3)
+    
+    ax.legend()
+    ax.set_title(f"{title}")
+    ax.set_xlabel("Date")
+    ax.set_xticks(np.arange(0, 366, 30))
+    ax.set_ylabel(f"{ylabel}")
     if type == "max":
-        plt.yticks(np.arange(-5, 46, 5))
+        ax.set_yticks(np.arange(-5, 46, 5))
     if type == "min":
-        plt.yticks(np.arange(-15, 31, 5))
-    plt.grid(True)
-    plt.tight_layout()
-    
-    plt.savefig(
-        f"figs/{img_path}.png",
-        dpi=300,
-        bbox_inches="tight"
-    )
-    plt.show()
+        ax.set_yticks(np.arange(-15, 31, 5))
+    ax.grid(True)
+    
+    return _finish(fig, f"figs/{img_path}.png", show=True)
     
     
 def plot_quantiles_max(
@@ -416,19 +978,18 @@ def plot_quantiles_max(
         title (str): _description_
     """
 
-    plt.figure(figsize=(12, 6))
-    plt.plot(sr_q50.index, sr_q50, label="Median", color="blue")
-    plt.plot(sr_max.index, sr_max, label="Max", color="black")
-    plt.plot(sr_min.index, sr_min, label="Min", color="black")
-    plt.fill_between(sr_min.index, sr_min, sr_max, color="lightgray", alpha=0.3, label="Min-Max")
-    plt.legend()
-    plt.title(title)
-    plt.xlabel("Date")
-    plt.ylabel("Max daily température (°C)")
-    plt.grid(True)
-    plt.tight_layout()
-    plt.ylim(0, 45)
-    plt.show()
+    fig, ax = _new_figure((12, 6))
+    ax.plot(sr_q50.index, sr_q50, label="Median", color="blue")
+    ax.plot(sr_max.index, sr_max, label="Max", color="black")
+    ax.plot(sr_min.index, sr_min, label="Min", color="black")
+    ax.fill_between(sr_min.index, sr_min, sr_max, color="lightgray", alpha=0.3, label="Min-Max")
+    ax.legend()
+    ax.set_title(title)
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Max daily température (°C)")
+    ax.grid(True)
+    ax.set_ylim(0, 45)
+    return _finish(fig, show=True)
     
   
 def season_box_plot(
@@ -451,8 +1012,7 @@ def season_box_plot(
     n_months = len(months)
     n_series = len(dic_sr)
 
-    plt.figure(figsize=(10, 6))
-    ax = plt.gca()
+    fig, ax = _new_figure((10, 6))
 
     base_positions = np.arange(1, n_months+1)
     width = 0.15
@@ -478,8 +1038,9 @@ def season_box_plot(
         box_color = custom_cmap(color_value, 0.4)
         median_color = custom_cmap(color_value, 1.0)
 
-        bp = plt.boxplot(
-            series,
+        # Box statistics precomputed by computing.season_box
+        bp = ax.bxp(
+            info["stats"],
             positions=positions,
             widths=width,
             patch_artist=True,
@@ -487,10 +1048,10 @@ def season_box_plot(
             medianprops=dict(color=median_color)
         )
 
-        # repérer les min des boxes
+        # repérer les min des boxes (values sorted in each group)
         for g in series:
             if len(g) > 0:
-                ymin_box = min(ymin_box, g.min())
+                ymin_box = min(ymin_box, g[0])
 
         legend_handles.append(Patch(facecolor=box_color, label=period))
 
@@ -504,7 +1065,7 @@ def season_box_plot(
             positions = base_positions + offsets[i]
             if cumuls_m is not None:
                 for pos, val in zip(positions, cumuls_m):
-                    plt.text(
+                    ax.text(
                         pos, y_offset, f"{val:.0f}",
                         ha="center", va="top",
                         fontsize=9, fontweight="bold"
@@ -514,7 +1075,7 @@ def season_box_plot(
         txt = "\n".join(
             [f"{p}: {info['total']:.0f} mm" for p, info in dic_sr.items()]
         )
-        plt.text(
+        ax.text(
             0.01, 0.98,
             txt,
             transform=ax.transAxes,
@@ -523,17 +1084,15 @@ def season_box_plot(
         )
 
     # ================ STYLE GRAPHIQUE ================
-    plt.xticks(base_positions, labels)
-    plt.xlabel("Month")
-    plt.ylabel(y_label)
-    plt.title(title)
+    ax.set_xticks(base_positions, labels)
+    ax.set_xlabel("Month")
+    ax.set_ylabel(y_label)
+    ax.set_title(title)
 
-    plt.legend(handles=legend_handles, loc="upper right")
-    plt.grid(alpha=0.3)
-    plt.tight_layout()
+    ax.legend(handles=legend_handles, loc="upper right")
+    ax.grid(alpha=0.3)
 
-    plt.savefig(f"figs/{folder}/{save}_boxplot.png", dpi=300, bbox_inches="tight")
-    plt.show()
+    return _finish(fig, f"figs/{folder}/{save}_boxplot.png", show=True)
 
 
 def plot_rr_bar(
@@ -542,8 +1101,8 @@ def plot_rr_bar(
     path
 ):
 
-    plt.figure(figsize=(10, 5))
-    plt.bar(
+    fig, ax = _new_figure((10, 5))
+    ax.bar(
         sr.index,
         sr.values,
         width=150,
@@ -551,13 +1110,11 @@ def plot_rr_bar(
         edgecolor="black",
         linewidth=1.0
     )
-    plt.title(title)
-    plt.xlabel("Year")
-    plt.ylabel("Precipitation (mm)")
-    plt.grid(axis="y", alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(f"figs/{path}", dpi=300, bbox_inches="tight")
-    plt.show()
+    ax.set_title(title)
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Precipitation (mm)")
+    ax.grid(axis="y", alpha=0.3)
+    return _finish(fig, f"figs/{path}", show=True)
 
 
 def monthly_rr_box(
@@ -567,27 +1124,27 @@ def monthly_rr_box(
     range_two
 ):
 
-    # Groupement mensuel
-    group_o = [sr_one[sr_one.index.month == m] for m in range(1, 13)]
-    group_t   = [sr_two[sr_two.index.month == m] for m in range(1, 13)]
+    # Groupement mensuel (one sort per series, box statistics of all the months at once)
+    stats_o = Groups.by_month(sr_one).box_stats()
+    stats_t = Groups.by_month(sr_two).box_stats()
 
     # Préparation du graphique
-    plt.figure(figsize=(12, 6))
+    fig, ax = _new_figure((12, 6))
 
     pos_o = range(1, 13)
     pos_t = [p + 0.3 for p in pos_o]  # separating bow plot
 
     # Boxplots
-    plt.boxplot(
-        group_o, 
+    ax.bxp(
+        stats_o, 
         positions=pos_o, 
         widths=0.25, 
         patch_artist=True,
         boxprops=dict(facecolor="lightblue"), 
         medianprops=dict(color="blue")
         )
-    plt.boxplot(
-        group_t, 
+    ax.bxp(
+        stats_t, 
         positions=pos_t, 
         widths=0.25, 
         patch_artist=True,
@@ -595,20 +1152,19 @@ def monthly_rr_box(
         medianprops=dict(color="red")
         )
 
-    plt.xticks(range(1, 13), 
+    ax.set_xticks(range(1, 13),
             ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
                 "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
             )
-    plt.xlabel("Month")
-    plt.ylabel("Precipitation (mm)")
-    plt.title("Monthly quantiles precipitation comparison at Rivesaltes station")
-    plt.legend(
+    ax.set_xlabel("Month")
+    ax.set_ylabel("Precipitation (mm)")
+    ax.set_title("Monthly quantiles precipitation comparison at Rivesaltes station")
+    ax.legend(
         handles=[
             Patch(facecolor="lightblue", label=f"{range_one}"),
             Patch(facecolor="salmon", label=f"{range_two}")
         ],
         loc="upper left"
     )
-    plt.grid(alpha=0.3)
-    plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    ax.grid(alpha=0.3)
+    return _finish(fig, show=True)
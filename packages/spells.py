@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+from packages.calkeys import calendar_keys
+from packages.exceedance import SEASONS
+
+
+def _runs(
+    mask: np.ndarray
+):
+    # Run-length encoding of a boolean mask: starts and (exclusive) ends of the True runs
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def _segment_reduce(
+    ufunc,
+    values: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray
+):
+    # ufunc over each [start, end) segment, in one reduceat call
+    padded = np.append(values, values[-1:])
+    bounds = np.ravel(np.column_stack([starts, ends]))
+
+    return ufunc.reduceat(padded, bounds)[::2]
+
+
+def find_spells(
+    sr: pd.Series,
+    threshold: float,
+    sign: str = ">",
+    min_length: int = 1
+):
+    """
+    Finds the spells of consecutive days above or below a threshold (heat waves, frost runs,
+    dry spells...) by run-length encoding of the boolean mask, over the whole record at once.
+    Missing days (gaps in the dates or NaN) end a spell.
+
+    Args:
+        sr (pd.Series): daily series, e.g. open_data(...).resample("D").max().
+        threshold (float): threshold of the spells.
+        sign (str, optional): ">" for days strictly above the threshold, "<" strictly below.
+            Defaults to ">".
+        min_length (int, optional): minimum number of days of a spell. Defaults to 1.
+
+    Returns:
+        pd.DataFrame: one row per spell, columns start, end (last day), length (days), mean,
+            peak (most extreme value) and excess (sum of the distances to the threshold).
+    """
+    # Missing days become NaN, so that they break the spells
+    sr = sr.asfreq("D")
+    values = sr.to_numpy(dtype=np.float64)
+
+    if sign == ">":
+        mask = values > threshold
+        peak_func = np.maximum
+    elif sign == "<":
+        mask = values < threshold
+        peak_func = np.minimum
+    else:
+        raise ValueError("Study sign must be either '>' or '<'")
+
+    starts, ends = _runs(mask)
+    keep = (ends - starts) >= min_length
+    starts, ends = starts[keep], ends[keep]
+
+    # Sums over the spells from cumulative sums
+    excess = np.where(mask, np.abs(values - threshold), 0.0)
+    cumul_values = np.concatenate(([0.0], np.cumsum(np.where(mask, values, 0.0))))
+    cumul_excess = np.concatenate(([0.0], np.cumsum(excess)))
+    lengths = ends - starts
+
+    if len(starts):
+        peaks = _segment_reduce(peak_func, values, starts, ends)
+    else:
+        peaks = np.empty(0)
+
+    return pd.DataFrame({
+        "start": sr.index[starts],
+        "end": sr.index[ends - 1],
+        "length": lengths,
+        "mean": (cumul_values[ends] - cumul_values[starts]) / np.maximum(lengths, 1),
+        "peak": peaks,
+        "excess": cumul_excess[ends] - cumul_excess[starts]
+    })
+
+
+def spell_summary(
+    df_spells: pd.DataFrame,
+    by: str = "year",
+    years: list = None
+):
+    """
+    Summarizes spells per year or per season. A spell is counted in the year (season) of its
+    start, December counting in the DJF season of the next year.
+
+    Args:
+        df_spells (pd.DataFrame): spells returned by find_spells.
+        by (str, optional): "year" or "season". Defaults to "year".
+        years (list, optional): years to report, those without spells with zero counts.
+            Defaults to the years of the spells.
+
+    Returns:
+        pd.DataFrame: indexed by year (and season), columns n_spells, longest, spell_days and
+            excess.
+    """
+    keys = calendar_keys(pd.DatetimeIndex(df_spells["start"]))
+    year = keys.year.astype(np.int64)
+
+    if by == "year":
+        group_keys = [year]
+        names = ["year"]
+    elif by == "season":
+        season = np.array(list(SEASONS))[keys.season]
+        year = keys.season_year.astype(np.int64)
+        group_keys = [year, season]
+        names = ["year", "season"]
+    else:
+        raise ValueError("Summary must be either by 'year' or by 'season'")
+
+    df_summary = df_spells.groupby(group_keys).agg(
+        n_spells=("length", "size"),
+        longest=("length", "max"),
+        spell_days=("length", "sum"),
+        excess=("excess", "sum")
+    )
+    df_summary.index.names = names
+
+    if years is not None:
+        if by == "year":
+            full_index = pd.Index(years, name="year")
+        else:
+            full_index = pd.MultiIndex.from_product([years, list(SEASONS)], names=names)
+        df_summary = df_summary.reindex(full_index, fill_value=0)
+
+    return df_summary
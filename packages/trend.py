@@ -0,0 +1,333 @@
+import math
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from packages.calkeys import calendar_keys
+from packages.cube import DoyCube, N_DAYS
+
+# Largest number of pairwise slopes held in memory at once (Sen slopes of short series)
+MAX_PAIRS = 4_000_000
+
+# Columns of the trend tables
+TREND_COLUMNS = ["n", "s", "tau", "z", "p", "trend", "slope", "intercept"]
+
+
+def _dense_ranks(
+    values: np.ndarray
+):
+    # Ranks of each column (ties share a rank), NaN ranked last with rank n
+    n = values.shape[0]
+    order = np.argsort(values, axis=0, kind="stable")
+    sorted_values = np.take_along_axis(values, order, axis=0)
+    new_value = np.diff(sorted_values, axis=0) != 0
+    sorted_ranks = np.concatenate(
+        (np.zeros((1, values.shape[1]), dtype=np.int64), np.cumsum(new_value, axis=0)),
+        axis=0
+    )
+
+    ranks = np.empty_like(sorted_ranks)
+    np.put_along_axis(ranks, order, sorted_ranks, axis=0)
+
+    return np.where(np.isnan(values), n, ranks)
+
+
+def _count_greater(
+    ranks: np.ndarray
+):
+    # Pairs i < j with ranks[i] > ranks[j] in each column: bottom-up merge sort of all the
+    # columns at once, the left halves being searched with one searchsorted per level
+    n, m = ranks.shape
+    n_pad = 1 << max(n - 1, 0).bit_length()
+    span = n + 2
+
+    # Padding after the data, greater than every rank: adds no pair
+    work = np.full((m, n_pad), n + 1, dtype=np.int64)
+    work[:, :n] = ranks.T
+
+    counts = np.zeros(m, dtype=np.int64)
+    size = 1
+    while size < n_pad:
+        blocks = work.reshape(m, -1, 2, size)
+        left, right = blocks[:, :, 0, :], blocks[:, :, 1, :]
+
+        # Each left half is shifted to its own value range, so that they sort as one array
+        groups = np.arange(m * n_pad // (2 * size)).reshape(m, -1, 1)
+        positions = np.searchsorted(
+            (left + groups * span).ravel(),
+            (right + groups * span).ravel(),
+            side="right"
+        ).reshape(right.shape)
+        counts += ((groups + 1) * size - positions).sum(axis=(1, 2))
+
+        work = np.sort(blocks.reshape(m, -1, 2 * size), axis=-1).reshape(m, n_pad)
+        size *= 2
+
+    return counts
+
+
+def _nan_pairs(
+    valid: np.ndarray
+):
+    # Pairs (missing i, valid j > i) counted by _count_greater, NaN being ranked last
+    valid_after = np.cumsum(valid[::-1], axis=0)[::-1] - valid
+
+    return (valid_after * ~valid).sum(axis=0)
+
+
+def _as_2d(
+    values,
+    x = None
+):
+    # Values as (n, m) float columns and their positions x
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    if x is None:
+        x = np.arange(values.shape[0], dtype=np.float64)
+    x = np.asarray(x, dtype=np.float64)
+    if np.any(np.diff(x) <= 0):
+        raise ValueError("x must be strictly increasing")
+
+    return values, x
+
+
+def mann_kendall(
+    values,
+    alpha: float = 0.05
+):
+    """
+    Mann-Kendall trend test of one series or of every column of a 2-D array (time along the
+    first axis), missing values left out. The S statistic counts the concordant and discordant
+    pairs with a merge-sort inversion count, O(n log² n) for all the columns at once.
+
+    Args:
+        values (array-like): (n,) series or (n, m) columns.
+        alpha (float, optional): significance level of the trend. Defaults to 0.05.
+
+    Returns:
+        dict: per column, "n" (valid values), "s", "tau" (S over the number of pairs), "z",
+            "p" (two-sided p-value, tie-corrected variance) and "trend" ("increasing",
+            "decreasing" or "no trend").
+    """
+    values, _ = _as_2d(values)
+    valid = ~np.isnan(values)
+    n_valid = valid.sum(axis=0)
+
+    # The pairs with a missing value are counted by both calls and cancel out
+    ranks = _dense_ranks(values)
+    s = _count_greater(_dense_ranks(-values)) - _count_greater(ranks)
+
+    # Tie correction of the variance, from the sizes of the groups of equal values
+    n, m = values.shape
+    ties = np.bincount(
+        (np.arange(m) * (n + 1) + ranks)[valid],
+        minlength=m * (n + 1)
+    ).reshape(m, n + 1)
+    tie_term = (ties * (ties - 1) * (2 * ties + 5)).sum(axis=1)
+    var_s = (n_valid * (n_valid - 1) * (2 * n_valid + 5) - tie_term) / 18
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(var_s > 0, (s - np.sign(s)) / np.sqrt(var_s), np.nan)
+        tau = s / (n_valid * (n_valid - 1) / 2)
+    p = np.array([math.erfc(abs(value) / math.sqrt(2)) for value in z])
+
+    significant = p < alpha
+    trend = np.where(significant & (z > 0), "increasing", "no trend")
+    trend = np.where(significant & (z < 0), "decreasing", trend)
+
+    return {"n": n_valid, "s": s, "tau": tau, "z": z, "p": p, "trend": trend}
+
+
+def _pairwise_slopes(
+    values: np.ndarray,
+    x: np.ndarray
+):
+    # Median of the slopes of every pair, vectorized by chunks of columns
+    first, second = np.triu_indices(len(x), 1)
+    dx = (x[second] - x[first])[:, np.newaxis]
+    chunk = max(MAX_PAIRS // max(len(first), 1), 1)
+
+    slopes = np.full(values.shape[1], np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for start in range(0, values.shape[1], chunk):
+            block = values[:, start:start + chunk]
+            slopes[start:start + chunk] = np.nanmedian((block[second] - block[first]) / dx, axis=0)
+
+    return slopes
+
+
+def _kth_slope(
+    values: np.ndarray,
+    x: np.ndarray,
+    k: np.ndarray
+):
+    # k-th smallest pairwise slope of each column by bisection, the number of slopes above a
+    # candidate being an inversion count of values - t * x (no pair held in memory)
+    valid = ~np.isnan(values)
+    n_pairs = valid.sum(axis=0) * (valid.sum(axis=0) - 1) // 2
+    nan_pairs = _nan_pairs(valid)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        bound = (np.nanmax(values, axis=0) - np.nanmin(values, axis=0)) / np.diff(x).min()
+    bound = np.nan_to_num(bound) + 1
+    low, high = -bound, bound
+
+    for _ in range(200):
+        mid = (low + high) / 2
+        above = _count_greater(_dense_ranks(mid * x[:, np.newaxis] - values)) - nan_pairs
+        enough = n_pairs - above >= k + 1
+        high = np.where(enough, mid, high)
+        low = np.where(enough, low, mid)
+        if np.all(high - low <= 1e-12 * np.maximum(np.abs(high), 1)):
+            break
+
+    return np.where(n_pairs > 0, high, np.nan)
+
+
+def sens_slope(
+    values,
+    x = None
+):
+    """
+    Theil-Sen slope (median of the slopes of every pair of values) of one series or of every
+    column of a 2-D array, missing values left out. Short series use the pairwise slopes
+    (vectorized); long ones, whose pairs would not fit in memory, a bisection on the slope
+    counting the pairs above it in O(n log² n).
+
+    Args:
+        values (array-like): (n,) series or (n, m) columns.
+        x (array-like, optional): strictly increasing positions of the values (e.g. years).
+            Defaults to 0..n-1.
+
+    Returns:
+        float or np.ndarray: slope per unit of x, one per column for 2-D values.
+    """
+    squeeze = np.ndim(values) == 1
+    values, x = _as_2d(values, x)
+
+    n = len(x)
+    if n * (n - 1) // 2 <= MAX_PAIRS:
+        slopes = _pairwise_slopes(values, x)
+    else:
+        n_valid = (~np.isnan(values)).sum(axis=0)
+        n_pairs = n_valid * (n_valid - 1) // 2
+        low = _kth_slope(values, x, (n_pairs - 1) // 2)
+        high = _kth_slope(values, x, n_pairs // 2)
+        slopes = (low + high) / 2
+
+    return slopes[0] if squeeze else slopes
+
+
+def trend_table(
+    values,
+    x = None,
+    alpha: float = 0.05,
+    index = None
+):
+    """
+    Mann-Kendall test and Theil-Sen slope of every column of a 2-D array.
+
+    Args:
+        values (array-like): (n,) series or (n, m) columns, time along the first axis.
+        x (array-like, optional): strictly increasing positions of the values (e.g. years).
+            Defaults to 0..n-1.
+        alpha (float, optional): significance level of the trend. Defaults to 0.05.
+        index (array-like, optional): label of each column. Defaults to 0..m-1.
+
+    Returns:
+        pd.DataFrame: one row per column, columns n, s, tau, z, p, trend, slope (per unit of x)
+            and intercept (Conover: median of the values - slope * median of x).
+    """
+    values, x = _as_2d(values, x)
+    results = mann_kendall(values, alpha)
+    slopes = sens_slope(values, x)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        x_valid = np.where(np.isnan(values), np.nan, x[:, np.newaxis])
+        results["slope"] = slopes
+        results["intercept"] = np.nanmedian(values, axis=0) - slopes * np.nanmedian(x_valid, axis=0)
+
+    return pd.DataFrame(results, index=index, columns=TREND_COLUMNS)
+
+
+def _decimal_years(
+    index: pd.DatetimeIndex
+):
+    # Dates as decimal years, so that the slopes are per year
+    keys = calendar_keys(index)
+    year = keys.year.astype(np.float64)
+    leap = (keys.year % 4 == 0) & ((keys.year % 100 != 0) | (keys.year % 400 == 0))
+
+    return year + (keys.dayofyear - 1) / np.where(leap, 366, 365)
+
+
+def series_trend(
+    sr: pd.Series,
+    alpha: float = 0.05
+):
+    """
+    Trend of a series, e.g. the yearly mean temperature (sr.resample("YE").mean()).
+
+    Args:
+        sr (pd.Series): series with a DatetimeIndex.
+        alpha (float, optional): significance level of the trend. Defaults to 0.05.
+
+    Returns:
+        pd.Series: n, s, tau, z, p, trend, slope (per year) and intercept.
+    """
+    sr = sr.sort_index()
+
+    return trend_table(sr.to_numpy(), _decimal_years(sr.index), alpha).iloc[0].rename(sr.name)
+
+
+def doy_trends(
+    sr,
+    how: str = "mean",
+    alpha: float = 0.05,
+    start: str = None,
+    end: str = None
+):
+    """
+    Trend of every day of the year across the years: one test on each of the 366 month-day
+    columns of the (year x day) cube, all the columns at once.
+
+    Args:
+        sr (pd.Series or DoyCube): daily or sub-daily data.
+        how (str, optional): daily aggregation of sub-daily data ("mean", "min", "max" or
+            "sum"). Defaults to "mean".
+        alpha (float, optional): significance level of the trends. Defaults to 0.05.
+        start (str, optional): first date of the period. Defaults to None.
+        end (str, optional): last date of the period. Defaults to None.
+
+    Returns:
+        pd.DataFrame: trend table (cf. trend_table) indexed by month-day (1..366, 60 = Feb 29),
+            slopes per year.
+    """
+    cube = sr if isinstance(sr, DoyCube) else DoyCube.from_series(sr)
+    cube = cube.period(start, end).daily(how)
+
+    return trend_table(cube.values, cube.years, alpha, pd.RangeIndex(1, N_DAYS + 1))
+
+
+def station_trends(
+    df: pd.DataFrame,
+    alpha: float = 0.05
+):
+    """
+    Trends of many stations at once, e.g. their yearly means (one column per station).
+
+    Args:
+        df (pd.DataFrame): values with a DatetimeIndex, one column per station.
+        alpha (float, optional): significance level of the trends. Defaults to 0.05.
+
+    Returns:
+        pd.DataFrame: trend table (cf. trend_table) indexed by station, slopes per year.
+    """
+    df = df.sort_index()
+
+    return trend_table(df.to_numpy(), _decimal_years(df.index), alpha, df.columns)
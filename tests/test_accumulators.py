@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from packages.accumulators import ClimAccumulator, QuantileSketch, merge_accumulators
+from packages.cube import DoyCube
+from packages.mining import accumulate_daily
+
+
+def _hourly_csv(
+    path,
+    years: int = 20
+):
+    # Météo-France-like hourly temperatures in tenths of °C, over a realistic range
+    index = pd.date_range("2000-01-01", periods=years * 8766, freq="h")
+    rng = np.random.default_rng(0)
+    seasonal = 15 - 10 * np.cos(2 * np.pi * index.dayofyear / 365.25)
+    daily = 5 * np.sin(2 * np.pi * (index.hour - 9) / 24)
+    values = np.round(seasonal + daily + rng.normal(0, 4, len(index)), 1)
+
+    pd.DataFrame({
+        "POSTE": 66164001,
+        "DATE": index.strftime("%Y%m%d%H"),
+        "T": values
+    }).to_csv(path, sep=";", decimal=",", index=False)
+
+    return pd.Series(values, index=index)
+
+
+def test_accumulate_daily_matches_exact_statistics(tmp_path):
+    path = tmp_path / "hourly.csv"
+    sr = _hourly_csv(path)
+    # More than 32767 / 366 bins: the flat positions of the sketch overflow int16
+    assert (sr.max() - sr.min()) / 0.1 > 32767 / 366
+
+    acc = accumulate_daily(str(path), "T", how="max", chunksize=50_000)
+    stats = ["Q10", "Q50", "Q90", "Min", "Max", "Count"]
+    accumulated = acc.statistics(stats)
+    exact = DoyCube.from_series(sr.resample("D").max()).statistics(stats)
+
+    for stat in stats:
+        # Daily maxima are exact multiples of the resolution: no sketch error
+        np.testing.assert_allclose(accumulated[stat], exact[stat], atol=1e-9)
+
+
+def test_sketch_keeps_values_across_wide_spans():
+    sr = pd.Series([0.0, 12.0], index=pd.to_datetime(["2000-12-30", "2000-12-31"]))
+
+    acc = ClimAccumulator().update(sr)
+    medians = acc.statistics(["Q50"])["Q50"]
+
+    np.testing.assert_allclose(medians.loc[[365, 366]], [0.0, 12.0])
+
+
+def test_sketch_refuses_to_allocate_past_its_budget():
+    sketch = QuantileSketch(0.1)
+    sketch.update(np.array([0, 1]), np.array([20.0, 21.0]))
+
+    # A 9999 sentinel would need 366 x 99_800 bins (292 MB)
+    with pytest.raises(ValueError, match="max_bins"):
+        sketch.update(np.array([2]), np.array([9999.0]))
+    assert sketch.counts.shape[1] <= sketch.max_bins
+    assert sketch.counts.sum() == 2
+
+
+def test_sketch_clamps_to_its_value_range():
+    sketch = QuantileSketch(0.1, value_range=(-50, 60))
+    days = np.zeros(5, dtype=np.int64)
+    sketch.update(days, np.array([10.0, 11.0, 12.0, 13.0, 9999.0]))
+
+    assert sketch.counts.shape[1] == 1101
+    np.testing.assert_allclose(sketch.quantiles([0.5, 1.0])[0], [12.0, 60.0])
+
+
+def test_accumulator_round_trip_keeps_the_budget(tmp_path):
+    acc = ClimAccumulator(max_bins=600, value_range=(-10, 40))
+    acc.update(pd.Series([5.0, 50.0], index=pd.to_datetime(["2000-01-01", "2000-01-02"])))
+    acc.save(tmp_path / "acc.npz")
+
+    loaded = ClimAccumulator.load(tmp_path / "acc.npz")
+
+    assert loaded.sketch.max_bins == 600
+    assert loaded.sketch.value_range == (-10, 40)
+    np.testing.assert_array_equal(loaded.sketch.counts, acc.sketch.counts)
+
+
+def _hourly_record(
+    start: str = "2000-01-01",
+    end: str = "2009-12-31 23:00"
+):
+    index = pd.date_range(start, end, freq="h")
+    rng = np.random.default_rng(1)
+
+    return pd.Series(np.round(rng.normal(15, 6, len(index)), 1), index=index)
+
+
+def test_merge_carries_the_days_held_back():
+    sr = _hourly_record()
+    whole = ClimAccumulator("mean").update(sr).flush()
+
+    first = ClimAccumulator("mean").update(sr[:"2004-12-31"])
+    second = ClimAccumulator("mean").update(sr["2005-01-01":])
+    merged = first.merge(second).flush()
+
+    assert merged.count.sum() == whole.count.sum() == 3653
+    for stat, expected in whole.statistics(["Mean", "Min", "Max", "Q50"]).items():
+        np.testing.assert_allclose(merged.statistics([stat])[stat], expected)
+
+
+def test_merge_accumulators_carries_the_days_held_back():
+    sr = _hourly_record()
+    chunks = [sr[:"2002-06-30"], sr["2002-07-01":"2006-12-31"], sr["2007-01-01":]]
+
+    merged = merge_accumulators([ClimAccumulator("max").update(chunk) for chunk in chunks]).flush()
+
+    assert merged.count.sum() == 3653
+    np.testing.assert_array_equal(merged.max, ClimAccumulator("max").update(sr).flush().max)
+
+
+def test_incompatible_merges_leave_the_accumulator_unchanged():
+    sr = _hourly_record("2000-01-01", "2000-12-31 23:00")
+    acc = ClimAccumulator("mean", resolution=0.1).update(sr)
+    other = ClimAccumulator("mean", resolution=0.5).update(sr)
+    state = (acc.sum.copy(), acc.count.copy(), acc.sketch.counts.copy(), acc._pending.copy())
+
+    with pytest.raises(ValueError, match="resolution"):
+        acc.merge(other)
+    with pytest.raises(ValueError, match="resolution"):
+        merge_accumulators([acc, other])
+
+    np.testing.assert_array_equal(acc.sum, state[0])
+    np.testing.assert_array_equal(acc.count, state[1])
+    np.testing.assert_array_equal(acc.sketch.counts, state[2])
+    pd.testing.assert_series_equal(acc._pending, state[3])
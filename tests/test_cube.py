@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from packages.computing import climatology
+from packages.cube import DoyCube, month_day_position
+
+
+def _daily(
+    start: str = "1999-01-01",
+    end: str = "2004-12-31"
+):
+    index = pd.date_range(start, end, freq="D")
+    rng = np.random.default_rng(0)
+
+    return pd.Series(np.round(rng.normal(15, 5, len(index)), 1), index=index)
+
+
+def _assert_same_series(
+    result: pd.Series,
+    expected: pd.Series
+):
+    # Same dates and values, whatever the time unit of the index
+    assert result.index.equals(expected.index)
+    np.testing.assert_array_equal(result.to_numpy(), expected.to_numpy())
+
+
+def test_statistics_match_a_month_day_groupby():
+    sr = _daily()
+    stats = ["Q10", "Median", "Mean", "Min", "Max", "Count"]
+
+    dic_stats = DoyCube.from_series(sr).statistics(stats)
+
+    grouped = sr.groupby(month_day_position(sr.index) + 1)
+    expected = {
+        "Q10": grouped.quantile(0.1),
+        "Median": grouped.median(),
+        "Mean": grouped.mean(),
+        "Min": grouped.min(),
+        "Max": grouped.max(),
+        "Count": grouped.count().astype(float)
+    }
+    for stat in stats:
+        pd.testing.assert_series_equal(dic_stats[stat], expected[stat], check_names=False, check_index_type=False)
+
+
+def test_feb_29_has_its_own_column():
+    positions = month_day_position(pd.DatetimeIndex(["2000-02-29", "2000-03-01", "2001-03-01"]))
+
+    np.testing.assert_array_equal(positions, [59, 60, 60])
+    assert positions.dtype == np.int64
+
+
+def test_sub_hourly_values_are_all_kept():
+    # Half-hourly values alternating 0 / 10: every normal is 5
+    index = pd.date_range("2000-01-01", "2001-12-31 23:30", freq="30min")
+    sr = pd.Series(np.tile([0.0, 10.0], len(index) // 2), index=index)
+
+    cube = DoyCube.from_series(sr)
+    _, sr_mean = climatology(sr, "2000-01-01", "2001-12-31", "T", "tests", plot=False)
+
+    assert cube.steps_per_day == 48
+    np.testing.assert_allclose(sr_mean, 5.0)
+    _assert_same_series(cube.to_series(), sr)
+
+
+def test_hourly_round_trip():
+    index = pd.date_range("2003-02-27", "2004-03-02", freq="h")
+    sr = pd.Series(np.arange(len(index), dtype=float), index=index)
+
+    cube = DoyCube.from_series(sr)
+
+    assert cube.steps_per_day == 24
+    _assert_same_series(cube.to_series(), sr)
+
+
+def test_duplicated_dates_are_rejected():
+    sr = _daily()
+    sr_two_stations = pd.concat([sr, sr + 1])
+
+    with pytest.raises(ValueError, match="duplicated"):
+        DoyCube.from_series(sr_two_stations)
+
+
+def test_dates_off_the_grid_are_rejected():
+    sr = pd.Series([1.0, 2.0], index=pd.DatetimeIndex(["2000-01-01 10:00", "2000-01-01 10:00:07"]))
+
+    with pytest.raises(ValueError, match="grid"):
+        DoyCube.from_series(sr)
+    with pytest.raises(ValueError, match="grid"):
+        DoyCube.from_series(_daily().shift(30, freq="min"), steps_per_day=24)
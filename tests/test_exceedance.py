@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from packages.computing import thresholds
+from packages.exceedance import ExceedanceEngine
+
+
+def _daily_tx(
+    year: int = 1994
+):
+    # Daily maximal temperatures of one year, warmer in summer
+    index = pd.date_range(f"{year}-01-01", f"{year}-12-31", freq="D")
+    rng = np.random.default_rng(0)
+    values = 18 - 10 * np.cos(2 * np.pi * index.dayofyear / 365.25) + rng.normal(0, 3, len(index))
+
+    return pd.Series(np.round(values, 1), index=index)
+
+
+def test_series_over_the_same_period_keep_their_counts():
+    tx = _daily_tx()
+    summer = tx[tx.index.month.isin([6, 7, 8])]
+    expected = [int((summer > 25).sum()), int((summer + 3 > 25).sum())]
+    assert expected[0] != expected[1]
+
+    count = thresholds("temperature", [6, 7, 8], tx, tx + 3, 25, ">", plot=False)
+
+    assert count == expected
+
+
+def test_engine_counts_match_a_direct_scan():
+    tx = _daily_tx()
+    engine = ExceedanceEngine([tx, tx - 2])
+    thresholds_swept = np.arange(0, 35, 2.5)
+
+    df_counts = engine.counts(thresholds_swept)
+
+    for (position, season, sign), df in df_counts.groupby(["series", "season", "sign"]):
+        sr = [tx, tx - 2][position]
+        sr = sr[sr.index.month.isin(engine.seasons[season])]
+        values = sr.to_numpy()[:, np.newaxis]
+        selected = values > thresholds_swept if sign == ">" else values < thresholds_swept
+        np.testing.assert_array_equal(df["count"], selected.sum(axis=0))
+
+    dates = engine.dates(1, "JJA", 25, ">")
+    sr = tx - 2
+    assert dates.equals(sr[sr.index.month.isin([6, 7, 8]) & (sr > 25)].index)
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+from matplotlib.cbook import boxplot_stats
+
+from packages.groups import Groups
+
+
+def _daily(
+    start: str = "2000-01-01",
+    end: str = "2004-12-31"
+):
+    index = pd.date_range(start, end, freq="D")
+    rng = np.random.default_rng(0)
+    values = np.round(rng.gamma(2, 3, len(index)), 1)
+    values[rng.random(len(index)) < 0.05] = np.nan
+
+    return pd.Series(values, index=index)
+
+
+def test_quantiles_match_percentile():
+    sr = _daily()
+    months = [6, 7, 8, 1]
+    qs = [0, 0.1, 0.25, 0.5, 0.9, 1]
+
+    groups = Groups.by_month(sr, months)
+
+    for position, month in enumerate(months):
+        values = sr[sr.index.month == month].dropna().to_numpy()
+        np.testing.assert_allclose(groups.quantiles(qs)[position], np.percentile(values, np.multiply(qs, 100)))
+        np.testing.assert_array_equal(groups.group(position), np.sort(values))
+
+
+def test_box_stats_match_matplotlib():
+    sr = _daily()
+
+    groups = Groups.by_season(sr)
+
+    for position, stats in enumerate(groups.box_stats()):
+        values = groups.group(position)
+        expected = boxplot_stats(values)[0]
+        assert stats["label"] == groups.labels[position]
+        for key in ("med", "q1", "q3", "whislo", "whishi", "mean"):
+            np.testing.assert_allclose(stats[key], expected[key])
+        np.testing.assert_array_equal(np.sort(stats["fliers"]), np.sort(expected["fliers"]))
+
+
+def test_empty_groups():
+    sr = _daily("2000-06-01", "2000-08-31")
+
+    groups = Groups.by_month(sr, [6, 12])
+
+    assert len(groups.group(1)) == 0
+    assert np.isnan(groups.quantiles(0.5)[1]).all()
+    assert groups.sums()[1] == 0
+    assert np.isnan(groups.box_stats()[1]["mean"])
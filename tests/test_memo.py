@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from packages import computing as cp
+from packages.accumulators import ClimAccumulator
+from packages.memo import CACHE, ComputeCache, fingerprint, memoize
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    CACHE.clear()
+    yield
+    CACHE.clear()
+
+
+def _daily(
+    shift: float = 0.0
+):
+    index = pd.date_range("2000-01-01", "2001-12-31", freq="D")
+    rng = np.random.default_rng(0)
+
+    return pd.Series(np.round(rng.normal(15, 5, len(index)), 1) + shift, index=index)
+
+
+def test_accumulator_fingerprint_covers_its_whole_state():
+    acc = ClimAccumulator().update(_daily())
+    base = fingerprint(acc)
+
+    variants = []
+    for change in (
+        lambda other: other.min.__setitem__(0, -99.0),
+        lambda other: other.max.__setitem__(0, 99.0),
+        lambda other: other.sum_sq.__setitem__(0, 0.0),
+        lambda other: setattr(other.sketch, "offset", other.sketch.offset + 1),
+        lambda other: setattr(other.sketch, "resolution", 0.5),
+        lambda other: setattr(other.sketch, "value_range", (-50, 60))
+    ):
+        other = ClimAccumulator().update(_daily())
+        assert fingerprint(other) == base
+        change(other)
+        variants.append(fingerprint(other))
+
+    assert len(set(variants)) == len(variants)
+    assert base not in variants
+
+
+def test_series_fingerprint_covers_the_dates():
+    # Same bounds, length and values, inner dates moved by one hour
+    sr = _daily()
+    sr_moved = sr.copy()
+    sr_moved.index = sr.index[:1].append(sr.index[1:-1] + pd.Timedelta(hours=1)).append(sr.index[-1:])
+
+    assert fingerprint(sr_moved) != fingerprint(sr)
+
+
+def test_memoized_quantiles_follow_the_accumulator():
+    acc = ClimAccumulator().update(_daily())
+    acc_extended = ClimAccumulator().update(_daily())
+    acc_extended.min -= 10
+    acc_extended.max += 10
+
+    dic_q = cp.quantiles(acc, "max", "", "", "", plot=False)
+    dic_q_extended = cp.quantiles(acc_extended, "max", "", "", "", plot=False)
+
+    np.testing.assert_allclose(dic_q_extended["Min"], dic_q["Min"] - 10)
+    np.testing.assert_allclose(dic_q_extended["Max"], dic_q["Max"] + 10)
+
+
+def test_cached_results_are_copies():
+    calls = []
+
+    @memoize
+    def doubled(sr):
+        calls.append(1)
+        return sr * 2
+
+    sr = _daily()
+    first = doubled(sr)
+    first.iloc[0] = np.nan
+    second = doubled(sr)
+
+    assert len(calls) == 1
+    assert second.iloc[0] == 2 * sr.iloc[0]
+
+
+def test_cache_evicts_the_least_recently_used():
+    sr = _daily()
+    cache = ComputeCache(max_bytes=2 * sr.memory_usage(index=True))
+    cache.put("a", sr)
+    cache.put("b", sr)
+    cache.get("a")
+    cache.put("c", sr)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
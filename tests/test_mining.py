@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+
+from packages.mining import completeness_report, open_data, resample_daily
+
+
+def _hourly(
+    start: str = "2000-01-01",
+    end: str = "2000-03-31 23:00"
+):
+    # Hourly values with missing hours
+    index = pd.date_range(start, end, freq="h")
+    rng = np.random.default_rng(0)
+    values = np.round(rng.normal(10, 5, len(index)), 1)
+    values[rng.random(len(index)) < 0.1] = np.nan
+
+    return pd.Series(values, index=index, name="T")
+
+
+def _resampled(
+    sr: pd.Series
+):
+    # Reference daily aggregates
+    resampler = sr.resample("D")
+
+    return pd.DataFrame({
+        "mean": resampler.mean(),
+        "min": resampler.min(),
+        "max": resampler.max(),
+        "sum": resampler.sum(),
+        "count": resampler.count()
+    })
+
+
+def test_resample_daily_matches_resample():
+    sr = _hourly().drop(pd.date_range("2000-02-10", "2000-02-12 23:00", freq="h"))
+
+    pd.testing.assert_frame_equal(resample_daily(sr), _resampled(sr), check_freq=False)
+
+
+def test_resample_daily_keeps_every_sub_hourly_value():
+    index = pd.date_range("2000-01-01", "2000-01-03 23:30", freq="30min")
+    sr = pd.Series(np.tile([0.0, 10.0], len(index) // 2), index=index)
+
+    df_daily = resample_daily(sr)
+
+    np.testing.assert_allclose(df_daily["mean"], 5.0)
+    pd.testing.assert_frame_equal(df_daily, _resampled(sr), check_freq=False)
+
+
+def test_resample_daily_keeps_duplicated_dates():
+    sr = _hourly("2000-01-01", "2000-01-01 04:00").fillna(1.0)
+    sr_twice = pd.concat([sr, sr]).sort_index()
+
+    df_daily = resample_daily(sr_twice)
+
+    assert df_daily["count"].iloc[0] == 2 * len(sr)
+    np.testing.assert_allclose(df_daily["sum"].iloc[0], 2 * sr.sum())
+
+
+def test_resample_daily_of_an_empty_series():
+    sr = pd.Series([], dtype="float64", index=pd.DatetimeIndex([]))
+
+    df_daily = resample_daily(sr, min_hours=20, min_days=20)
+
+    assert df_daily.empty
+    assert list(df_daily.columns) == ["mean", "min", "max", "sum", "count"]
+
+
+def test_coverage_rules_mask_days_and_months():
+    sr = _hourly()
+    sr.loc["2000-01-05 06:00":"2000-01-05 23:00"] = np.nan
+    sr.loc["2000-02-01":"2000-02-20"] = np.nan
+
+    df_daily = resample_daily(sr, min_hours=18, min_days=15)
+
+    assert np.isnan(df_daily.loc["2000-01-05", "mean"])
+    assert df_daily.loc["2000-01-05", "count"] == sr.loc["2000-01-05"].count()
+    assert df_daily.loc["2000-02", "mean"].isna().all()
+    assert df_daily.loc["2000-03", "mean"].notna().all()
+
+
+def test_completeness_report_on_a_gappy_series():
+    sr = _hourly("2000-01-01", "2000-12-31 23:00")
+    sr = sr.drop(pd.date_range("2000-03-01", "2000-03-02 23:00", freq="h"))
+
+    report = completeness_report(sr)
+
+    grid = pd.date_range("2000-01-01", "2000-12-31 23:00", freq="h")
+    present = sr.reindex(grid).notna()
+    assert report["freq"] == pd.Timedelta(hours=1)
+    assert report["n_expected"] == len(grid)
+    assert report["n_missing"] == int((~present).sum())
+    np.testing.assert_allclose(report["by_month"].to_numpy(), 100 * present.groupby(grid.month).mean().to_numpy())
+    assert report["gaps"].iloc[0]["length"] == 48
+    assert report["gaps"].iloc[0]["start"] == pd.Timestamp("2000-03-01")
+
+
+def test_completeness_report_of_tiny_series():
+    one = pd.Series([1.0], index=pd.DatetimeIndex(["2000-01-01 03:00"]))
+    same_date = pd.Series([1.0, np.nan], index=pd.DatetimeIndex(["2000-01-01", "2000-01-01"]))
+    empty = pd.Series([], dtype="float64", index=pd.DatetimeIndex([]))
+
+    assert completeness_report(one)["completeness"] == 100
+    assert completeness_report(one, freq="h")["n_expected"] == 1
+    assert completeness_report(same_date)["n_missing"] == 1
+    assert completeness_report(empty)["n_expected"] == 0
+    assert completeness_report(empty, freq="h", start="2000-01-01", end="2000-01-01 23:00")["n_missing"] == 24
+
+
+def test_open_data_reports_a_one_row_extract(tmp_path, capsys):
+    path = tmp_path / "one_row.csv"
+    path.write_text("POSTE;DATE;T\n66164001;2000010100;4,8\n", encoding="utf-8")
+
+    sr = open_data(str(path), "T", cache=False, verbose=True)
+
+    assert sr.tolist() == [4.8]
+    assert "Completeness: 100.00%" in capsys.readouterr().out
+
+
+def test_new_versions_of_a_file_replace_their_cache_store(tmp_path):
+    path = tmp_path / "station.csv"
+    cache_dir = tmp_path / "cache"
+    other_store = cache_dir / f"station_hourly_{'0' * 32}"
+    other_store.mkdir(parents=True)
+
+    path.write_text("POSTE;DATE;T\n66164001;2000010100;4,8\n", encoding="utf-8")
+    open_data(str(path), "T", cache_dir=str(cache_dir))
+    first_stores = {entry.name for entry in cache_dir.iterdir()}
+    path.write_text("POSTE;DATE;T\n66164001;2000010100;5,2\n", encoding="utf-8")
+    sr = open_data(str(path), "T", cache_dir=str(cache_dir))
+    stores = {entry.name for entry in cache_dir.iterdir()}
+
+    assert sr.tolist() == [5.2]
+    assert len(first_stores) == len(stores) == 2
+    assert first_stores & stores == {other_store.name}
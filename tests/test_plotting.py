@@ -0,0 +1,113 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+from packages import computing as cp
+from packages import plotting as pltt
+
+
+@pytest.fixture
+def figs_dir(tmp_path, monkeypatch):
+    # plotting saves the images under figs/ of the working directory
+    monkeypatch.chdir(tmp_path)
+    for folder in ("figs/temp/clim_vs_year", "figs/tests"):
+        (tmp_path / folder).mkdir(parents=True)
+    plt.close("all")
+    yield tmp_path
+    plt.close("all")
+
+
+@pytest.fixture
+def inline_backend(monkeypatch):
+    # Notebook inline backend, the displayed figures being recorded
+    displayed = []
+    monkeypatch.setattr(matplotlib, "get_backend", lambda: "module://matplotlib_inline.backend_inline")
+    monkeypatch.setattr(pltt, "_display", displayed.append)
+
+    return displayed
+
+
+def _daily(
+    start: str = "2000-01-01",
+    end: str = "2004-12-31"
+):
+    index = pd.date_range(start, end, freq="D")
+    rng = np.random.default_rng(0)
+    values = 15 - 8 * np.cos(2 * np.pi * index.dayofyear / 365.25) + rng.normal(0, 3, len(index))
+
+    return pd.Series(np.round(values, 1), index=index)
+
+
+def test_year_loop_does_not_pile_up_figures(figs_dir, inline_backend):
+    sr = _daily()
+    _, sr_mean = cp.climatology(sr, "2000-01-01", "2003-12-31", "T", "tests", plot=False)
+    dic_quantiles = cp.quantiles(sr, "avg", "", "", "tests", plot=False)
+
+    for year in range(2000, 2005):
+        cp.year_vs_climato(sr, sr_mean, dic_quantiles, "2000-2003", f"{year}-01-01", f"{year}-12-31")
+
+    assert plt.get_fignums() == []
+    assert len(list((figs_dir / "figs/temp/clim_vs_year").iterdir())) == 10
+
+
+def test_figures_not_shown_are_displayed_then_closed(figs_dir, inline_backend):
+    path = pltt.plot_data(_daily(), "T", "Daily temperature", "tests/daily")
+
+    assert plt.get_fignums() == []
+    assert len(inline_backend) == 1
+    assert (figs_dir / path).exists()
+
+
+def test_sessions_close_without_displaying(figs_dir, inline_backend):
+    with pltt.FigureSession() as session:
+        pltt.plot_data(_daily(), "T", "Daily temperature", "tests/daily")
+
+    assert plt.get_fignums() == []
+    assert inline_backend == []
+    assert session.n_figures == 1
+
+
+def test_minmax_decimation_keeps_the_extremes_of_each_bucket():
+    index = pd.date_range("2000-01-01", periods=10_000, freq="h")
+    sr = pd.Series(np.random.default_rng(0).normal(0, 1, len(index)), index=index)
+    sr.iloc[1234] = 50.0
+    sr.iloc[4321] = -50.0
+    sr.iloc[2000:2500] = np.nan
+
+    sr_kept = pltt.decimate(sr, 400)
+
+    assert len(sr_kept) <= 400
+    assert sr_kept.index.is_monotonic_increasing
+    assert sr_kept.index[0] == sr.index[0] and sr_kept.index[-1] == sr.index[-1]
+    assert sr_kept.max() == 50.0 and sr_kept.min() == -50.0
+    # Each bucket keeps its min and max, and the gap stays visible
+    buckets = np.arange(len(sr)) // -(-len(sr) // 199)
+    kept = pd.Series(sr.to_numpy(), index=buckets).groupby(level=0)
+    kept_values = pd.Series(sr_kept.to_numpy(), index=buckets[sr.index.get_indexer(sr_kept.index)])
+    pd.testing.assert_series_equal(kept_values.groupby(level=0).max(), kept.max(), check_names=False)
+    pd.testing.assert_series_equal(kept_values.groupby(level=0).min(), kept.min(), check_names=False)
+    assert sr_kept.loc["2000-03-26":"2000-04-15"].isna().any()
+
+
+def test_lttb_decimation_keeps_the_ends_and_the_extremes():
+    index = pd.date_range("2000-01-01", periods=5000, freq="D")
+    sr = pd.Series(np.sin(np.arange(len(index)) / 50.0), index=index)
+    sr.iloc[777] = 9.0
+
+    sr_kept = pltt.decimate(sr, 300, method="lttb")
+
+    assert len(sr_kept) <= 301
+    assert sr_kept.index.is_unique and sr_kept.index.is_monotonic_increasing
+    assert sr_kept.index[0] == sr.index[0] and sr_kept.index[-1] == sr.index[-1]
+    assert sr_kept.max() == 9.0 and sr_kept.min() == sr.min()
+
+
+def test_short_series_are_not_decimated():
+    sr = _daily("2000-01-01", "2000-01-31")
+
+    assert pltt.decimate(sr, 100) is sr
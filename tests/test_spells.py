@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+from packages.spells import find_spells, spell_summary
+
+
+def _daily_tx(
+    start: str = "2000-01-01",
+    end: str = "2003-12-31"
+):
+    # Daily maximal temperatures with missing days, both as gaps and NaN
+    index = pd.date_range(start, end, freq="D")
+    rng = np.random.default_rng(0)
+    values = 18 - 10 * np.cos(2 * np.pi * index.dayofyear / 365.25) + rng.normal(0, 4, len(index))
+    sr = pd.Series(np.round(values, 1), index=index)
+    sr[rng.random(len(sr)) < 0.02] = np.nan
+
+    return sr.drop(sr.index[rng.random(len(sr)) < 0.02])
+
+
+def _naive_spells(
+    sr: pd.Series,
+    threshold: float,
+    sign: str,
+    min_length: int
+):
+    # One day at a time, a missing day or a date gap ending the spell
+    spells = []
+    current = []
+    previous = None
+    for date, value in sr.items():
+        selected = value > threshold if sign == ">" else value < threshold
+        if current and (not selected or date - previous != pd.Timedelta(days=1)):
+            spells.append(current)
+            current = []
+        if selected:
+            current.append((date, value))
+        previous = date
+    if current:
+        spells.append(current)
+
+    rows = []
+    for spell in spells:
+        if len(spell) < min_length:
+            continue
+        values = np.array([value for _, value in spell])
+        rows.append({
+            "start": spell[0][0],
+            "end": spell[-1][0],
+            "length": len(spell),
+            "mean": values.mean(),
+            "peak": values.max() if sign == ">" else values.min(),
+            "excess": np.abs(values - threshold).sum()
+        })
+
+    return pd.DataFrame(rows)
+
+
+def test_spells_match_a_day_by_day_scan():
+    sr = _daily_tx()
+
+    for threshold, sign, min_length in ((28, ">", 3), (25, ">", 1), (5, "<", 2)):
+        df_spells = find_spells(sr, threshold, sign, min_length)
+        expected = _naive_spells(sr, threshold, sign, min_length)
+
+        assert len(df_spells) == len(expected) > 0
+        assert (df_spells["start"].to_numpy() == expected["start"].to_numpy()).all()
+        assert (df_spells["end"].to_numpy() == expected["end"].to_numpy()).all()
+        np.testing.assert_array_equal(df_spells["length"], expected["length"])
+        for column in ("mean", "peak", "excess"):
+            np.testing.assert_allclose(df_spells[column], expected[column])
+
+
+def test_spells_of_a_series_without_any():
+    df_spells = find_spells(_daily_tx(), 60, ">")
+
+    assert df_spells.empty
+    assert list(df_spells.columns) == ["start", "end", "length", "mean", "peak", "excess"]
+
+
+def test_summary_counts_spells_in_the_season_of_their_start():
+    df_spells = pd.DataFrame({
+        "start": pd.to_datetime(["2000-12-30", "2001-01-10", "2001-07-01", "2001-07-20"]),
+        "length": [4, 2, 5, 3],
+        "excess": [1.0, 2.0, 3.0, 4.0]
+    })
+
+    df_year = spell_summary(df_spells, years=[2000, 2001, 2002])
+    df_season = spell_summary(df_spells, by="season")
+
+    assert df_year["n_spells"].tolist() == [1, 3, 0]
+    assert df_year["longest"].tolist() == [4, 5, 0]
+    assert df_year["spell_days"].tolist() == [4, 10, 0]
+    # December 2000 counts in the DJF season of 2001
+    assert df_season.loc[(2001, "DJF"), "n_spells"] == 2
+    assert df_season.loc[(2001, "DJF"), "excess"] == 3.0
+    assert df_season.loc[(2001, "JJA"), "spell_days"] == 8
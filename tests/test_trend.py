@@ -0,0 +1,94 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from packages import trend
+from packages.trend import doy_trends, mann_kendall, sens_slope, series_trend
+
+
+def _columns(
+    n: int = 40,
+    m: int = 6
+):
+    # Columns with trends, ties and missing values
+    rng = np.random.default_rng(0)
+    values = np.round(np.arange(n)[:, np.newaxis] * rng.normal(0, 0.1, m) + rng.normal(0, 1, (n, m)), 1)
+    values[rng.random((n, m)) < 0.1] = np.nan
+
+    return values
+
+
+def _naive_mann_kendall(
+    values: np.ndarray
+):
+    # O(n²) S statistic and tie-corrected variance
+    values = values[~np.isnan(values)]
+    n = len(values)
+    s = sum(np.sign(values[j] - values[i]) for i in range(n) for j in range(i + 1, n))
+    _, ties = np.unique(values, return_counts=True)
+    var_s = (n * (n - 1) * (2 * n + 5) - (ties * (ties - 1) * (2 * ties + 5)).sum()) / 18
+    z = (s - np.sign(s)) / math.sqrt(var_s)
+
+    return s, z, math.erfc(abs(z) / math.sqrt(2))
+
+
+def _naive_sens_slope(
+    values: np.ndarray,
+    x: np.ndarray
+):
+    slopes = [
+        (values[j] - values[i]) / (x[j] - x[i])
+        for i in range(len(x)) for j in range(i + 1, len(x))
+        if not np.isnan(values[i]) and not np.isnan(values[j])
+    ]
+
+    return np.median(slopes)
+
+
+def test_mann_kendall_matches_the_pairwise_definition():
+    values = _columns()
+
+    results = mann_kendall(values)
+
+    for column in range(values.shape[1]):
+        s, z, p = _naive_mann_kendall(values[:, column])
+        assert results["s"][column] == s
+        np.testing.assert_allclose(results["z"][column], z)
+        np.testing.assert_allclose(results["p"][column], p)
+
+
+def test_sens_slope_matches_the_pairwise_median():
+    values = _columns()
+    x = np.cumsum(np.random.default_rng(1).uniform(0.5, 2, len(values)))
+
+    slopes = sens_slope(values, x)
+
+    expected = [_naive_sens_slope(values[:, column], x) for column in range(values.shape[1])]
+    np.testing.assert_allclose(slopes, expected)
+
+
+def test_bisection_matches_the_pairwise_slopes(monkeypatch):
+    values = _columns(n=101)
+    x = np.arange(1950, 2051, dtype=np.float64)
+    expected = sens_slope(values, x)
+
+    # Forces the path of the long series
+    monkeypatch.setattr(trend, "MAX_PAIRS", 10)
+
+    np.testing.assert_allclose(sens_slope(values, x), expected, rtol=1e-9, atol=1e-12)
+
+
+def test_yearly_series_and_day_of_year_trends():
+    index = pd.date_range("1980-01-01", "2019-12-31", freq="D")
+    rng = np.random.default_rng(0)
+    sr = pd.Series(0.05 * (index.year - 1980) + rng.normal(0, 0.5, len(index)), index=index)
+
+    result = series_trend(sr.resample("YE").mean())
+    df_trends = doy_trends(sr)
+
+    assert result["trend"] == "increasing"
+    np.testing.assert_allclose(result["slope"], 0.05, atol=0.01)
+    assert len(df_trends) == 366
+    assert df_trends.loc[60, "n"] == 10
+    np.testing.assert_allclose(df_trends["slope"].median(), 0.05, atol=0.01)